@@ -0,0 +1,92 @@
+"""Apply AAX's AWX source patches once, at image build time.
+
+Run with the AWX virtualenv's python. Each patch replaces one anchor in an
+installed module:
+
+  - awx/main/tasks/jobs.py: process_isolation off. The execution node is
+    already a container, so podman/bwrap are neither needed nor available.
+  - awx/main/tasks/receptor.py: only_transmit_kwargs off. The receptor
+    sidecar cannot share /tmp with awx-task.
+  - ansible_runner/interface.py: process_isolation forced off for the
+    control node's own runner.
+
+A missing anchor fails the build, so an AWX bump cannot silently drop a
+patch. The patched files are byte-compiled, and their SHA-256 sums are
+written to a manifest. The awx-task entrypoint checks that manifest instead
+of rewriting sources on every start.
+"""
+
+import argparse
+import compileall
+import hashlib
+import importlib.util
+import sys
+from pathlib import Path
+
+# (package, path inside the package, anchor, replacement)
+PATCHES = [
+    (
+        "awx",
+        "main/tasks/jobs.py",
+        '"process_isolation": True',
+        '"process_isolation": False',
+    ),
+    (
+        "awx",
+        "main/tasks/receptor.py",
+        "self.runner_params['only_transmit_kwargs'] = True",
+        "self.runner_params['only_transmit_kwargs'] = False  # AAX: sidecar container cannot share /tmp",
+    ),
+    (
+        "ansible_runner",
+        "interface.py",
+        '    if kwargs.get("process_isolation", False):',
+        '    kwargs["process_isolation"] = False  # AAX\n    if kwargs.get("process_isolation", False):',
+    ),
+]
+
+
+def package_dir(name: str) -> Path:
+    # find_spec on a top-level package does not import it (awx needs Django settings).
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.submodule_search_locations:
+        sys.exit(f"apply-patches: package {name} not found")
+    return Path(list(spec.submodule_search_locations)[0])
+
+
+def apply(path: Path, anchor: str, replacement: str) -> None:
+    text = path.read_text()
+    if replacement in text and text.count(anchor) == replacement.count(anchor):
+        print(f"apply-patches: {path}: already patched")
+        return
+    if text.count(anchor) != 1:
+        sys.exit(f"apply-patches: {path}: expected one {anchor!r}, found {text.count(anchor)}")
+    path.write_text(text.replace(anchor, replacement, 1))
+    print(f"apply-patches: {path}: patched")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--manifest", type=Path, required=True)
+    args = parser.parse_args()
+
+    patched = []
+    for package, relative, anchor, replacement in PATCHES:
+        path = package_dir(package) / relative
+        apply(path, anchor, replacement)
+        if path not in patched:
+            patched.append(path)
+
+    for path in patched:
+        if not compileall.compile_file(str(path), quiet=1, force=True):
+            sys.exit(f"apply-patches: {path}: failed to compile")
+
+    args.manifest.parent.mkdir(parents=True, exist_ok=True)
+    args.manifest.write_text(
+        "".join(f"{hashlib.sha256(p.read_bytes()).hexdigest()}  {p}\n" for p in patched)
+    )
+    print(f"apply-patches: wrote {args.manifest} ({len(patched)} files)")
+
+
+if __name__ == "__main__":
+    main()
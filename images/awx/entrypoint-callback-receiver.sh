@@ -0,0 +1,21 @@
+#!/bin/bash
+set -e
+
+# Wait for database
+echo "Waiting for database..."
+until PGPASSWORD=$DATABASE_PASSWORD psql -h "$DATABASE_HOST" -U "$DATABASE_USER" -d "$DATABASE_NAME" -c '\q' 2>/dev/null; do
+  sleep 1
+done
+
+echo "Database is ready"
+
+# Wait for migrations to complete (web container handles this)
+echo "Waiting for migrations..."
+until python /var/lib/awx/manage.py migrate --check 2>/dev/null; do
+  sleep 5
+done
+echo "Migrations complete"
+
+# Start the job event callback receiver (JOB_EVENT_WORKERS worker processes)
+echo "Starting AWX callback receiver..."
+exec python /var/lib/awx/manage.py run_callback_receiver
@@ -23,6 +23,17 @@ DATABASES = {
     }
 }
 
+# Connection reuse mode (direct, persistent or pgbouncer)
+_DB_CONN_MODE = os.getenv('AWX_DB_CONN_MODE', 'direct').strip().lower()
+if _DB_CONN_MODE not in ('direct', 'persistent', 'pgbouncer'):
+    raise RuntimeError(f'AWX_DB_CONN_MODE must be direct, persistent or pgbouncer (got {_DB_CONN_MODE!r})')
+if _DB_CONN_MODE != 'direct':
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('AWX_DB_CONN_MAX_AGE', 300))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+if _DB_CONN_MODE == 'pgbouncer':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+    LISTENER_DATABASES = {'default': {'HOST': os.getenv('AWX_DB_LISTENER_HOST', 'awx-postgres'), 'PORT': int(os.getenv('AWX_DB_LISTENER_PORT', 5432))}}
+
 # AWX specific settings
 SECRET_KEY = os.environ['SECRET_KEY']
 DEBUG = False
@@ -35,6 +46,11 @@ else:
 
 # Broadcast websocket setting
 BROADCAST_WEBSOCKET_SECRET = os.environ['SECRET_KEY']
+
+# Callback receiver: worker processes per receiver, flush interval, Redis queue cap
+JOB_EVENT_WORKERS = int(os.getenv('AWX_JOB_EVENT_WORKERS', 4))
+JOB_EVENT_BUFFER_SECONDS = float(os.getenv('AWX_JOB_EVENT_BUFFER_SECONDS', 1))
+JOB_EVENT_MAX_QUEUE_SIZE = int(os.getenv('AWX_JOB_EVENT_MAX_QUEUE_SIZE', 10000))
 SETTINGS_EOF
 
 # Execute the launcher
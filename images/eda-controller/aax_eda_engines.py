@@ -0,0 +1,373 @@
+"""Resident ansible-rulebook engines for the EDA activation manager.
+
+Each activation runs one long-lived ``ansible-rulebook`` process, so the JVM
+that hosts the Drools rule engine starts once per activation instead of once
+per event. Events reach the process through the ``aax_events`` source plugin
+(``sources/aax_events.py``), which reads the activation's Redis stream.
+
+Events for all activations enter through the shared ingestion stream
+(``INGEST_STREAM``); the manager fans each one out to the per-activation
+streams (``fan_out_batch``).
+
+The Drools JVM is embedded in the ``ansible-rulebook`` process through jpy, so
+it only takes options from ``JAVA_TOOL_OPTIONS``; ``java_tool_options`` builds
+them (heap share, GC profile and the AppCDS archive baked into the image).
+Every enabled activation has its own JVM, so the heap budget is split across
+the most activations the manager enables at once (``engine_heap_percentage``,
+``can_enable``).
+
+Engines run rulebooks that can execute arbitrary actions, so they get the
+manager's environment without its credentials (``engine_environment``), and
+the API that creates them requires ``EDA_API_TOKEN`` (``authorized``).
+
+Only the standard library and PyYAML are used here, so this module is unit
+tested directly from the image build context (``tests/test_eda_engines.py``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import hmac
+import os
+import re
+import signal
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Collection, Mapping
+
+import yaml
+
+SOURCE_DIR = Path(os.getenv("EDA_SOURCE_DIR", Path(__file__).resolve().parent / "sources"))
+NAME_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,62}$")
+EVENT_STREAM_PREFIX = "aax:eda:events:"
+EVENT_GROUP = "aax-engine"
+INGEST_STREAM = "aax:eda:ingest"
+INGEST_GROUP = "aax-fanout"
+CDS_ARCHIVE = Path(os.getenv("EDA_JVM_CDS_ARCHIVE", "/opt/aax/eda/jvm/drools.jsa"))
+# Manager-only settings that engines never see: the database credentials and
+# the API token. Other variables (EDA_CONTROLLER_*, proxies) pass through.
+MANAGER_ONLY_ENV = re.compile(r"^(EDA_DB_|EDA_API_TOKEN$)")
+GC_PROFILES = {
+    "auto": [],
+    # Smallest footprint and fastest start; suits many small per-activation heaps.
+    "serial": ["-XX:+UseSerialGC"],
+    "parallel": ["-XX:+UseParallelGC"],
+    # drools_jpy calls System.gc() every DROOLS_JPY_GC_AFTER events; keep those concurrent.
+    "g1": ["-XX:+UseG1GC", "-XX:+ExplicitGCInvokesConcurrent"],
+}
+
+StatusCallback = Callable[[str, str, int | None, int], Awaitable[None]]
+
+
+def event_stream(name: str) -> str:
+    """Redis stream that buffers events for activation ``name``."""
+    return f"{EVENT_STREAM_PREFIX}{name}"
+
+
+def parse_event_batch(body: Any, max_batch: int) -> list[dict[str, Any]]:
+    """Accept one event (a JSON object) or a batch (a JSON array of objects)."""
+    events = body if isinstance(body, list) else [body]
+    if not events:
+        raise ValueError("batch is empty")
+    if len(events) > max_batch:
+        raise ValueError(f"batch has {len(events)} events; the limit is {max_batch}")
+    for index, event in enumerate(events):
+        if not isinstance(event, dict):
+            raise ValueError(f"event {index} is not a JSON object")
+    return events
+
+
+async def fan_out_batch(
+    redis: Any,
+    targets: Collection[str],
+    running: Collection[str],
+    last_id: str,
+    *,
+    count: int,
+    queue_max: int,
+    block_ms: int = 1000,
+) -> tuple[str, int]:
+    """Copy one batch of ingested events to the streams of ``targets``.
+
+    ``targets`` are the enabled activations; ``running`` those whose engine is
+    up. A running engine's full stream pauses fan-out (the batch stays in
+    ``INGEST_STREAM``). An activation without an engine (restarting, or
+    failed until it is started again) keeps its latest ``queue_max`` events
+    instead, so it neither loses the events sent while it restarts nor stalls
+    the others.
+
+    ``last_id`` is ``"0"`` to re-read entries delivered before a manager
+    restart, then ``">"``. Returns the next ``last_id`` and the number of
+    ingested events consumed (acknowledged and deleted from the shared stream).
+    """
+    live = [name for name in targets if name in running]
+    if live:
+        async with redis.pipeline(transaction=False) as pipe:
+            for name in live:
+                pipe.xlen(event_stream(name))
+            backlogs = await pipe.execute()
+        if max(backlogs) >= queue_max:
+            await asyncio.sleep(0.05)
+            return last_id, 0
+    response = await redis.xreadgroup(
+        INGEST_GROUP, "manager", {INGEST_STREAM: last_id}, count=count, block=block_ms,
+    )
+    entries = response[0][1] if response else []
+    if not entries:
+        return ">", 0
+    ids = [entry_id for entry_id, _ in entries]
+    async with redis.pipeline(transaction=False) as pipe:
+        for name in targets:
+            maxlen = None if name in running else queue_max
+            for _, fields in entries:
+                pipe.xadd(event_stream(name), fields, maxlen=maxlen, approximate=True)
+        pipe.xack(INGEST_STREAM, INGEST_GROUP, *ids)
+        pipe.xdel(INGEST_STREAM, *ids)
+        await pipe.execute()
+    return last_id, len(entries)
+
+
+def engine_heap_percentage(total: float, max_activations: int) -> float:
+    """Heap limit of one engine when ``max_activations`` engines share ``total`` percent."""
+    if max_activations < 1:
+        raise ValueError("the maximum number of activations must be at least 1")
+    if not 0 < total <= 100:
+        raise ValueError("JVM max RAM percentage must be above 0 and at most 100")
+    return total / max_activations
+
+
+def can_enable(activations: Mapping[str, bool], name: str, max_activations: int) -> bool:
+    """True if ``name`` is enabled already or enabling it stays within ``max_activations``."""
+    return activations.get(name, False) or sum(activations.values()) < max_activations
+
+
+def java_tool_options(
+    gc_profile: str = "serial",
+    max_ram_percentage: float = 25.0,
+    cds: bool = True,
+    extra: str = "",
+    cds_archive: Path = CDS_ARCHIVE,
+) -> str:
+    """``JAVA_TOOL_OPTIONS`` for one activation's Drools JVM.
+
+    The heap is a percentage of the container memory limit, per engine
+    (see ``engine_heap_percentage``). The CDS archive is only used if the image has one; ``extra`` comes last, so it
+    can override anything here.
+    """
+    if gc_profile not in GC_PROFILES:
+        choices = ", ".join(GC_PROFILES)
+        raise ValueError(f"unknown JVM GC profile {gc_profile!r}; use one of {choices}")
+    if not 0 < max_ram_percentage <= 100:
+        raise ValueError("JVM max RAM percentage must be above 0 and at most 100")
+    options = [
+        f"-XX:MaxRAMPercentage={max_ram_percentage:g}",
+        # An engine that runs out of heap exits and is restarted by the supervisor.
+        "-XX:+ExitOnOutOfMemoryError",
+        *GC_PROFILES[gc_profile],
+    ]
+    if cds and cds_archive.is_file():
+        options.append(f"-XX:SharedArchiveFile={cds_archive}")
+    return " ".join(options + extra.split())
+
+
+def engine_environment(base: Mapping[str, str], **extra: str) -> dict[str, str]:
+    """Environment for an engine process: ``base`` minus manager-only settings, plus ``extra``."""
+    env = {key: value for key, value in base.items() if not MANAGER_ONLY_ENV.match(key)}
+    env.update(extra)
+    # drools_jpy passes -Xmx512M unless this is set; empty leaves the heap to
+    # MaxRAMPercentage. A value set on the container still wins.
+    env.setdefault("DROOLS_JPY_JVM_MAXMEM", "")
+    return env
+
+
+def authorized(header: str | None, token: str) -> bool:
+    """True if an ``Authorization`` header is ``Bearer <token>``; an empty token never matches."""
+    if not token or not header:
+        return False
+    scheme, _, value = header.partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(value.strip().encode(), token.encode())
+
+
+def validate_name(name: Any) -> str:
+    """Activation names end up in file paths and Redis keys, so keep them plain."""
+    if not isinstance(name, str) or not NAME_PATTERN.match(name):
+        raise ValueError("name must be 1-63 lowercase letters, digits, '-' or '_'")
+    return name
+
+
+def validate_rulebook(text: str) -> list[dict[str, Any]]:
+    """Parse a rulebook and check the structure ansible-rulebook requires."""
+    try:
+        rulesets = yaml.safe_load(text)
+    except yaml.YAMLError as exc:
+        raise ValueError(f"rulebook is not valid YAML: {exc}") from exc
+    if not isinstance(rulesets, list) or not rulesets:
+        raise ValueError("rulebook must be a non-empty list of rulesets")
+    for index, ruleset in enumerate(rulesets):
+        label = ruleset.get("name", index) if isinstance(ruleset, dict) else index
+        if not isinstance(ruleset, dict):
+            raise ValueError(f"ruleset {label} must be a mapping")
+        for key in ("hosts", "sources", "rules"):
+            if key not in ruleset:
+                raise ValueError(f"ruleset {label} has no {key!r}")
+        if not isinstance(ruleset["sources"], list) or not ruleset["sources"]:
+            raise ValueError(f"ruleset {label} needs at least one source")
+        if not isinstance(ruleset["rules"], list) or not ruleset["rules"]:
+            raise ValueError(f"ruleset {label} needs at least one rule")
+    return rulesets
+
+
+def engine_command(workdir: Path, *, extra_vars: bool, inventory: bool) -> list[str]:
+    """ansible-rulebook command line for an activation laid out in ``workdir``."""
+    command = [
+        "ansible-rulebook",
+        "--rulebook", str(workdir / "rulebook.yml"),
+        "--source-dir", str(SOURCE_DIR),
+    ]
+    if extra_vars:
+        command += ["--vars", str(workdir / "vars.yml")]
+    if inventory:
+        command += ["--inventory", str(workdir / "inventory.yml")]
+    return command
+
+
+class Engine:
+    """One resident rule-engine process and the tail of its output."""
+
+    def __init__(
+        self,
+        name: str,
+        command: list[str],
+        env: dict[str, str] | None = None,
+        cwd: Path | None = None,
+        output_lines: int = 1000,
+    ) -> None:
+        self.name = name
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.output: collections.deque[dict[str, Any]] = collections.deque(maxlen=output_lines)
+        self.process: asyncio.subprocess.Process | None = None
+        self.started_at: float | None = None
+        self.returncode: int | None = None
+        self._seq = 0
+        self._reader: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.returncode is None
+
+    async def start(self) -> None:
+        self.returncode = None
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=self.env,
+            cwd=self.cwd,
+            start_new_session=True,
+            limit=1 << 20,
+        )
+        self.started_at = time.time()
+        self._reader = asyncio.create_task(self._read(self.process))
+
+    async def _read(self, process: asyncio.subprocess.Process) -> None:
+        assert process.stdout is not None
+        async for raw in process.stdout:
+            self._seq += 1
+            self.output.append({
+                "seq": self._seq,
+                "time": time.time(),
+                "line": raw.decode(errors="replace").rstrip("\n"),
+            })
+        self.returncode = await process.wait()
+
+    async def wait(self) -> int | None:
+        """Wait for the current process to exit and return its exit code."""
+        if self._reader is not None:
+            # Shielded so a cancelled watcher does not stop output collection.
+            await asyncio.shield(self._reader)
+        return self.returncode
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """SIGTERM the engine, then SIGKILL it if it has not exited in ``timeout``."""
+        if not self.running or self.process is None:
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        try:
+            await asyncio.wait_for(self.wait(), timeout)
+        except asyncio.TimeoutError:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await self.wait()
+
+    def lines(self, after: int = 0) -> list[dict[str, Any]]:
+        return [line for line in self.output if line["seq"] > after]
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "pid": self.process.pid if self.running and self.process else None,
+            "started_at": self.started_at,
+            "returncode": self.returncode,
+        }
+
+
+class EngineSupervisor:
+    """Keep engines running, restarting failed ones with a growing delay.
+
+    ``on_status(name, status, exit_code, restarts)`` is awaited on every state
+    change: ``running``, ``restarting``, ``completed`` (exit 0) or ``failed``
+    (non-zero exit after ``max_restarts`` restarts).
+    """
+
+    def __init__(self, on_status: StatusCallback, max_restarts: int = 5, restart_delay: float = 2.0) -> None:
+        self.on_status = on_status
+        self.max_restarts = max_restarts
+        self.restart_delay = restart_delay
+        self.engines: dict[str, Engine] = {}
+        self._watchers: dict[str, asyncio.Task[None]] = {}
+
+    async def start(self, engine: Engine) -> None:
+        await self.stop(engine.name)
+        self.engines[engine.name] = engine
+        await engine.start()
+        await self.on_status(engine.name, "running", None, 0)
+        self._watchers[engine.name] = asyncio.create_task(self._watch(engine))
+
+    async def _watch(self, engine: Engine) -> None:
+        restarts = 0
+        while True:
+            code = await engine.wait()
+            if self.engines.get(engine.name) is not engine:
+                return
+            if code == 0:
+                await self.on_status(engine.name, "completed", code, restarts)
+                return
+            if restarts >= self.max_restarts:
+                await self.on_status(engine.name, "failed", code, restarts)
+                return
+            restarts += 1
+            await self.on_status(engine.name, "restarting", code, restarts)
+            await asyncio.sleep(self.restart_delay * restarts)
+            if self.engines.get(engine.name) is not engine:
+                return
+            await engine.start()
+            await self.on_status(engine.name, "running", None, restarts)
+
+    async def stop(self, name: str) -> None:
+        engine = self.engines.pop(name, None)
+        watcher = self._watchers.pop(name, None)
+        if watcher is not None:
+            watcher.cancel()
+        if engine is not None:
+            await engine.stop()
+
+    async def stop_all(self) -> None:
+        await asyncio.gather(*(self.stop(name) for name in list(self.engines)))
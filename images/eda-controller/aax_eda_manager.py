@@ -0,0 +1,537 @@
+"""EDA activation manager.
+
+Long-running HTTP service on ``EDA_PORT`` that keeps one resident
+ansible-rulebook engine per activation (see ``aax_eda_engines.py``). The
+gateway serves it under ``/eda/``.
+
+Endpoints (all but ``/health`` need ``Authorization: Bearer $EDA_API_TOKEN``):
+
+- ``GET /health``
+- ``POST /api/v1/events``: shared ingestion front door; one JSON event or a
+  JSON array of events, fanned out to every enabled activation
+- ``GET /api/v1/activations`` / ``POST /api/v1/activations``
+- ``GET|DELETE /api/v1/activations/<name>``
+- ``POST /api/v1/activations/<name>/start`` and ``.../stop``
+- ``POST /api/v1/activations/<name>/events``: deliver one JSON event
+- ``GET /api/v1/activations/<name>/output?after=<seq>``: engine output lines
+
+Activations are stored in the ``aax_activation`` table in ``eda-postgres``;
+enabled ones are started again when the manager restarts. The manager keeps
+each activation's name and enabled flag in memory, so event delivery never
+queries the database. Events are buffered
+in ``eda-redis`` streams and read by the ``aax_events`` source plugin.
+
+Backpressure: each activation's stream holds at most
+``EDA_ACTIVATION_QUEUE_MAX`` undelivered events. An enabled activation whose
+engine is restarting or has failed keeps the latest ones. When a running
+activation's stream is full, fan-out pauses and ingested events wait in the shared stream;
+once that holds ``EDA_INGEST_MAX_PENDING`` events, ``/api/v1/events`` answers
+429 with ``Retry-After`` until the engines catch up.
+
+Configuration (environment):
+
+- ``EDA_API_TOKEN``: required bearer token for the API; placeholder values
+  (``REPLACE_WITH_...``) are refused unless ``AAX_ALLOW_PLACEHOLDER_SECRETS=true``
+- ``EDA_HOST``/``EDA_PORT``: listen address (default 0.0.0.0:5000)
+- ``EDA_DB_HOST``/``EDA_DB_PORT``/``EDA_DB_NAME``/``EDA_DB_USER``/``EDA_DB_PASSWORD``
+- ``EDA_REDIS_HOST``/``EDA_REDIS_PORT``
+- ``EDA_ACTIVATION_DIR``: per-activation rulebook files (default /home/eda/activations)
+- ``EDA_ACTIVATION_MAX_RESTARTS``: restarts of a failing engine before it is
+  marked failed (default 5)
+- ``EDA_ACTIVATION_QUEUE_MAX``: undelivered events per activation (default 10000)
+- ``EDA_INGEST_MAX_PENDING``: events waiting for fan-out (default 50000)
+- ``EDA_INGEST_MAX_BATCH``: events per ``/api/v1/events`` request (default 1000)
+- ``EDA_MAX_ACTIVATIONS``: activations enabled at once (default 4); enabling
+  one more answers 409
+- ``EDA_JVM_MAX_RAM_PERCENTAGE``: heap limit of all engine JVMs together as a
+  share of the container memory limit (default 60), split evenly across
+  ``EDA_MAX_ACTIVATIONS``
+- ``EDA_JVM_GC_PROFILE``: ``serial`` (default), ``parallel``, ``g1`` or ``auto``
+- ``EDA_JVM_CDS``: ``on`` (default) maps the image's AppCDS archive; ``off``
+- ``EDA_JVM_OPTIONS``: extra JVM options, applied last
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+import psycopg2
+import psycopg2.extras
+import redis.asyncio as aioredis
+import yaml
+from aiohttp import web
+from redis.exceptions import ResponseError
+
+from aax_eda_engines import (
+    EVENT_GROUP,
+    INGEST_GROUP,
+    INGEST_STREAM,
+    Engine,
+    EngineSupervisor,
+    authorized,
+    can_enable,
+    engine_command,
+    engine_environment,
+    engine_heap_percentage,
+    event_stream,
+    fan_out_batch,
+    java_tool_options,
+    parse_event_batch,
+    validate_name,
+    validate_rulebook,
+)
+
+log = logging.getLogger("aax.eda")
+
+API_TOKEN = os.getenv("EDA_API_TOKEN", "")
+PUBLIC_PATHS = frozenset({"/health"})
+ACTIVATION_DIR = Path(os.getenv("EDA_ACTIVATION_DIR", "/home/eda/activations"))
+ACTIVATION_QUEUE_MAX = int(os.getenv("EDA_ACTIVATION_QUEUE_MAX", "10000"))
+INGEST_MAX_PENDING = int(os.getenv("EDA_INGEST_MAX_PENDING", "50000"))
+INGEST_MAX_BATCH = int(os.getenv("EDA_INGEST_MAX_BATCH", "1000"))
+FANOUT_BATCH = 500
+MAX_ACTIVATIONS = int(os.getenv("EDA_MAX_ACTIVATIONS", "4"))
+JVM_OPTIONS = java_tool_options(
+    gc_profile=os.getenv("EDA_JVM_GC_PROFILE", "serial"),
+    max_ram_percentage=engine_heap_percentage(
+        float(os.getenv("EDA_JVM_MAX_RAM_PERCENTAGE", "60")), MAX_ACTIVATIONS,
+    ),
+    cds=os.getenv("EDA_JVM_CDS", "on") != "off",
+    extra=os.getenv("EDA_JVM_OPTIONS", ""),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS aax_activation (
+    name text PRIMARY KEY,
+    rulebook text NOT NULL,
+    extra_vars jsonb NOT NULL DEFAULT '{}',
+    inventory text,
+    enabled boolean NOT NULL DEFAULT true,
+    status text NOT NULL DEFAULT 'pending',
+    exit_code integer,
+    restarts integer NOT NULL DEFAULT 0,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now()
+)
+"""
+COLUMNS = "name, rulebook, extra_vars, inventory, enabled, status, exit_code, restarts, created_at, updated_at"
+
+
+class ActivationStore:
+    """Activation rows in eda-postgres; queries run in a worker thread."""
+
+    def __init__(self) -> None:
+        self.dsn = {
+            "host": os.getenv("EDA_DB_HOST", "eda-postgres"),
+            "port": int(os.getenv("EDA_DB_PORT", "5432")),
+            "dbname": os.getenv("EDA_DB_NAME", "eda"),
+            "user": os.getenv("EDA_DB_USER", "eda"),
+            "password": os.getenv("EDA_DB_PASSWORD", ""),
+        }
+
+    def _run(self, sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
+        conn = psycopg2.connect(**self.dsn)
+        try:
+            with conn, conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                cur.execute(sql, params)
+                return [dict(row) for row in cur.fetchall()] if cur.description else []
+        finally:
+            conn.close()
+
+    async def run(self, sql: str, *params: Any) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self._run, sql, params)
+
+    async def ensure_schema(self) -> None:
+        for attempt in range(30):
+            try:
+                await self.run(SCHEMA)
+                return
+            except psycopg2.OperationalError:
+                if attempt == 29:
+                    raise
+                await asyncio.sleep(2)
+
+    async def all(self) -> list[dict[str, Any]]:
+        return await self.run(f"SELECT {COLUMNS} FROM aax_activation ORDER BY name")
+
+    async def get(self, name: str) -> dict[str, Any] | None:
+        rows = await self.run(f"SELECT {COLUMNS} FROM aax_activation WHERE name = %s", name)
+        return rows[0] if rows else None
+
+    async def create(self, name: str, rulebook: str, extra_vars: dict[str, Any], inventory: str | None,
+                     enabled: bool) -> dict[str, Any] | None:
+        rows = await self.run(
+            f"INSERT INTO aax_activation (name, rulebook, extra_vars, inventory, enabled) "
+            f"VALUES (%s, %s, %s, %s, %s) ON CONFLICT (name) DO NOTHING RETURNING {COLUMNS}",
+            name, rulebook, json.dumps(extra_vars), inventory, enabled,
+        )
+        return rows[0] if rows else None
+
+    async def update(self, name: str, **fields: Any) -> None:
+        assignments = ", ".join(f"{column} = %s" for column in fields)
+        await self.run(
+            f"UPDATE aax_activation SET {assignments}, updated_at = now() WHERE name = %s",
+            *fields.values(), name,
+        )
+
+    async def delete(self, name: str) -> None:
+        await self.run("DELETE FROM aax_activation WHERE name = %s", name)
+
+
+class ActivationManager:
+    def __init__(self) -> None:
+        self.store = ActivationStore()
+        self.redis = aioredis.Redis(
+            host=os.getenv("EDA_REDIS_HOST", "eda-redis"),
+            port=int(os.getenv("EDA_REDIS_PORT", "6379")),
+        )
+        self.supervisor = EngineSupervisor(
+            self._on_status,
+            max_restarts=int(os.getenv("EDA_ACTIVATION_MAX_RESTARTS", "5")),
+        )
+        # name -> enabled, mirrored from aax_activation by the API handlers.
+        self.activations: dict[str, bool] = {}
+        self.events_routed = 0
+        self.events_unrouted = 0
+        self._fan_out: asyncio.Task[None] | None = None
+
+    async def _on_status(self, name: str, status: str, exit_code: int | None, restarts: int) -> None:
+        log.info("activation %s: %s (exit code %s, restarts %s)", name, status, exit_code, restarts)
+        await self.store.update(name, status=status, exit_code=exit_code, restarts=restarts)
+
+    async def ensure_stream(self, name: str) -> None:
+        # The group exists before the engine does, so early events are kept.
+        try:
+            await self.redis.xgroup_create(event_stream(name), EVENT_GROUP, id="$", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def start(self, activation: dict[str, Any]) -> None:
+        name = activation["name"]
+        workdir = ACTIVATION_DIR / name
+        workdir.mkdir(parents=True, exist_ok=True)
+        (workdir / "rulebook.yml").write_text(activation["rulebook"], encoding="utf-8")
+        extra_vars = activation["extra_vars"] or {}
+        if extra_vars:
+            (workdir / "vars.yml").write_text(yaml.safe_dump(extra_vars), encoding="utf-8")
+        if activation["inventory"]:
+            (workdir / "inventory.yml").write_text(activation["inventory"], encoding="utf-8")
+        await self.ensure_stream(name)
+        env = engine_environment(
+            os.environ, AAX_ACTIVATION=name, PYTHONUNBUFFERED="1", JAVA_TOOL_OPTIONS=JVM_OPTIONS,
+        )
+        command = engine_command(workdir, extra_vars=bool(extra_vars), inventory=bool(activation["inventory"]))
+        await self.supervisor.start(Engine(name, command, env=env, cwd=workdir))
+
+    async def restore(self) -> None:
+        await self.store.ensure_schema()
+        for activation in await self.store.all():
+            name = activation["name"]
+            self.activations[name] = False
+            if not activation["enabled"]:
+                continue
+            if self.claim(name):
+                await self.start(activation)
+            else:
+                # EDA_MAX_ACTIVATIONS was lowered below the number enabled.
+                log.warning("activation %s: not started, EDA_MAX_ACTIVATIONS (%s) reached", name, MAX_ACTIVATIONS)
+                await self.store.update(name, enabled=False, status="stopped")
+        try:
+            # "0": entries left over from a previous run are fanned out first.
+            await self.redis.xgroup_create(INGEST_STREAM, INGEST_GROUP, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._fan_out = asyncio.create_task(self.fan_out())
+
+    def running(self) -> list[str]:
+        return [name for name, engine in self.supervisor.engines.items() if engine.running]
+
+    def enabled(self) -> list[str]:
+        return [name for name, enabled in self.activations.items() if enabled]
+
+    def claim(self, name: str) -> bool:
+        """Mark ``name`` enabled unless that would exceed ``EDA_MAX_ACTIVATIONS``."""
+        if not can_enable(self.activations, name, MAX_ACTIVATIONS):
+            return False
+        self.activations[name] = True
+        return True
+
+    async def fan_out(self) -> None:
+        """Copy ingested events to the stream of every enabled activation."""
+        last_id = "0"
+        while True:
+            try:
+                targets = self.enabled()
+                last_id, moved = await fan_out_batch(
+                    self.redis, targets, set(self.running()), last_id,
+                    count=FANOUT_BATCH, queue_max=ACTIVATION_QUEUE_MAX,
+                )
+                if targets:
+                    self.events_routed += moved
+                else:
+                    self.events_unrouted += moved
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("event fan-out failed; retrying")
+                await asyncio.sleep(1)
+
+    def describe(self, activation: dict[str, Any]) -> dict[str, Any]:
+        engine = self.supervisor.engines.get(activation["name"])
+        return {
+            **{key: value for key, value in activation.items() if key != "rulebook"},
+            "created_at": activation["created_at"].isoformat(),
+            "updated_at": activation["updated_at"].isoformat(),
+            "engine": engine.describe() if engine else None,
+        }
+
+    async def close(self) -> None:
+        if self._fan_out is not None:
+            self._fan_out.cancel()
+        await self.supervisor.stop_all()
+        await self.redis.aclose()
+
+
+MANAGER = web.AppKey("manager", ActivationManager)
+TOKEN = web.AppKey("token", str)
+
+
+def _error(status: int, detail: str) -> web.Response:
+    return web.json_response({"detail": detail}, status=status)
+
+
+def _throttled(detail: str) -> web.Response:
+    return web.json_response({"detail": detail}, status=429, headers={"Retry-After": "1"})
+
+
+def _at_capacity() -> web.Response:
+    return _error(409, f"EDA_MAX_ACTIVATIONS ({MAX_ACTIVATIONS}) activations are enabled; stop one first.")
+
+
+@web.middleware
+async def require_token(request: web.Request, handler: Any) -> web.StreamResponse:
+    if request.path not in PUBLIC_PATHS and not authorized(
+        request.headers.get("Authorization"), request.app[TOKEN],
+    ):
+        return web.json_response(
+            {"detail": "Authentication credentials were not provided or are invalid."},
+            status=401, headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await handler(request)
+
+
+def check_token(token: str) -> str:
+    if not token:
+        raise RuntimeError("EDA_API_TOKEN must be set (non-empty)")
+    allow_placeholder = os.getenv("AAX_ALLOW_PLACEHOLDER_SECRETS", "false").lower() == "true"
+    if token.startswith(("REPLACE_WITH_", "CHANGE_ME_")) and not allow_placeholder:
+        raise RuntimeError(
+            "EDA_API_TOKEN contains placeholder value; "
+            "set AAX_ALLOW_PLACEHOLDER_SECRETS=true only for local dev"
+        )
+    return token
+
+
+async def _activation_or_404(request: web.Request) -> dict[str, Any] | web.Response:
+    activation = await request.app[MANAGER].store.get(request.match_info["name"])
+    return activation if activation is not None else _error(404, "Activation not found.")
+
+
+async def health(request: web.Request) -> web.Response:
+    manager: ActivationManager = request.app[MANAGER]
+    return web.json_response({
+        "status": "ok",
+        "engines_running": len(manager.running()),
+        "activations_enabled": len(manager.enabled()),
+        "max_activations": MAX_ACTIVATIONS,
+        "ingest_backlog": await manager.redis.xlen(INGEST_STREAM),
+        "events_routed": manager.events_routed,
+        "events_unrouted": manager.events_unrouted,
+        "jvm_options": JVM_OPTIONS,
+    })
+
+
+async def ingest_events(request: web.Request) -> web.Response:
+    manager: ActivationManager = request.app[MANAGER]
+    try:
+        events = parse_event_batch(await request.json(), INGEST_MAX_BATCH)
+    except ValueError as exc:
+        return _error(400, str(exc))
+    if await manager.redis.xlen(INGEST_STREAM) + len(events) > INGEST_MAX_PENDING:
+        return _throttled("Event backlog is full; retry later.")
+    try:
+        async with manager.redis.pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.xadd(INGEST_STREAM, {"event": json.dumps(event)})
+            await pipe.execute()
+    except ResponseError as exc:
+        # eda-redis runs with noeviction, so a full instance rejects writes.
+        if "OOM" in str(exc):
+            return _throttled("Event buffer is out of memory; retry later.")
+        raise
+    return web.json_response({"accepted": len(events), "accepted_at": time.time()}, status=202)
+
+
+async def list_activations(request: web.Request) -> web.Response:
+    manager: ActivationManager = request.app[MANAGER]
+    return web.json_response({"results": [manager.describe(a) for a in await manager.store.all()]})
+
+
+async def create_activation(request: web.Request) -> web.Response:
+    manager: ActivationManager = request.app[MANAGER]
+    try:
+        body = await request.json()
+        name = validate_name(body.get("name"))
+        rulebook = body.get("rulebook")
+        if not isinstance(rulebook, str):
+            rulebook = yaml.safe_dump(rulebook, sort_keys=False)
+        validate_rulebook(rulebook)
+        extra_vars = body.get("extra_vars") or {}
+        if not isinstance(extra_vars, dict):
+            raise ValueError("extra_vars must be a mapping")
+        inventory = body.get("inventory")
+        if inventory is not None and not isinstance(inventory, str):
+            inventory = yaml.safe_dump(inventory, sort_keys=False)
+    except (ValueError, AttributeError) as exc:
+        return _error(400, str(exc))
+
+    enabled = bool(body.get("enabled", True))
+    if name in manager.activations:
+        return _error(409, f"Activation {name!r} already exists.")
+    # Claimed before the insert, so concurrent requests cannot both take the last slot.
+    if enabled and not manager.claim(name):
+        return _at_capacity()
+    activation = await manager.store.create(name, rulebook, extra_vars, inventory, enabled)
+    if activation is None:
+        manager.activations.pop(name, None)
+        return _error(409, f"Activation {name!r} already exists.")
+    manager.activations[name] = activation["enabled"]
+    if activation["enabled"]:
+        await manager.start(activation)
+    return web.json_response(manager.describe(await manager.store.get(name)), status=201)
+
+
+async def get_activation(request: web.Request) -> web.Response:
+    activation = await _activation_or_404(request)
+    if isinstance(activation, web.Response):
+        return activation
+    return web.json_response({**request.app[MANAGER].describe(activation), "rulebook": activation["rulebook"]})
+
+
+async def start_activation(request: web.Request) -> web.Response:
+    manager: ActivationManager = request.app[MANAGER]
+    activation = await _activation_or_404(request)
+    if isinstance(activation, web.Response):
+        return activation
+    if not manager.claim(activation["name"]):
+        return _at_capacity()
+    await manager.store.update(activation["name"], enabled=True)
+    await manager.start(activation)
+    return web.json_response(manager.describe(await manager.store.get(activation["name"])))
+
+
+async def stop_activation(request: web.Request) -> web.Response:
+    manager: ActivationManager = request.app[MANAGER]
+    activation = await _activation_or_404(request)
+    if isinstance(activation, web.Response):
+        return activation
+    manager.activations[activation["name"]] = False
+    await manager.supervisor.stop(activation["name"])
+    await manager.store.update(activation["name"], enabled=False, status="stopped")
+    return web.json_response(manager.describe(await manager.store.get(activation["name"])))
+
+
+async def delete_activation(request: web.Request) -> web.Response:
+    manager: ActivationManager = request.app[MANAGER]
+    activation = await _activation_or_404(request)
+    if isinstance(activation, web.Response):
+        return activation
+    name = activation["name"]
+    manager.activations.pop(name, None)
+    await manager.supervisor.stop(name)
+    await manager.store.delete(name)
+    await manager.redis.delete(event_stream(name))
+    shutil.rmtree(ACTIVATION_DIR / name, ignore_errors=True)
+    return web.Response(status=204)
+
+
+async def post_event(request: web.Request) -> web.Response:
+    manager: ActivationManager = request.app[MANAGER]
+    name = request.match_info["name"]
+    if name not in manager.activations:
+        return _error(404, "Activation not found.")
+    try:
+        event = await request.json()
+    except ValueError:
+        return _error(400, "Event must be a JSON object.")
+    if not isinstance(event, dict):
+        return _error(400, "Event must be a JSON object.")
+    stream = event_stream(name)
+    if await manager.redis.xlen(stream) >= ACTIVATION_QUEUE_MAX:
+        return _throttled("Activation event queue is full; retry later.")
+    entry_id = await manager.redis.xadd(stream, {"event": json.dumps(event)})
+    return web.json_response({"id": entry_id.decode(), "accepted_at": time.time()}, status=202)
+
+
+async def activation_output(request: web.Request) -> web.Response:
+    manager: ActivationManager = request.app[MANAGER]
+    activation = await _activation_or_404(request)
+    if isinstance(activation, web.Response):
+        return activation
+    try:
+        after = int(request.query.get("after", "0"))
+    except ValueError:
+        return _error(400, "after must be an integer.")
+    engine = manager.supervisor.engines.get(activation["name"])
+    return web.json_response({"results": engine.lines(after) if engine else []})
+
+
+def create_app(token: str = API_TOKEN) -> web.Application:
+    # Room for a full batch of EDA_INGEST_MAX_BATCH events.
+    app = web.Application(client_max_size=16 * 1024 * 1024, middlewares=[require_token])
+    app[TOKEN] = check_token(token)
+    app[MANAGER] = ActivationManager()
+
+    async def on_startup(app: web.Application) -> None:
+        await app[MANAGER].restore()
+
+    async def on_cleanup(app: web.Application) -> None:
+        await app[MANAGER].close()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.add_routes([
+        web.get("/health", health),
+        web.post("/api/v1/events", ingest_events),
+        web.get("/api/v1/activations", list_activations),
+        web.post("/api/v1/activations", create_activation),
+        web.get("/api/v1/activations/{name}", get_activation),
+        web.delete("/api/v1/activations/{name}", delete_activation),
+        web.post("/api/v1/activations/{name}/start", start_activation),
+        web.post("/api/v1/activations/{name}/stop", stop_activation),
+        web.post("/api/v1/activations/{name}/events", post_event),
+        web.get("/api/v1/activations/{name}/output", activation_output),
+    ])
+    return app
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("EDA_LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    web.run_app(
+        create_app(),
+        host=os.getenv("EDA_HOST", "0.0.0.0"),
+        port=int(os.getenv("EDA_PORT", "5000")),
+        access_log=None,
+    )
@@ -0,0 +1,29 @@
+"""Build-time event source for the AppCDS training run.
+
+The image build runs ``training.yml`` once with ``-XX:DumpLoadedClassList`` to
+record the classes the Drools engine loads while matching rules, then dumps
+them into ``/opt/aax/eda/jvm/drools.jsa``. When this source returns,
+ansible-rulebook shuts down and the JVM exits. It is not shipped in the image.
+
+Arguments (all optional):
+
+- ``events``: number of events to emit (default 500)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+
+async def main(queue: asyncio.Queue, args: dict[str, Any]) -> None:
+    for seq in range(int(args.get("events", 500))):
+        await queue.put({
+            "seq": seq,
+            "payload": {
+                "action": "deploy" if seq % 3 == 0 else "noop",
+                "host": f"node{seq % 7}",
+                "severity": seq % 10,
+                "tags": ["aax", f"batch{seq % 4}"],
+            },
+        })
@@ -7,7 +7,8 @@ if [ "$#" -gt 0 ]; then
 fi
 
 # Event-Driven Ansible Controller Entrypoint
-# Starts the ansible-rulebook engine in server mode
+# Starts the activation manager, which runs one resident ansible-rulebook
+# engine per activation (aax_eda_manager.py)
 
 # Function to wait for a service
 wait_for_service() {
@@ -40,14 +41,5 @@ if [ -n "$EDA_REDIS_HOST" ]; then
   wait_for_service "$EDA_REDIS_HOST" "${EDA_REDIS_PORT:-6379}" "Redis"
 fi
 
-# Start as Event-Driven Ansible controller POC
-# This container serves as a template for running ansible-rulebook rules
-echo "Starting Event-Driven Ansible Controller..."
-echo "EDA controller is ready to execute rulebooks"
-echo "To run a rulebook: docker exec eda-controller ansible-rulebook -r /path/to/rulebook.yml"
-
-# Keep container alive for rulebook execution requests
-while true; do
-  echo "[$(date)] EDA Controller running - waiting for rulebook execution requests"
-  sleep 60
-done
+echo "Starting EDA activation manager on ${EDA_HOST:-0.0.0.0}:${EDA_PORT:-5000}..."
+exec python /opt/aax/eda/aax_eda_manager.py
@@ -0,0 +1,89 @@
+"""ansible-rulebook event source for AAX activations.
+
+The activation manager starts every engine with ``--source-dir`` pointing here
+and ``AAX_ACTIVATION`` set to the activation name. Events posted to the
+activation are appended to the Redis stream ``aax:eda:events:<activation>`` in
+``eda-redis`` and delivered to the rulebook through the ``aax-engine`` consumer
+group, so events that arrive while the engine is restarting are not lost.
+Delivered entries are removed from the stream.
+
+Example::
+
+    sources:
+      - aax_events: {}
+
+Arguments (all optional):
+
+- ``batch``: events read per round trip (default 100)
+- ``block_ms``: how long one read waits for new events (default 1000)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+from typing import Any
+
+import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
+
+STREAM_PREFIX = "aax:eda:events:"
+GROUP = "aax-engine"
+
+
+async def main(queue: asyncio.Queue, args: dict[str, Any]) -> None:
+    stream = f"{STREAM_PREFIX}{os.environ['AAX_ACTIVATION']}"
+    batch = int(args.get("batch", 100))
+    block_ms = int(args.get("block_ms", 1000))
+    consumer = socket.gethostname()
+    client = aioredis.Redis(
+        host=os.getenv("EDA_REDIS_HOST", "eda-redis"),
+        port=int(os.getenv("EDA_REDIS_PORT", "6379")),
+    )
+    try:
+        await client.xgroup_create(stream, GROUP, id="$", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+    # "0" first re-delivers anything read but not acknowledged before a restart.
+    last_id = "0"
+    try:
+        while True:
+            # Leave events in Redis until the engine has caught up, so at most
+            # one batch is buffered inside ansible-rulebook.
+            while queue.qsize() >= batch:
+                await asyncio.sleep(0.01)
+            response = await client.xreadgroup(
+                GROUP, consumer, {stream: last_id}, count=batch, block=block_ms,
+            )
+            entries = response[0][1] if response else []
+            if last_id == "0" and not entries:
+                last_id = ">"
+                continue
+            for _entry_id, fields in entries:
+                await queue.put(json.loads(fields[b"event"]))
+            if entries:
+                # Delivered entries are deleted, so the stream length is the
+                # activation's backlog (the manager's backpressure signal).
+                ids = [entry_id for entry_id, _ in entries]
+                await client.xack(stream, GROUP, *ids)
+                await client.xdel(stream, *ids)
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    # ansible-rulebook loads this module itself; running it directly prints the
+    # events for AAX_ACTIVATION, which is handy when debugging delivery.
+
+    class _PrintQueue:
+        def qsize(self) -> int:
+            return 0
+
+        async def put(self, event: dict[str, Any]) -> None:
+            print(event, flush=True)
+
+    asyncio.run(main(_PrintQueue(), {}))  # type: ignore[arg-type]
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+DOCUMENTATION = """
+    name: aax_facts
+    short_description: Compressed fact cache shared across jobs (directory or Redis)
+    description:
+      - Keeps gathered facts between ephemeral runner processes so that
+        C(gathering = smart) skips hosts whose facts are still fresh.
+      - With no connection the cache lives in memory for one run, like C(memory).
+      - A path stores one gzip-compressed JSON file per host, for a volume shared by
+        the execution nodes. Expired files are deleted when the cache is opened and
+        when they are next read.
+      - A C(redis://) or C(rediss://) URL stores one compressed value per host in Redis
+        with the timeout as the key's TTL, so Redis evicts them itself.
+      - Keys are inventory hostnames, so each entry is also scoped to the inventory it
+        came from (O(scope)). Two inventories that share a hostname for different
+        machines never read each other's facts.
+      - Installed in the execution environment image; C(ansible.cfg) selects it.
+    options:
+      _uri:
+        description:
+          - Fact cache location. Empty keeps facts in memory for the current run.
+          - A directory path, or a Redis URL such as C(redis://awx-redis:6379/3).
+        env:
+          - name: ANSIBLE_CACHE_PLUGIN_CONNECTION
+          - name: AAX_FACT_CACHE
+        ini:
+          - key: fact_caching_connection
+            section: defaults
+      _prefix:
+        description: Prefix of the per-host file names or Redis keys.
+        default: ansible_facts_
+        env:
+          - name: ANSIBLE_CACHE_PLUGIN_PREFIX
+        ini:
+          - key: fact_caching_prefix
+            section: defaults
+      _timeout:
+        description: Seconds before cached facts expire and are gathered again; 0 never expires.
+        default: 86400
+        env:
+          - name: ANSIBLE_CACHE_PLUGIN_TIMEOUT
+          - name: AAX_FACT_CACHE_TTL
+        ini:
+          - key: fact_caching_timeout
+            section: defaults
+        type: integer
+      scope:
+        description:
+          - Inventory the facts belong to, added to the prefix of every file name or key.
+          - AWX sets C(INVENTORY_ID) for each job. Elsewhere, or when empty, a hash of the
+            inventory sources the play was started with is used.
+        env:
+          - name: AAX_FACT_CACHE_SCOPE
+          - name: INVENTORY_ID
+      compression_level:
+        description: gzip level (1-9) for stored facts; 0 stores plain JSON.
+        default: 6
+        env:
+          - name: AAX_FACT_CACHE_COMPRESSION
+        type: integer
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from ansible import context
+from ansible.errors import AnsibleError
+from ansible.plugins.cache import BaseCacheModule
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _inventory_scope(scope: str | None) -> str:
+    """Scope for the cache keys: ``inventory-<id>``, or a hash of the inventory sources."""
+    if scope:
+        return "inventory-" + re.sub(r"[^A-Za-z0-9_.-]", "_", str(scope))
+    sources = context.CLIARGS.get("inventory") or ()
+    if isinstance(sources, str):
+        sources = [sources]
+    digest = hashlib.sha256("\n".join(sorted(sources)).encode()).hexdigest()[:12]
+    return f"inventory-{digest}"
+
+
+class _DirectoryStore:
+    """One file per host; the file's mtime is its age."""
+
+    def __init__(self, path: str, prefix: str, timeout: int) -> None:
+        self.root = Path(os.path.expanduser(os.path.expandvars(path)))
+        self.prefix = prefix
+        self.timeout = timeout
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            raise AnsibleError(f"aax_facts: cannot create fact cache directory {self.root}: {exc}") from exc
+        if not os.access(self.root, os.R_OK | os.W_OK | os.X_OK):
+            raise AnsibleError(f"aax_facts: fact cache directory {self.root} is not writable")
+        if timeout:
+            self.keys()  # evicts expired files, including hosts no longer in any inventory
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{self.prefix}{key}.json.gz"
+
+    def _fresh(self, path: Path) -> bool:
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if self.timeout and age > self.timeout:
+            path.unlink(missing_ok=True)
+            return False
+        return True
+
+    def load(self, key: str) -> bytes | None:
+        path = self._path(key)
+        if not self._fresh(path):
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, data: bytes) -> None:
+        # Write then rename, so concurrent jobs never read a partial file.
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".aax_facts-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def keys(self) -> list[str]:
+        keys = []
+        for path in self.root.glob(f"{self.prefix}*.json.gz"):
+            if self._fresh(path):
+                keys.append(path.name[len(self.prefix):-len(".json.gz")])
+        return keys
+
+
+class _RedisStore:
+    """One key per host; Redis expires it after the timeout."""
+
+    def __init__(self, url: str, prefix: str, timeout: int) -> None:
+        if redis is None:
+            raise AnsibleError("aax_facts: a Redis fact cache needs the 'redis' Python package")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.timeout = timeout
+
+    def load(self, key: str) -> bytes | None:
+        return self.client.get(f"{self.prefix}{key}")
+
+    def save(self, key: str, data: bytes) -> None:
+        self.client.set(f"{self.prefix}{key}", data, ex=self.timeout or None)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(f"{self.prefix}{key}")
+
+    def keys(self) -> list[str]:
+        return [
+            name.decode()[len(self.prefix):]
+            for name in self.client.scan_iter(match=f"{self.prefix}*", count=1000)
+        ]
+
+
+class CacheModule(BaseCacheModule):
+    """Fact cache in memory, in a shared directory or in Redis, chosen by the connection."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        uri = self.get_option("_uri") or ""
+        prefix = f'{self.get_option("_prefix") or ""}{_inventory_scope(self.get_option("scope"))}_'
+        timeout = int(self.get_option("_timeout"))
+        self._level = int(self.get_option("compression_level"))
+        # Facts already read or written in this run, as the file cache plugins keep them.
+        self._cache: dict[str, object] = {}
+        if uri.startswith(("redis://", "rediss://")):
+            self._store = _RedisStore(uri, prefix, timeout)
+        elif uri:
+            self._store = _DirectoryStore(uri, prefix, timeout)
+        else:
+            self._store = None
+        # Without a store, skip the serialization wrapper newer ansible-core
+        # applies to persistent cache plugins.
+        self._persistent = self._store is not None
+
+    def _encode(self, value: object) -> bytes:
+        data = json.dumps(value, separators=(",", ":")).encode()
+        return gzip.compress(data, compresslevel=self._level, mtime=0) if self._level else data
+
+    @staticmethod
+    def _decode(data: bytes) -> object:
+        if data.startswith(GZIP_MAGIC):
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+    def get(self, key):
+        if key not in self._cache:
+            data = self._store.load(key) if self._store else None
+            if data is None:
+                raise KeyError(key)
+            try:
+                self._cache[key] = self._decode(data)
+            except (OSError, ValueError) as exc:
+                self._store.delete(key)
+                self._display.warning(f"aax_facts: discarded unreadable cached facts for {key}: {exc}")
+                raise KeyError(key) from exc
+        return self._cache[key]
+
+    def set(self, key, value):
+        self._cache[key] = value
+        if self._store:
+            self._store.save(key, self._encode(value))
+
+    def keys(self):
+        return self._store.keys() if self._store else list(self._cache)
+
+    def contains(self, key):
+        try:
+            self.get(key)
+        except KeyError:
+            return False
+        return True
+
+    def delete(self, key):
+        self._cache.pop(key, None)
+        if self._store:
+            self._store.delete(key)
+
+    def flush(self):
+        for key in self.keys():
+            self.delete(key)
+        self._cache = {}
+
+    def copy(self):
+        return {key: self.get(key) for key in self.keys()}
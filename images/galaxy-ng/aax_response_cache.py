@@ -0,0 +1,366 @@
+"""Response cache for idempotent Galaxy collection index requests.
+
+EE builds hit the same ``/api/galaxy/v3/collections/`` index and version-list
+endpoints thousands of times. This WSGI middleware keeps a per-process LRU
+cache, optionally backed by Redis so that all gunicorn workers share entries,
+and answers ``If-None-Match`` revalidation with ``304 Not Modified``.
+
+Cache keys embed a repository publish marker (see ``aax_wsgi``). When a new
+repository version is published the marker changes and every older entry
+becomes unreachable, so invalidation needs no coordination with pulp-worker.
+
+Only GET/HEAD requests without a session cookie are considered, and only GET
+responses are stored: a HEAD is answered from a cached GET or passed through.
+Requests with an ``Authorization`` header bypass the cache unless
+``GALAXY_RESPONSE_CACHE_AUTHENTICATED`` is enabled, in which case the
+credential is part of the key and each token gets its own entries.
+
+The hit/miss counters at ``STATS_PATH`` are only served to requests whose
+``X-AAX-Stats-Token`` header matches ``GALAXY_RESPONSE_CACHE_STATS_TOKEN``;
+without a token the path is left to Django.
+
+Configuration (environment):
+
+- ``GALAXY_RESPONSE_CACHE``: ``off`` (default), ``local`` or ``redis``
+- ``GALAXY_RESPONSE_CACHE_TTL``: entry lifetime in seconds (default 60)
+- ``GALAXY_RESPONSE_CACHE_MAX_ENTRIES``: per-process LRU size (default 512)
+- ``GALAXY_RESPONSE_CACHE_MAX_BODY``: largest cached body in bytes (default 2 MiB)
+- ``GALAXY_RESPONSE_CACHE_CHECK_INTERVAL``: seconds between publish marker
+  checks (default 5)
+- ``GALAXY_RESPONSE_CACHE_PATHS``: comma-separated cacheable path prefixes
+- ``GALAXY_RESPONSE_CACHE_AUTHENTICATED``: also cache token-authenticated
+  requests (default false)
+- ``GALAXY_RESPONSE_CACHE_REDIS_URL``: Redis URL for ``redis`` mode
+- ``GALAXY_RESPONSE_CACHE_STATS_TOKEN``: enables the stats endpoint for
+  requests carrying it (default empty, endpoint off)
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("aax.response_cache")
+
+DEFAULT_PATH_PREFIXES = (
+    "/api/galaxy/v3/collections/",
+    "/api/galaxy/v3/plugin/ansible/content/",
+    "/api/galaxy/content/",
+)
+STATS_PATH = "/api/galaxy/_aax/response-cache/"
+
+# Request headers that change the rendered response for anonymous clients.
+_KEY_HEADERS = (
+    "HTTP_AUTHORIZATION",
+    "HTTP_HOST",
+    "HTTP_ACCEPT",
+    "HTTP_X_FORWARDED_PROTO",
+    "HTTP_X_FORWARDED_HOST",
+)
+_HOP_BY_HOP = {"connection", "keep-alive", "transfer-encoding", "content-length"}
+
+
+class LocalStore:
+    """Thread-safe LRU store with per-entry expiry."""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisStore:
+    """Shared store in Redis; failures degrade to cache misses."""
+
+    KEY_PREFIX = "aax:galaxy:response:"
+    STATS_KEY = "aax:galaxy:response-stats"
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        try:
+            return self.client.get(self.KEY_PREFIX + key)
+        except Exception:  # pragma: no cover - depends on Redis availability
+            logger.warning("response cache: Redis get failed", exc_info=True)
+            return None
+
+    def set(self, key, value, ttl):
+        try:
+            self.client.set(self.KEY_PREFIX + key, value, ex=max(1, int(ttl)))
+        except Exception:  # pragma: no cover - depends on Redis availability
+            logger.warning("response cache: Redis set failed", exc_info=True)
+
+    def incr(self, counter):
+        try:
+            self.client.hincrby(self.STATS_KEY, counter, 1)
+        except Exception:  # pragma: no cover - depends on Redis availability
+            pass
+
+    def stats(self):
+        try:
+            raw = self.client.hgetall(self.STATS_KEY)
+        except Exception:  # pragma: no cover - depends on Redis availability
+            return {}
+        return {
+            (k.decode() if isinstance(k, bytes) else k): int(v) for k, v in raw.items()
+        }
+
+
+def _encode(status, headers, body):
+    return json.dumps(
+        {"status": status, "headers": headers, "body": body.decode("latin-1")}
+    ).encode()
+
+
+def _decode(raw):
+    data = json.loads(raw)
+    return data["status"], [tuple(h) for h in data["headers"]], data["body"].encode("latin-1")
+
+
+class ResponseCache:
+    """WSGI middleware caching GET responses for selected path prefixes."""
+
+    def __init__(
+        self,
+        app,
+        publish_marker,
+        local=None,
+        shared=None,
+        ttl=60,
+        path_prefixes=DEFAULT_PATH_PREFIXES,
+        max_body=2 * 1024 * 1024,
+        check_interval=5.0,
+        mode="local",
+        authenticated=False,
+        stats_token="",
+    ):
+        self.app = app
+        self.publish_marker = publish_marker
+        self.local = local if local is not None else LocalStore()
+        self.shared = shared
+        self.ttl = ttl
+        self.path_prefixes = tuple(path_prefixes)
+        self.max_body = max_body
+        self.check_interval = check_interval
+        self.mode = mode
+        self.authenticated = authenticated
+        self.stats_token = stats_token
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "bypass": 0, "invalidations": 0}
+        self._marker = None
+        self._marker_checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path == STATS_PATH and self._stats_allowed(environ):
+            return self._stats_response(start_response)
+        if not self._cacheable_request(environ):
+            return self.app(environ, start_response)
+
+        marker = self._current_marker()
+        if marker is None:
+            self._count("bypass")
+            return self.app(environ, start_response)
+
+        key = self._key(environ, marker)
+        raw = self.local.get(key)
+        if raw is None and self.shared is not None:
+            raw = self.shared.get(key)
+            if raw is not None:
+                self.local.set(key, raw, self.ttl)
+        if raw is not None:
+            status, headers, body = _decode(raw)
+            return self._respond(environ, start_response, status, headers, body, "HIT")
+
+        self._count("misses")
+        status, headers, body = self._call_app(environ)
+        if environ.get("REQUEST_METHOD") == "GET" and self._cacheable_response(status, headers, body):
+            if not any(name.lower() == "etag" for name, _ in headers):
+                headers.append(("ETag", '"%s"' % hashlib.sha1(body).hexdigest()))
+            raw = _encode(status, headers, body)
+            self.local.set(key, raw, self.ttl)
+            if self.shared is not None:
+                self.shared.set(key, raw, self.ttl)
+        return self._respond(environ, start_response, status, headers, body, "MISS")
+
+    def _cacheable_request(self, environ):
+        if environ.get("REQUEST_METHOD") not in ("GET", "HEAD"):
+            return False
+        if not environ.get("PATH_INFO", "").startswith(self.path_prefixes):
+            return False
+        if environ.get("HTTP_AUTHORIZATION") and not self.authenticated:
+            return False
+        return "sessionid=" not in environ.get("HTTP_COOKIE", "")
+
+    def _cacheable_response(self, status, headers, body):
+        if not status.startswith("200") or len(body) > self.max_body:
+            return False
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered == "set-cookie":
+                return False
+            if lowered == "cache-control" and ("private" in value or "no-store" in value):
+                return False
+        return True
+
+    def _current_marker(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._marker_checked_at < self.check_interval:
+                return self._marker
+            self._marker_checked_at = now
+            previous = self._marker
+        try:
+            marker = self.publish_marker()
+        except Exception:
+            logger.warning("response cache: publish marker lookup failed", exc_info=True)
+            marker = None
+        with self._lock:
+            self._marker = marker
+        if previous is not None and marker != previous:
+            self.local.clear()
+            self._count("invalidations")
+        return marker
+
+    def _key(self, environ, marker):
+        parts = [
+            marker,
+            environ.get("PATH_INFO", ""),
+            environ.get("QUERY_STRING", ""),
+        ]
+        parts.extend(environ.get(header, "") for header in _KEY_HEADERS)
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def _call_app(self, environ):
+        captured = {}
+        chunks = []
+
+        def capture(status, headers, exc_info=None):
+            captured["status"] = status
+            captured["headers"] = list(headers)
+            return chunks.append
+
+        result = self.app(environ, capture)
+        try:
+            for chunk in result:
+                chunks.append(chunk)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        headers = [(k, v) for k, v in captured["headers"] if k.lower() not in _HOP_BY_HOP]
+        return captured["status"], headers, b"".join(chunks)
+
+    def _respond(self, environ, start_response, status, headers, body, outcome):
+        etag = next((value for name, value in headers if name.lower() == "etag"), None)
+        if_none_match = environ.get("HTTP_IF_NONE_MATCH", "")
+        if outcome == "HIT":
+            self._count("hits")
+        if etag and status.startswith("200") and etag in [t.strip() for t in if_none_match.split(",")]:
+            self._count("revalidated")
+            start_response("304 Not Modified", [("ETag", etag), ("X-AAX-Cache", outcome)])
+            return [b""]
+        out_headers = list(headers) + [
+            ("Content-Length", str(len(body))),
+            ("X-AAX-Cache", outcome),
+        ]
+        start_response(status, out_headers)
+        if environ.get("REQUEST_METHOD") == "HEAD":
+            return [b""]
+        return [body]
+
+    def _count(self, counter):
+        with self._lock:
+            self.stats[counter] += 1
+        if self.shared is not None:
+            self.shared.incr(counter)
+
+    def _stats_allowed(self, environ):
+        supplied = environ.get("HTTP_X_AAX_STATS_TOKEN", "")
+        return bool(self.stats_token) and hmac.compare_digest(supplied.encode(), self.stats_token.encode())
+
+    def _stats_response(self, start_response):
+        with self._lock:
+            process = dict(self.stats)
+        payload = {"mode": self.mode, "ttl": self.ttl, "process": process}
+        if self.shared is not None:
+            payload["shared"] = self.shared.stats()
+        body = json.dumps(payload).encode()
+        start_response(
+            "200 OK",
+            [
+                ("Content-Type", "application/json"),
+                ("Content-Length", str(len(body))),
+                ("Cache-Control", "no-store"),
+            ],
+        )
+        return [body]
+
+
+def wrap(app, publish_marker, environ=os.environ):
+    """Return ``app`` wrapped in a ResponseCache configured from ``environ``."""
+    mode = environ.get("GALAXY_RESPONSE_CACHE", "off").strip().lower()
+    if mode in ("", "off", "false", "0"):
+        return app
+    if mode not in ("local", "redis"):
+        raise RuntimeError(f"GALAXY_RESPONSE_CACHE must be off, local or redis (got {mode!r})")
+
+    prefixes = [
+        prefix.strip()
+        for prefix in environ.get("GALAXY_RESPONSE_CACHE_PATHS", "").split(",")
+        if prefix.strip()
+    ] or DEFAULT_PATH_PREFIXES
+
+    shared = None
+    if mode == "redis":
+        import redis
+
+        url = environ.get(
+            "GALAXY_RESPONSE_CACHE_REDIS_URL",
+            "redis://{}:{}/3".format(
+                environ.get("REDIS_HOST", "hub-redis"), environ.get("REDIS_PORT", "6379")
+            ),
+        )
+        shared = RedisStore(redis.Redis.from_url(url, socket_timeout=0.5))
+
+    return ResponseCache(
+        app,
+        publish_marker,
+        local=LocalStore(int(environ.get("GALAXY_RESPONSE_CACHE_MAX_ENTRIES", "512"))),
+        shared=shared,
+        ttl=int(environ.get("GALAXY_RESPONSE_CACHE_TTL", "60")),
+        path_prefixes=prefixes,
+        max_body=int(environ.get("GALAXY_RESPONSE_CACHE_MAX_BODY", str(2 * 1024 * 1024))),
+        check_interval=float(environ.get("GALAXY_RESPONSE_CACHE_CHECK_INTERVAL", "5")),
+        mode=mode,
+        authenticated=environ.get("GALAXY_RESPONSE_CACHE_AUTHENTICATED", "false").lower()
+        in ("1", "true", "yes"),
+        stats_token=environ.get("GALAXY_RESPONSE_CACHE_STATS_TOKEN", ""),
+    )
@@ -1,12 +1,33 @@
 """AAX WSGI compatibility wrapper for galaxy-ng service.
 
 Keeps upstream Django routing intact and only redirects legacy root/UI
-paths to the Galaxy API entrypoint.
+paths to the Galaxy API entrypoint. Anonymous collection index reads can be
+served from the optional response cache (see ``aax_response_cache``).
 """
 
+import aax_response_cache
 from pulpcore.app.wsgi import application as django_application
 
 
+def _repository_publish_marker():
+    """Return a token that changes whenever a repository version is published."""
+    from django.db import close_old_connections
+    from django.db.models import Count, Max
+    from pulpcore.app.models import RepositoryVersion
+
+    try:
+        latest = RepositoryVersion.objects.filter(complete=True).aggregate(
+            count=Count("pk"), updated=Max("pulp_last_updated")
+        )
+    finally:
+        close_old_connections()
+    updated = latest["updated"].isoformat() if latest["updated"] else ""
+    return f"{latest['count']}:{updated}"
+
+
+_cached_application = aax_response_cache.wrap(django_application, _repository_publish_marker)
+
+
 def application(environ, start_response):
     path = environ.get("PATH_INFO", "")
 
@@ -14,4 +35,4 @@ def application(environ, start_response):
         start_response("302 Found", [("Location", "/api/galaxy/"), ("Content-Length", "0")])
         return [b""]
 
-    return django_application(environ, start_response)
+    return _cached_application(environ, start_response)
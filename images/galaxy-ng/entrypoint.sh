@@ -56,6 +56,10 @@ if [ ! -f /etc/pulp/certs/database_fields.symmetric.key ]; then
   chmod 644 /etc/pulp/certs/database_fields.symmetric.key
 fi
 
+# Settings import has no side effects; create the writable paths here.
+mkdir -p /var/lib/pulp/media /var/lib/pulp/tmp /app/static
+export HUB_ROLE="${HUB_ROLE:-api}"
+
 # Use pulpcore settings with a static settings file, which loads plugin apps
 # (including galaxy-ng) correctly in this packaging layout.
 export PULP_SETTINGS="${PULP_SETTINGS:-/etc/pulp/settings.py}"
@@ -70,11 +74,10 @@ echo "Skipping collectstatic"
 # Skip admin user creation - can be done later if needed
 echo "Skipping admin user creation"
 
-# Start Galaxy NG server
+# Start Galaxy NG server (workers, threads, recycling: see gunicorn.conf.py)
 echo "Starting Galaxy NG server..."
 exec gunicorn aax_wsgi:application \
+  --config /etc/pulp/gunicorn.conf.py \
   --bind '0.0.0.0:8000' \
-  --workers 4 \
-  --timeout 90 \
   --access-logfile - \
   --error-logfile -
@@ -0,0 +1,39 @@
+#!/bin/sh
+# Optional TLS listener (8443, HTTP/2) for the gateway server block.
+# GATEWAY_TLS=on enables it with GATEWAY_TLS_CERT/GATEWAY_TLS_KEY (default
+# /etc/nginx/tls/tls.crt and tls.key, the layout of a kubernetes.io/tls Secret).
+# Without a certificate there, a self-signed one is generated for localhost.
+set -eu
+
+listen_conf=/etc/nginx/aax/tls/listen.conf
+rm -f "$listen_conf"
+[ "${GATEWAY_TLS:-off}" = on ] || exit 0
+
+cert=${GATEWAY_TLS_CERT:-/etc/nginx/tls/tls.crt}
+key=${GATEWAY_TLS_KEY:-/etc/nginx/tls/tls.key}
+if [ ! -s "$cert" ] || [ ! -s "$key" ]; then
+  dir=/etc/nginx/tls
+  [ -w "$dir" ] || dir=/tmp/aax-tls
+  mkdir -p "$dir"
+  cert=$dir/tls.crt
+  key=$dir/tls.key
+  if [ ! -s "$cert" ] || [ ! -s "$key" ]; then
+    echo "$0: no TLS certificate provided, generating a self-signed one in $dir"
+    openssl req -x509 -nodes -days 825 -newkey ec -pkeyopt ec_paramgen_curve:prime256v1 \
+      -subj "/CN=${GATEWAY_TLS_HOSTNAME:-localhost}" \
+      -addext "subjectAltName=DNS:${GATEWAY_TLS_HOSTNAME:-localhost},DNS:localhost,IP:127.0.0.1" \
+      -keyout "$key" -out "$cert" 2>/dev/null
+  fi
+fi
+
+cat > "$listen_conf" <<CONF
+listen 8443 ssl;
+listen [::]:8443 ssl;
+http2 on;
+ssl_certificate $cert;
+ssl_certificate_key $key;
+ssl_protocols TLSv1.2 TLSv1.3;
+ssl_session_cache shared:aax_tls:10m;
+ssl_session_timeout 1d;
+CONF
+echo "$0: TLS listener enabled on 8443 (HTTP/2) with $cert"
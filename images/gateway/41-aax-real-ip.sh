@@ -0,0 +1,27 @@
+#!/bin/sh
+# Client addresses behind an ingress or load balancer (realip module).
+# GATEWAY_TRUSTED_PROXIES lists the proxy addresses or CIDRs (comma or space
+# separated) whose X-Forwarded-For is believed. $remote_addr, and with it the
+# rate-limit key and the access log, becomes the last address in the header
+# that is not one of them. GATEWAY_RATE_LIMIT=forwarded requires the list.
+set -eu
+
+real_ip_conf=/etc/nginx/aax/realip/real-ip.conf
+rm -f "$real_ip_conf"
+proxies=$(echo "${GATEWAY_TRUSTED_PROXIES:-}" | tr ',' ' ')
+if [ -z "$(echo "$proxies" | tr -d ' ')" ]; then
+  if [ "${GATEWAY_RATE_LIMIT:-on}" = forwarded ]; then
+    echo "$0: GATEWAY_RATE_LIMIT=forwarded needs GATEWAY_TRUSTED_PROXIES (the ingress address or CIDR)" >&2
+    exit 1
+  fi
+  exit 0
+fi
+
+for proxy in $proxies; do
+  echo "set_real_ip_from $proxy;"
+done > "$real_ip_conf"
+cat >> "$real_ip_conf" <<CONF
+real_ip_header X-Forwarded-For;
+real_ip_recursive on;
+CONF
+echo "$0: client addresses taken from X-Forwarded-For behind $proxies"
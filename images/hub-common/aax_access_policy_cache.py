@@ -0,0 +1,68 @@
+"""Shared-cache lookups for pulpcore access policies.
+
+Every API request resolves its viewset's ``AccessPolicy`` row from Postgres.
+The policies change only when an administrator edits them, so the lookup is
+cached in the Django ``default`` cache (hub-redis) and shared by all gunicorn
+workers. Saving or deleting a policy drops its cache entry.
+
+Installed from the gunicorn ``post_worker_init`` hook (see gunicorn.conf.py).
+``HUB_ACCESS_POLICY_CACHE_TTL`` sets the entry lifetime in seconds; ``0``
+disables the cache.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger("aax.access_policy_cache")
+
+_MISSING = "__aax_no_access_policy__"
+
+
+def _cache_key(viewset_name):
+    return f"aax:access-policy:{viewset_name}"
+
+
+def install(ttl=None):
+    """Wrap ``AccessPolicyFromDB.get_access_policy`` with a cache lookup."""
+    if ttl is None:
+        ttl = int(os.getenv("HUB_ACCESS_POLICY_CACHE_TTL", "60"))
+    if ttl <= 0:
+        return False
+
+    from django.core.cache import cache
+    from django.db.models.signals import post_delete, post_save
+    from pulpcore.app.access_policy import AccessPolicyFromDB
+    from pulpcore.app.models import AccessPolicy
+    from pulpcore.app.util import get_view_urlpattern
+
+    if getattr(AccessPolicyFromDB.get_access_policy, "_aax_cached", False):
+        return True
+    uncached = AccessPolicyFromDB.get_access_policy
+
+    def get_access_policy(view):
+        try:
+            key = _cache_key(get_view_urlpattern(view))
+        except AttributeError:
+            return uncached(view)
+        try:
+            policy = cache.get(key)
+        except Exception:  # Redis unavailable: fall back to the database
+            logger.warning("access policy cache read failed", exc_info=True)
+            return uncached(view)
+        if policy is None:
+            policy = uncached(view)
+            try:
+                cache.set(key, _MISSING if policy is None else policy, ttl)
+            except Exception:
+                logger.warning("access policy cache write failed", exc_info=True)
+        return None if isinstance(policy, str) else policy
+
+    get_access_policy._aax_cached = True
+    AccessPolicyFromDB.get_access_policy = staticmethod(get_access_policy)
+
+    def invalidate(sender, instance, **kwargs):
+        cache.delete(_cache_key(instance.viewset_name))
+
+    post_save.connect(invalidate, sender=AccessPolicy, dispatch_uid="aax_access_policy_cache")
+    post_delete.connect(invalidate, sender=AccessPolicy, dispatch_uid="aax_access_policy_cache_delete")
+    return True
@@ -0,0 +1,237 @@
+"""Shared Django settings for the AAX Hub images (galaxy-ng and pulp).
+
+Each image's ``settings.py`` calls :func:`build` and adds only what differs
+between the images. Importing this module and calling :func:`build` only read
+the environment: nothing touches the filesystem or the network, so every
+gunicorn worker and pulpcore process loads the settings cheaply. The
+entrypoints create the media, static and upload directories instead.
+
+``HUB_ROLE`` (``api``, ``content`` or ``worker``) selects the defaults in
+``ROLE_DEFAULTS``. A knob can be overridden for every role with
+``HUB_<KNOB>`` (for example ``HUB_CACHE_TTL``) or for a single role with
+``HUB_<ROLE>_<KNOB>`` (for example ``HUB_CONTENT_REDIS_MAX_CONNECTIONS``).
+Empty values fall back to the role default.
+"""
+
+import os
+from pathlib import Path
+
+BASE_DIR = Path("/var/lib/pulp")
+MEDIA_ROOT = BASE_DIR / "media"
+STATIC_ROOT = Path("/app/static")
+FILE_UPLOAD_TEMP_DIR = BASE_DIR / "tmp"
+
+ROLES = ("api", "content", "worker")
+DEFAULT_CORS_ALLOWED_ORIGINS = ["http://localhost:15001", "http://127.0.0.1:15001"]
+
+# The content app serves many concurrent downloads from a few processes, so it
+# gets the largest Redis pool and the longest-lived connections. Workers run
+# one task at a time but tolerate slower Redis replies during long syncs.
+ROLE_DEFAULTS = {
+    "api": {
+        "DB_CONN_MAX_AGE": 300,
+        "DB_CONNECT_TIMEOUT": 5,
+        "REDIS_MAX_CONNECTIONS": 50,
+        "REDIS_SOCKET_TIMEOUT": 1,
+        "CACHE_TTL": 300,
+    },
+    "content": {
+        "DB_CONN_MAX_AGE": 600,
+        "DB_CONNECT_TIMEOUT": 5,
+        "REDIS_MAX_CONNECTIONS": 100,
+        "REDIS_SOCKET_TIMEOUT": 1,
+        "CACHE_TTL": 600,
+    },
+    "worker": {
+        "DB_CONN_MAX_AGE": 60,
+        "DB_CONNECT_TIMEOUT": 10,
+        "REDIS_MAX_CONNECTIONS": 10,
+        "REDIS_SOCKET_TIMEOUT": 5,
+        "CACHE_TTL": 300,
+    },
+}
+
+
+def _env(environ, name, default):
+    value = environ.get(name, "").strip()
+    return value or default
+
+
+def _flag(environ, name, default):
+    return _env(environ, name, default).lower() == "true"
+
+
+def _csv(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def role_knob(environ, role, name):
+    """Return knob ``name`` for ``role``: role override, global override, default."""
+    for key in (f"HUB_{role.upper()}_{name}", f"HUB_{name}"):
+        value = environ.get(key, "").strip()
+        if value:
+            return int(value)
+    return ROLE_DEFAULTS[role][name]
+
+
+def build(prefix, default_allowed_hosts, db_encryption_key, environ=None):
+    """Return the shared Hub settings as a dict of Django setting names.
+
+    ``prefix`` (``GALAXY`` or ``PULP``) names the image-specific variables
+    ``<prefix>_SECRET_KEY``, ``<prefix>_ALLOWED_HOSTS`` and
+    ``<prefix>_CORS_*``; each falls back to the unprefixed name.
+    """
+    environ = os.environ if environ is None else environ
+
+    role = _env(environ, "HUB_ROLE", "api").lower()
+    if role not in ROLES:
+        raise RuntimeError(f"HUB_ROLE must be api, content or worker (got {role!r})")
+
+    def knob(name):
+        return role_knob(environ, role, name)
+
+    databases = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": environ.get("POSTGRES_DB", "hub"),
+            "USER": environ.get("POSTGRES_USER", "galaxy"),
+            "PASSWORD": environ.get("POSTGRES_PASSWORD", "hubpassword"),
+            "HOST": environ.get("POSTGRES_HOST", "hub-postgres"),
+            "PORT": environ.get("POSTGRES_PORT", "5432"),
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {"connect_timeout": knob("DB_CONNECT_TIMEOUT")},
+        }
+    }
+
+    # Connection reuse: "direct" opens a connection per request, "persistent"
+    # keeps one per process for HUB_DB_CONN_MAX_AGE seconds with health checks,
+    # and "pgbouncer" additionally disables server-side cursors so
+    # POSTGRES_HOST can point at hub-pgbouncer.
+    conn_mode = _env(environ, "HUB_DB_CONN_MODE", "direct").lower()
+    if conn_mode not in ("direct", "persistent", "pgbouncer"):
+        raise RuntimeError(
+            f"HUB_DB_CONN_MODE must be direct, persistent or pgbouncer (got {conn_mode!r})"
+        )
+    if conn_mode != "direct":
+        databases["default"]["CONN_MAX_AGE"] = knob("DB_CONN_MAX_AGE")
+        databases["default"]["CONN_HEALTH_CHECKS"] = True
+    if conn_mode == "pgbouncer":
+        databases["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+    # hub-redis DB indexes: Celery and the pulpcore content cache (REDIS_DB),
+    # the shared Django cache, and sessions each get their own index.
+    redis_host = environ.get("REDIS_HOST", "hub-redis")
+    redis_port = int(environ.get("REDIS_PORT", "6379"))
+    redis_db = int(_env(environ, "HUB_REDIS_CELERY_DB", "0"))
+    cache_db = int(_env(environ, "HUB_REDIS_CACHE_DB", "1"))
+    session_db = int(_env(environ, "HUB_REDIS_SESSION_DB", "2"))
+    redis_url = f"redis://{redis_host}:{redis_port}/{redis_db}"
+    max_connections = knob("REDIS_MAX_CONNECTIONS")
+    socket_timeout = knob("REDIS_SOCKET_TIMEOUT")
+
+    # Shared Django cache and session store, so permission and access-policy
+    # lookups are cached once for every gunicorn worker instead of per process.
+    session_ttl = int(_env(environ, "HUB_SESSION_TTL", "1209600"))
+    redis_cache_options = {
+        "max_connections": max_connections,
+        "socket_timeout": socket_timeout,
+        "socket_connect_timeout": socket_timeout,
+    }
+    caches = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": f"redis://{redis_host}:{redis_port}/{cache_db}",
+            "TIMEOUT": knob("CACHE_TTL"),
+            "KEY_PREFIX": "hub",
+            "OPTIONS": redis_cache_options,
+        },
+        "sessions": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": f"redis://{redis_host}:{redis_port}/{session_db}",
+            "TIMEOUT": session_ttl,
+            "KEY_PREFIX": "hub",
+            "OPTIONS": redis_cache_options,
+        },
+    }
+
+    content_origin = environ.get("PULP_CONTENT_ORIGIN", "http://pulp-content:24816")
+    allowed_hosts = _csv(
+        _env(environ, f"{prefix}_ALLOWED_HOSTS", environ.get("ALLOWED_HOSTS", ""))
+    ) or list(default_allowed_hosts)
+
+    cors_allow_all_origins = _flag(environ, f"{prefix}_CORS_ALLOW_ALL_ORIGINS", "false")
+    # Django REST framework reads CORS_ALLOWED_ORIGINS even when all origins
+    # are allowed, so it is always a non-empty list.
+    cors_allowed_origins = _csv(
+        environ.get(f"{prefix}_CORS_ALLOWED_ORIGINS", "")
+    ) or list(DEFAULT_CORS_ALLOWED_ORIGINS)
+
+    logging_level = environ.get("PULP_LOGGING_LEVEL", "INFO")
+    plugin_logger = {"handlers": ["console"], "level": logging_level, "propagate": False}
+
+    return {
+        "HUB_ROLE": role,
+        "BASE_DIR": BASE_DIR,
+        "MEDIA_ROOT": MEDIA_ROOT,
+        "STATIC_ROOT": STATIC_ROOT,
+        "FILE_UPLOAD_TEMP_DIR": FILE_UPLOAD_TEMP_DIR,
+        "DATABASES": databases,
+        "HUB_DB_CONN_MODE": conn_mode,
+        "REDIS_HOST": redis_host,
+        "REDIS_PORT": redis_port,
+        "REDIS_DB": redis_db,
+        "REDIS_URL": redis_url,
+        "CACHE_ENABLED": True,
+        "REDIS_CONNECTION_POOL_KWARGS": {"max_connections": max_connections},
+        "CELERY_BROKER_URL": redis_url,
+        "CELERY_RESULT_BACKEND": redis_url,
+        "CACHES": caches,
+        "SESSION_COOKIE_AGE": session_ttl,
+        # "cache" keeps sessions only in Redis; "cached_db" writes through to Postgres.
+        "SESSION_ENGINE": "django.contrib.sessions.backends."
+        + _env(environ, "HUB_SESSION_BACKEND", "cache"),
+        "SESSION_CACHE_ALIAS": "sessions",
+        "CONTENT_ORIGIN": content_origin,
+        "ANSIBLE_API_HOSTNAME": environ.get("PULP_ANSIBLE_API_HOSTNAME", "http://galaxy-ng:8000"),
+        "ANSIBLE_CONTENT_HOSTNAME": content_origin + "/pulp/content",
+        "API_ROOT": "/pulp/",
+        "CONTENT_PATH_PREFIX": "/pulp/content/",
+        "CONTENT_APP_TTL": 600,
+        "DB_ENCRYPTION_KEY": environ.get("DB_ENCRYPTION_KEY", db_encryption_key),
+        "SECRET_KEY": environ.get(f"{prefix}_SECRET_KEY", environ.get("SECRET_KEY", "change-me")),
+        "ALLOWED_HOSTS": allowed_hosts,
+        "DEBUG": _flag(environ, "DJANGO_DEBUG", "false"),
+        "CORS_ALLOW_ALL_ORIGINS": cors_allow_all_origins,
+        "CORS_ALLOWED_ORIGINS": cors_allowed_origins,
+        "DEFAULT_FILE_STORAGE": "pulpcore.app.models.storage.FileSystem",
+        "WORKER_TTL": 300,
+        "TASK_SERIALIZER": "json",
+        "RESULT_SERIALIZER": "json",
+        "ACCEPT_CONTENT": ["json"],
+        "TIMEZONE": "UTC",
+        "ENABLE_UTC": True,
+        "LOGGING_LEVEL": logging_level,
+        "LOGGING": {
+            "version": 1,
+            "disable_existing_loggers": False,
+            "formatters": {
+                "simple": {
+                    "format": "%(asctime)s %(name)-12s %(levelname)-8s %(message)s",
+                },
+            },
+            "handlers": {
+                "console": {
+                    "class": "logging.StreamHandler",
+                    "formatter": "simple",
+                },
+            },
+            "root": {
+                "handlers": ["console"],
+                "level": logging_level,
+            },
+            "loggers": {
+                name: dict(plugin_logger)
+                for name in ("pulpcore", "pulp_ansible", "pulp_container", "galaxy_ng")
+            },
+        },
+    }
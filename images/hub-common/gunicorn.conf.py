@@ -0,0 +1,96 @@
+"""Gunicorn settings for AAX Hub services, driven by environment variables.
+
+Loaded with ``gunicorn -c /etc/pulp/gunicorn.conf.py``. Empty or unset
+variables fall back to the defaults below.
+
+- ``GUNICORN_WORKERS``: worker processes (default: sized from available CPUs)
+- ``GUNICORN_WORKERS_MAX``: cap for the CPU-based default (default 8)
+- ``GUNICORN_THREADS``: threads per worker; >1 implies ``gthread`` (default 1)
+- ``GUNICORN_WORKER_CLASS``: ``sync``, ``gthread`` or a dotted worker class
+- ``GUNICORN_TIMEOUT``: worker timeout in seconds (default 90)
+- ``GUNICORN_MAX_REQUESTS``: recycle a worker after N requests, 0 disables
+  (default 1000)
+- ``GUNICORN_MAX_REQUESTS_JITTER``: random spread for recycling (default 100)
+- ``GUNICORN_KEEPALIVE``: seconds to hold idle client connections (default 5)
+- ``GUNICORN_BACKLOG``: pending connection queue size (default 2048)
+
+Each worker also installs the shared access-policy cache
+(``aax_access_policy_cache``) once the Django app is loaded, and logs how long
+it took from fork to ready ("Worker <pid> booted in <seconds>s").
+"""
+
+import importlib.util
+import math
+import os
+import time
+
+
+def _env(name, default):
+    value = os.getenv(name, "").strip()
+    return value or default
+
+
+def available_cpus():
+    """Return the CPU count visible to this container, honouring cgroup quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - non-Linux
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="utf-8") as handle:
+            quota, period = handle.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", encoding="utf-8") as handle:
+                quota = int(handle.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us", encoding="utf-8") as handle:
+                period = int(handle.read())
+            if quota > 0:
+                cpus = min(cpus, math.ceil(quota / period))
+        except (OSError, ValueError):
+            pass
+    return max(1, cpus)
+
+
+def default_workers(worker_class, cpus, cap):
+    """CPU-aware worker count for ``worker_class``."""
+    if worker_class == "sync":
+        # Sync workers block on the database; oversubscribe CPUs.
+        count = 2 * cpus + 1
+    else:
+        # Threaded and async workers get their concurrency inside the process.
+        count = cpus + 1
+    return max(2, min(count, cap))
+
+
+threads = int(_env("GUNICORN_THREADS", "1"))
+worker_class = _env("GUNICORN_WORKER_CLASS", "sync")
+if worker_class == "sync" and threads > 1:
+    # gunicorn switches to gthread here anyway; size workers accordingly.
+    worker_class = "gthread"
+workers = int(_env("GUNICORN_WORKERS", "0")) or default_workers(
+    worker_class, available_cpus(), int(_env("GUNICORN_WORKERS_MAX", "8"))
+)
+timeout = int(_env("GUNICORN_TIMEOUT", "90"))
+max_requests = int(_env("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(_env("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+keepalive = int(_env("GUNICORN_KEEPALIVE", "5"))
+backlog = int(_env("GUNICORN_BACKLOG", "2048"))
+
+
+def post_fork(server, worker):
+    worker.aax_forked_at = time.monotonic()
+
+
+def post_worker_init(worker):
+    path = os.path.join(os.path.dirname(__file__), "aax_access_policy_cache.py")
+    spec = importlib.util.spec_from_file_location("aax_access_policy_cache", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if module.install():
+        worker.log.info("Access policy cache enabled")
+    forked_at = getattr(worker, "aax_forked_at", None)
+    if forked_at is not None:
+        worker.log.info("Worker %s booted in %.3fs", worker.pid, time.monotonic() - forked_at)
@@ -9,13 +9,22 @@ fi
 # For ad-hoc commands (tests, debug shells), skip service startup waits
 # and run the command directly.
 case "$1" in
-  pulpcore-api|pulpcore-content|pulpcore-worker)
+  pulpcore-api|pulpcore-content|pulpcore-worker|pulpcore-queue-metrics)
     ;;
   *)
     exec "$@"
     ;;
 esac
 
+# Settings import has no side effects; create the writable paths here and
+# pick the per-role tuning defaults (see aax_hub_settings.py).
+mkdir -p /var/lib/pulp/media /var/lib/pulp/tmp /app/static
+case "$1" in
+  pulpcore-api) export HUB_ROLE="${HUB_ROLE:-api}" ;;
+  pulpcore-content) export HUB_ROLE="${HUB_ROLE:-content}" ;;
+  *) export HUB_ROLE="${HUB_ROLE:-worker}" ;;
+esac
+
 # Wait for PostgreSQL
 until PGPASSWORD="${POSTGRES_PASSWORD}" psql -h "${POSTGRES_HOST}" -U "${POSTGRES_USER}" -d "${POSTGRES_DB}" -c '\q' 2>/dev/null; do
   echo "Waiting for PostgreSQL..."
@@ -88,24 +97,22 @@ PY
   fi
 fi
 
-# Start the requested service
+# Start the requested service (gunicorn tuning: see gunicorn.conf.py)
 case "$1" in
   pulpcore-api)
     echo "Starting Pulp API server..."
     exec gunicorn pulpcore.app.wsgi:application \
+      --config /etc/pulp/gunicorn.conf.py \
       --bind '0.0.0.0:24817' \
-      --workers 4 \
-      --timeout 90 \
       --access-logfile - \
       --error-logfile -
     ;;
   pulpcore-content)
     echo "Starting Pulp content server..."
+    export GUNICORN_WORKER_CLASS=aiohttp.GunicornWebWorker
     exec gunicorn pulpcore.content:server \
+      --config /etc/pulp/gunicorn.conf.py \
       --bind '0.0.0.0:24816' \
-      --worker-class aiohttp.GunicornWebWorker \
-      --workers 2 \
-      --timeout 90 \
       --access-logfile - \
       --error-logfile -
     ;;
@@ -113,6 +120,10 @@ case "$1" in
     echo "Starting Pulp worker..."
     exec pulpcore-worker
     ;;
+  pulpcore-queue-metrics)
+    echo "Starting Pulp task-queue metrics exporter..."
+    exec python /usr/local/bin/pulp_queue_metrics.py
+    ;;
   *)
     echo "Unknown service: $1"
     exec "$@"
@@ -0,0 +1,92 @@
+"""Prometheus exporter for Pulp task-queue depth.
+
+Serves ``/metrics`` in the Prometheus text format so that the pulp-worker
+HorizontalPodAutoscaler can scale on the number of waiting tasks (through
+prometheus-adapter or any other external metrics provider).
+
+Exported gauges:
+
+- ``pulp_tasks_waiting``: tasks queued and not yet picked up by a worker
+- ``pulp_tasks_running``: tasks currently executing
+- ``pulp_workers_online``: workers that sent a heartbeat recently
+
+Configuration (environment):
+
+- ``PULP_QUEUE_METRICS_PORT``: listen port (default 9464)
+"""
+
+import os
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pulpcore.app.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import close_old_connections  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from pulpcore.app.models import Task, Worker  # noqa: E402
+
+METRICS = (
+    ("pulp_tasks_waiting", "Pulp tasks waiting for a worker."),
+    ("pulp_tasks_running", "Pulp tasks currently running."),
+    ("pulp_workers_online", "Pulp workers with a recent heartbeat."),
+)
+
+
+def collect():
+    """Return the current gauge values keyed by metric name."""
+    try:
+        states = dict(
+            Task.objects.filter(state__in=("waiting", "running"))
+            .order_by()
+            .values_list("state")
+            .annotate(total=Count("pk"))
+        )
+        heartbeat_cutoff = timezone.now() - timedelta(seconds=getattr(settings, "WORKER_TTL", 30))
+        workers = Worker.objects.filter(last_heartbeat__gte=heartbeat_cutoff).count()
+    finally:
+        close_old_connections()
+    return {
+        "pulp_tasks_waiting": states.get("waiting", 0),
+        "pulp_tasks_running": states.get("running", 0),
+        "pulp_workers_online": workers,
+    }
+
+
+def render(values):
+    lines = []
+    for name, description in METRICS:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {values[name]}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path not in ("/metrics", "/healthz"):
+            self.send_error(404)
+            return
+        try:
+            body = render(collect()) if self.path == "/metrics" else b"ok\n"
+        except Exception as exc:  # database unavailable
+            self.send_error(503, str(exc))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler API
+        pass
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("PULP_QUEUE_METRICS_PORT", "9464"))
+    print(f"Serving Pulp queue metrics on :{port}/metrics", flush=True)
+    ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler).serve_forever()
@@ -0,0 +1,17 @@
+#!/bin/bash
+set -euo pipefail
+
+# Render the node config and start receptor. Nothing is installed or patched
+# here; see the Dockerfile.
+if [ -n "${RECEPTOR_CONFIG:-}" ]; then
+  printf '%s' "$RECEPTOR_CONFIG" > /tmp/receptor.conf.template
+else
+  cp /etc/receptor/receptor.conf.template /tmp/receptor.conf.template
+fi
+sed "s/NODE_SUFFIX/$(hostname)/" /tmp/receptor.conf.template > /etc/receptor/receptor.conf
+rm -f /tmp/receptor.conf.template
+
+if [ "$#" -gt 0 ]; then
+  exec "$@"
+fi
+exec receptor --config /etc/receptor/receptor.conf
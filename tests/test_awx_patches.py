@@ -0,0 +1,97 @@
+"""Unit tests for the build-time AWX source patcher.
+
+``images/awx/apply-patches.py`` runs inside the AWX virtualenv during
+``docker build``. Here it is pointed at small stand-in ``awx`` and
+``ansible_runner`` packages that contain the patch anchors.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = REPO_ROOT / "images/awx/apply-patches.py"
+
+SOURCES = {
+    "awx/__init__.py": "",
+    "awx/main/tasks/jobs.py": 'params = {"process_isolation": True}\n',
+    "awx/main/tasks/receptor.py": (
+        "class AWXReceptorJob:\n"
+        "    def run(self):\n"
+        "        self.runner_params['only_transmit_kwargs'] = True\n"
+    ),
+    "ansible_runner/__init__.py": "",
+    "ansible_runner/interface.py": (
+        "def run(**kwargs):\n"
+        '    if kwargs.get("process_isolation", False):\n'
+        "        return 'isolated'\n"
+        "    return 'local'\n"
+    ),
+}
+
+
+@pytest.fixture
+def site_packages(tmp_path: Path) -> Path:
+    root = tmp_path / "site-packages"
+    for relative, text in SOURCES.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+
+def _apply(site_packages: Path, manifest: Path) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), "--manifest", str(manifest)],
+        capture_output=True,
+        text=True,
+        env={"PYTHONPATH": str(site_packages), "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+
+
+def test_patches_are_applied_compiled_and_recorded(site_packages: Path, tmp_path: Path) -> None:
+    manifest = tmp_path / "awx-patches.sha256"
+    result = _apply(site_packages, manifest)
+    assert result.returncode == 0, result.stderr
+
+    interface = site_packages / "ansible_runner/interface.py"
+    assert '"process_isolation": False' in (site_packages / "awx/main/tasks/jobs.py").read_text()
+    assert "['only_transmit_kwargs'] = False" in (site_packages / "awx/main/tasks/receptor.py").read_text()
+    assert Path(importlib.util.cache_from_source(str(interface))).exists()
+
+    recorded = dict(reversed(line.split("  ", 1)) for line in manifest.read_text().splitlines())
+    assert len(recorded) == 3
+    for path, digest in recorded.items():
+        assert hashlib.sha256(Path(path).read_bytes()).hexdigest() == digest
+
+
+def test_patched_runner_never_isolates(site_packages: Path, tmp_path: Path) -> None:
+    assert _apply(site_packages, tmp_path / "manifest").returncode == 0
+    namespace: dict[str, object] = {}
+    exec((site_packages / "ansible_runner/interface.py").read_text(), namespace)
+    assert namespace["run"](process_isolation=True) == "local"  # type: ignore[operator]
+
+
+def test_reapplying_is_a_no_op(site_packages: Path, tmp_path: Path) -> None:
+    first, second = tmp_path / "first", tmp_path / "second"
+    assert _apply(site_packages, first).returncode == 0
+    result = _apply(site_packages, second)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.count("already patched") == 3
+    assert first.read_text() == second.read_text()
+
+
+def test_missing_anchor_fails_the_build(site_packages: Path, tmp_path: Path) -> None:
+    (site_packages / "awx/main/tasks/receptor.py").write_text("# refactored upstream\n")
+    result = _apply(site_packages, tmp_path / "manifest")
+
+    assert result.returncode != 0
+    assert "receptor.py" in result.stderr
+    assert not (tmp_path / "manifest").exists()
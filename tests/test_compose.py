@@ -28,6 +28,7 @@ def _required_compose_env() -> dict[str, str]:
             "GALAXY_SECRET_KEY": "test-galaxy-secret-key",  # pragma: allowlist secret
             "PULP_SECRET_KEY": "test-pulp-secret-key",  # pragma: allowlist secret
             "EDA_DB_PASSWORD": "test-eda-db-password",  # pragma: allowlist secret
+            "EDA_API_TOKEN": "test-eda-api-token",  # pragma: allowlist secret
         }
     )
     return env
@@ -0,0 +1,457 @@
+"""Unit tests for the EDA resident engine supervisor.
+
+``images/eda-controller/aax_eda_engines.py`` only needs the standard library
+and PyYAML, so it is loaded directly from the image build context. Small
+Python child processes stand in for ``ansible-rulebook``, and ``FakeRedis``
+stands in for ``eda-redis``, including for the ``aax_events`` event source.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parent.parent / "images/eda-controller/aax_eda_engines.py"
+SOURCE_PATH = MODULE_PATH.parent / "sources/aax_events.py"
+_spec = importlib.util.spec_from_file_location("aax_eda_engines", MODULE_PATH)
+assert _spec is not None and _spec.loader is not None
+engines = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(engines)
+
+RULEBOOK = """
+- name: Deploy on webhook
+  hosts: all
+  sources:
+    - aax_events: {}
+  rules:
+    - name: Deploy requested
+      condition: event.payload.action == "deploy"
+      action:
+        debug: {}
+"""
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-u", "-c", code]
+
+
+class StatusLog:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str, int | None, int]] = []
+
+    async def __call__(self, name: str, status: str, exit_code: int | None, restarts: int) -> None:
+        self.events.append((name, status, exit_code, restarts))
+
+    @property
+    def statuses(self) -> list[str]:
+        return [status for _, status, _, _ in self.events]
+
+
+def _encode(value: str | bytes) -> bytes:
+    return value.encode() if isinstance(value, str) else value
+
+
+class FakeRedis:
+    """The Redis stream commands the EDA controller uses, kept in memory."""
+
+    def __init__(self, **connection: object) -> None:
+        self.streams: dict[str, list[tuple[bytes, dict[str | bytes, str | bytes]]]] = collections.defaultdict(list)
+        self.groups: set[tuple[str, str]] = set()
+        self.acked: list[bytes] = []
+        self.closed = False
+        self._seq = 0
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+    async def xgroup_create(self, name: str, group: str, id: str = "$", mkstream: bool = False) -> None:
+        self.groups.add((name, group))
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def xlen(self, name: str) -> int:
+        return len(self.streams[name])
+
+    async def xadd(self, name: str, fields: dict[str | bytes, str | bytes], maxlen: int | None = None,
+                   approximate: bool = True) -> bytes:
+        self._seq += 1
+        entry_id = f"{self._seq}-0".encode()
+        self.streams[name].append((entry_id, fields))
+        if maxlen is not None:
+            del self.streams[name][:-maxlen]
+        return entry_id
+
+    async def xreadgroup(self, group: str, consumer: str, streams: dict[str, str], count: int,
+                         block: int) -> list[list[object]]:
+        ((name, _),) = streams.items()
+        # Like redis-py, field names and values come back as bytes.
+        entries = [(entry_id, {_encode(k): _encode(v) for k, v in fields.items()})
+                   for entry_id, fields in self.streams[name][:count]]
+        if not entries:
+            await asyncio.sleep(0)  # stands in for waiting ``block`` ms
+        return [[name.encode(), entries]] if entries else []
+
+    async def xack(self, name: str, group: str, *ids: bytes) -> int:
+        self.acked.extend(ids)
+        return len(ids)
+
+    async def xdel(self, name: str, *ids: bytes) -> int:
+        self.streams[name] = [entry for entry in self.streams[name] if entry[0] not in ids]
+        return len(ids)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.calls: list[tuple[str, tuple[object, ...], dict[str, object]]] = []
+
+    async def __aenter__(self) -> FakePipeline:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.calls.clear()
+
+    def __getattr__(self, command: str):  # type: ignore[no-untyped-def]
+        def queue(*args: object, **kwargs: object) -> FakePipeline:
+            self.calls.append((command, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> list[object]:
+        return [await getattr(self.redis, command)(*args, **kwargs) for command, args, kwargs in self.calls]
+
+
+def _ingest(redis: FakeRedis, count: int) -> None:
+    for seq in range(count):
+        asyncio.run(redis.xadd(engines.INGEST_STREAM, {"event": f'{{"seq": {seq}}}'}))
+
+
+def _fan_out(redis: FakeRedis, targets: list[str], running: set[str], last_id: str = ">",
+             queue_max: int = 100) -> tuple[str, int]:
+    return asyncio.run(
+        engines.fan_out_batch(redis, targets, running, last_id, count=10, queue_max=queue_max, block_ms=0)
+    )
+
+
+def test_fan_out_copies_events_to_every_enabled_activation() -> None:
+    redis = FakeRedis()
+    _ingest(redis, 3)
+    assert _fan_out(redis, ["deploy", "alerts"], {"deploy"}, last_id="0") == ("0", 3)
+    for name in ("deploy", "alerts"):
+        assert [fields for _, fields in redis.streams[engines.event_stream(name)]] == [
+            {b"event": b'{"seq": 0}'}, {b"event": b'{"seq": 1}'}, {b"event": b'{"seq": 2}'},
+        ]
+    assert redis.streams[engines.INGEST_STREAM] == []
+    assert len(redis.acked) == 3
+
+
+def test_fan_out_keeps_latest_events_for_activation_without_engine() -> None:
+    redis = FakeRedis()
+    _ingest(redis, 8)
+    assert _fan_out(redis, ["restarting"], set(), queue_max=5) == (">", 8)
+    kept = redis.streams[engines.event_stream("restarting")]
+    assert [fields[b"event"] for _, fields in kept] == [f'{{"seq": {seq}}}'.encode() for seq in range(3, 8)]
+
+
+def test_fan_out_pauses_while_a_running_engine_is_full() -> None:
+    redis = FakeRedis()
+    for _ in range(5):
+        asyncio.run(redis.xadd(engines.event_stream("deploy"), {"event": "{}"}))
+    _ingest(redis, 2)
+    assert _fan_out(redis, ["deploy", "alerts"], {"deploy"}, queue_max=5) == (">", 0)
+    assert len(redis.streams[engines.INGEST_STREAM]) == 2
+    assert redis.streams[engines.event_stream("alerts")] == []
+    # A full stream of an engine that is not running does not hold the others up.
+    assert _fan_out(redis, ["deploy", "alerts"], set(), queue_max=5) == (">", 2)
+
+
+def test_fan_out_switches_to_new_entries_once_pending_ones_are_done() -> None:
+    redis = FakeRedis()
+    assert _fan_out(redis, ["deploy"], {"deploy"}, last_id="0") == (">", 0)
+    _ingest(redis, 1)
+    assert _fan_out(redis, [], set()) == (">", 1)
+    assert redis.streams[engines.INGEST_STREAM] == []
+
+
+@pytest.mark.parametrize("name", ["deploy", "alerts-prod", "a", "x_1"])
+def test_valid_activation_names(name: str) -> None:
+    assert engines.validate_name(name) == name
+
+
+@pytest.mark.parametrize("name", ["", "Deploy", "../etc", "-lead", "a" * 64, None, 5])
+def test_invalid_activation_names(name: object) -> None:
+    with pytest.raises(ValueError):
+        engines.validate_name(name)
+
+
+def test_rulebook_validation_accepts_rulesets() -> None:
+    rulesets = engines.validate_rulebook(RULEBOOK)
+    assert rulesets[0]["name"] == "Deploy on webhook"
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("- name: [unclosed", "not valid YAML"),
+        ("name: not-a-list", "non-empty list"),
+        ("[]", "non-empty list"),
+        ("- name: r\n  hosts: all\n  rules: [{name: x}]", "has no 'sources'"),
+        ("- name: r\n  hosts: all\n  sources: []\n  rules: [{name: x}]", "at least one source"),
+        ("- name: r\n  hosts: all\n  sources: [{aax_events: {}}]\n  rules: []", "at least one rule"),
+    ],
+)
+def test_rulebook_validation_rejects_bad_rulebooks(text: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        engines.validate_rulebook(text)
+
+
+def test_engine_command_adds_optional_files(tmp_path: Path) -> None:
+    plain = engines.engine_command(tmp_path, extra_vars=False, inventory=False)
+    assert plain[:3] == ["ansible-rulebook", "--rulebook", str(tmp_path / "rulebook.yml")]
+    assert "--source-dir" in plain
+    assert "--vars" not in plain and "--inventory" not in plain
+
+    full = engines.engine_command(tmp_path, extra_vars=True, inventory=True)
+    assert full[full.index("--vars") + 1] == str(tmp_path / "vars.yml")
+    assert full[full.index("--inventory") + 1] == str(tmp_path / "inventory.yml")
+
+
+def test_event_stream_is_per_activation() -> None:
+    assert engines.event_stream("deploy") == "aax:eda:events:deploy"
+
+
+def test_engine_captures_output_and_stops() -> None:
+    async def scenario() -> tuple[list[dict], bool, bool]:
+        engine = engines.Engine("t", _python("print('ready'); import time; time.sleep(60)"))
+        await engine.start()
+        for _ in range(100):
+            if engine.lines():
+                break
+            await asyncio.sleep(0.05)
+        running = engine.running
+        await engine.stop(timeout=5)
+        return engine.lines(), running, engine.running
+
+    lines, was_running, still_running = asyncio.run(scenario())
+    assert [line["line"] for line in lines] == ["ready"]
+    assert lines[0]["seq"] == 1
+    assert was_running
+    assert not still_running
+
+
+def test_engine_output_is_bounded_and_filtered_by_sequence() -> None:
+    async def scenario() -> object:
+        engine = engines.Engine("t", _python("for i in range(10): print(i)"), output_lines=4)
+        await engine.start()
+        await engine.wait()
+        return engine
+
+    engine = asyncio.run(scenario())
+    assert [line["line"] for line in engine.lines()] == ["6", "7", "8", "9"]
+    assert [line["line"] for line in engine.lines(after=8)] == ["8", "9"]
+    assert engine.returncode == 0
+
+
+def test_supervisor_restarts_failing_engine_then_marks_failed() -> None:
+    statuses = StatusLog()
+
+    async def scenario() -> None:
+        supervisor = engines.EngineSupervisor(statuses, max_restarts=2, restart_delay=0.01)
+        await supervisor.start(engines.Engine("bad", _python("raise SystemExit(3)")))
+        for _ in range(200):
+            if "failed" in statuses.statuses:
+                break
+            await asyncio.sleep(0.02)
+        await supervisor.stop_all()
+
+    asyncio.run(scenario())
+    assert statuses.statuses == ["running", "restarting", "running", "restarting", "running", "failed"]
+    assert statuses.events[-1] == ("bad", "failed", 3, 2)
+
+
+def test_supervisor_reports_clean_exit_as_completed() -> None:
+    statuses = StatusLog()
+
+    async def scenario() -> None:
+        supervisor = engines.EngineSupervisor(statuses, restart_delay=0.01)
+        await supervisor.start(engines.Engine("done", _python("pass")))
+        for _ in range(200):
+            if "completed" in statuses.statuses:
+                break
+            await asyncio.sleep(0.02)
+
+    asyncio.run(scenario())
+    assert statuses.statuses == ["running", "completed"]
+
+
+def test_supervisor_stop_does_not_restart() -> None:
+    statuses = StatusLog()
+
+    async def scenario() -> bool:
+        supervisor = engines.EngineSupervisor(statuses, restart_delay=0.01)
+        engine = engines.Engine("long", _python("import time; time.sleep(60)"))
+        await supervisor.start(engine)
+        await supervisor.stop("long")
+        await asyncio.sleep(0.1)
+        return engine.running
+
+    assert asyncio.run(scenario()) is False
+    assert statuses.statuses == ["running"]
+
+
+def test_event_batch_accepts_single_event_and_arrays() -> None:
+    assert engines.parse_event_batch({"a": 1}, 10) == [{"a": 1}]
+    assert engines.parse_event_batch([{"a": 1}, {"b": 2}], 10) == [{"a": 1}, {"b": 2}]
+
+
+@pytest.mark.parametrize(
+    ("body", "message"),
+    [
+        ([], "empty"),
+        ([{}] * 11, "limit is 10"),
+        ([{"a": 1}, "text"], "event 1 is not a JSON object"),
+        ("text", "event 0 is not a JSON object"),
+    ],
+)
+def test_event_batch_rejects_bad_bodies(body: object, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        engines.parse_event_batch(body, 10)
+
+
+def test_engine_environment_drops_manager_secrets() -> None:
+    base = {
+        "PATH": "/usr/bin",
+        "EDA_DB_PASSWORD": "secret",  # pragma: allowlist secret
+        "EDA_DB_HOST": "eda-postgres",
+        "EDA_API_TOKEN": "token",  # pragma: allowlist secret
+        "EDA_REDIS_HOST": "eda-redis",
+    }
+    env = engines.engine_environment(base, AAX_ACTIVATION="deploy")
+    assert env == {
+        "PATH": "/usr/bin", "EDA_REDIS_HOST": "eda-redis", "AAX_ACTIVATION": "deploy", "DROOLS_JPY_JVM_MAXMEM": "",
+    }
+
+
+def test_engine_environment_leaves_heap_to_max_ram_percentage_by_default() -> None:
+    # drools_jpy pins -Xmx512M when DROOLS_JPY_JVM_MAXMEM is unset.
+    assert engines.engine_environment({})["DROOLS_JPY_JVM_MAXMEM"] == ""
+    assert engines.engine_environment({"DROOLS_JPY_JVM_MAXMEM": "1g"})["DROOLS_JPY_JVM_MAXMEM"] == "1g"
+
+
+@pytest.mark.parametrize(
+    ("header", "token", "expected"),
+    [
+        ("Bearer s3cret", "s3cret", True),
+        ("bearer  s3cret", "s3cret", True),
+        ("Bearer wrong", "s3cret", False),
+        ("Basic s3cret", "s3cret", False),
+        (None, "s3cret", False),
+        ("Bearer ", "", False),
+    ],
+)
+def test_authorized_requires_matching_bearer_token(header: str | None, token: str, expected: bool) -> None:
+    assert engines.authorized(header, token) is expected
+
+
+def test_java_tool_options_size_heap_from_container_and_pick_gc(tmp_path: Path) -> None:
+    options = engines.java_tool_options(cds_archive=tmp_path / "missing.jsa").split()
+    assert options == ["-XX:MaxRAMPercentage=25", "-XX:+ExitOnOutOfMemoryError", "-XX:+UseSerialGC"]
+
+    g1 = engines.java_tool_options("g1", 12.5, cds_archive=tmp_path / "missing.jsa")
+    assert "-XX:MaxRAMPercentage=12.5" in g1
+    assert "-XX:+UseG1GC -XX:+ExplicitGCInvokesConcurrent" in g1
+    assert "GC" not in engines.java_tool_options("auto", cds_archive=tmp_path / "missing.jsa")
+
+
+def test_engine_heaps_share_the_budget_across_max_activations() -> None:
+    assert engines.engine_heap_percentage(60, 4) == 15
+    assert engines.engine_heap_percentage(60, 4) * 4 <= 60
+    with pytest.raises(ValueError):
+        engines.engine_heap_percentage(60, 0)
+    with pytest.raises(ValueError):
+        engines.engine_heap_percentage(120, 4)
+
+
+def test_can_enable_caps_enabled_activations() -> None:
+    activations = {"a": True, "b": True, "c": False}
+    assert engines.can_enable(activations, "d", 3)
+    assert not engines.can_enable(activations, "d", 2)
+    assert not engines.can_enable(activations, "c", 2)
+    # Starting an activation that is enabled already takes no new slot.
+    assert engines.can_enable(activations, "a", 2)
+
+
+def test_java_tool_options_use_cds_archive_when_present(tmp_path: Path) -> None:
+    archive = tmp_path / "drools.jsa"
+    archive.write_bytes(b"")
+    assert f"-XX:SharedArchiveFile={archive}" in engines.java_tool_options(cds_archive=archive)
+    assert "SharedArchiveFile" not in engines.java_tool_options(cds=False, cds_archive=archive)
+
+
+def test_java_tool_options_append_extra_options_last(tmp_path: Path) -> None:
+    options = engines.java_tool_options(extra=" -Xmx512m  -Xss512k ", cds_archive=tmp_path / "x")
+    assert options.split()[-2:] == ["-Xmx512m", "-Xss512k"]
+
+
+@pytest.mark.parametrize(("profile", "percentage"), [("zgc", 25.0), ("serial", 0.0), ("serial", 101.0)])
+def test_java_tool_options_reject_bad_settings(profile: str, percentage: float) -> None:
+    with pytest.raises(ValueError):
+        engines.java_tool_options(profile, percentage)
+
+
+def test_cds_training_rulebook_is_valid() -> None:
+    training = MODULE_PATH.parent / "cds/training.yml"
+    rulesets = engines.validate_rulebook(training.read_text(encoding="utf-8"))
+    assert "aax_cds_training" in rulesets[0]["sources"][0]
+
+
+@pytest.fixture
+def aax_events(monkeypatch: pytest.MonkeyPatch) -> types.ModuleType:
+    """The ``aax_events`` source with ``redis`` replaced by ``FakeRedis``."""
+    redis = types.ModuleType("redis")
+    redis.asyncio = types.ModuleType("redis.asyncio")
+    redis.asyncio.Redis = FakeRedis
+    redis.exceptions = types.ModuleType("redis.exceptions")
+    redis.exceptions.ResponseError = type("ResponseError", (Exception,), {})
+    for module in (redis, redis.asyncio, redis.exceptions):
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.setenv("AAX_ACTIVATION", "deploy")
+    spec = importlib.util.spec_from_file_location("aax_events", SOURCE_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_event_source_buffers_one_batch_and_leaves_the_rest_in_redis(
+    aax_events: types.ModuleType, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    redis = FakeRedis()
+    monkeypatch.setattr(aax_events.aioredis, "Redis", lambda **connection: redis)
+    stream = engines.event_stream("deploy")
+    for seq in range(5):
+        asyncio.run(redis.xadd(stream, {"event": f'{{"seq": {seq}}}'}))
+
+    async def scenario() -> list[object]:
+        queue: asyncio.Queue[object] = asyncio.Queue()
+        task = asyncio.create_task(aax_events.main(queue, {"batch": 2, "block_ms": 0}))
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert asyncio.run(scenario()) == [{"seq": 0}, {"seq": 1}]
+    assert (stream, engines.EVENT_GROUP) in redis.groups
+    # Delivered entries are acknowledged and deleted; the rest wait in the stream.
+    assert redis.acked == [b"1-0", b"2-0"]
+    assert [entry_id for entry_id, _ in redis.streams[stream]] == [b"3-0", b"4-0", b"5-0"]
+    assert redis.closed
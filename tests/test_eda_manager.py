@@ -0,0 +1,222 @@
+"""Unit tests for the EDA activation manager API.
+
+``images/eda-controller/aax_eda_manager.py`` is loaded from the image build
+context and served with aiohttp's test server. ``FakeRedis`` stands in for
+``eda-redis``, an in-memory store for ``eda-postgres``, and engines are
+recorded instead of started. Skipped unless aiohttp, psycopg2 and redis are
+installed, as they are in the image.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import importlib.util
+import types
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("psycopg2")
+pytest.importorskip("redis")
+
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+from test_eda_engines import RULEBOOK, FakeRedis  # noqa: E402
+
+BUILD_CONTEXT = Path(__file__).resolve().parent.parent / "images/eda-controller"
+TOKEN = "test-token"  # pragma: allowlist secret
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+
+
+class FakeStore:
+    """The ``ActivationStore`` queries, kept in memory."""
+
+    def __init__(self, *rows: dict[str, Any]) -> None:
+        self.rows = {row["name"]: row for row in rows}
+
+    async def ensure_schema(self) -> None:
+        pass
+
+    async def all(self) -> list[dict[str, Any]]:
+        return [dict(self.rows[name]) for name in sorted(self.rows)]
+
+    async def get(self, name: str) -> dict[str, Any] | None:
+        return dict(self.rows[name]) if name in self.rows else None
+
+    async def create(self, name: str, rulebook: str, extra_vars: dict[str, Any], inventory: str | None,
+                     enabled: bool) -> dict[str, Any] | None:
+        if name in self.rows:
+            return None
+        self.rows[name] = _row(name, rulebook=rulebook, extra_vars=extra_vars, inventory=inventory,
+                               enabled=enabled)
+        return dict(self.rows[name])
+
+    async def update(self, name: str, **fields: Any) -> None:
+        self.rows[name].update(fields)
+
+    async def delete(self, name: str) -> None:
+        self.rows.pop(name, None)
+
+
+def _row(name: str, **fields: Any) -> dict[str, Any]:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return {"name": name, "rulebook": RULEBOOK, "extra_vars": {}, "inventory": None, "enabled": True,
+            "status": "pending", "exit_code": None, "restarts": 0, "created_at": now, "updated_at": now,
+            **fields}
+
+
+@pytest.fixture
+def aax_eda_manager(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> types.ModuleType:
+    monkeypatch.syspath_prepend(str(BUILD_CONTEXT))
+    spec = importlib.util.spec_from_file_location("aax_eda_manager", BUILD_CONTEXT / "aax_eda_manager.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "ACTIVATION_DIR", tmp_path)
+    return module
+
+
+Scenario = Callable[[TestClient, Any], Awaitable[None]]
+
+
+def _serve(module: types.ModuleType, monkeypatch: pytest.MonkeyPatch, scenario: Scenario,
+           store: FakeStore | None = None) -> list[str]:
+    """Run ``scenario(client, manager)`` against the app; return the activations started."""
+    started: list[str] = []
+
+    async def start(self: Any, activation: dict[str, Any]) -> None:
+        started.append(activation["name"])
+
+    monkeypatch.setattr(module.ActivationManager, "start", start)
+
+    async def run() -> None:
+        app = module.create_app(TOKEN)
+        manager = app[module.MANAGER]
+        await manager.redis.aclose()
+        manager.redis = FakeRedis()
+        manager.store = store or FakeStore()
+        async with TestClient(TestServer(app)) as client:
+            await scenario(client, manager)
+
+    asyncio.run(run())
+    return started
+
+
+def test_api_requires_the_bearer_token_except_for_health(
+    aax_eda_manager: types.ModuleType, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def scenario(client: TestClient, manager: Any) -> None:
+        assert (await client.get("/health")).status == 200
+        response = await client.get("/api/v1/activations")
+        assert response.status == 401
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+        bad = {"Authorization": "Bearer wrong"}
+        assert (await client.post("/api/v1/events", json={}, headers=bad)).status == 401
+        assert (await client.get("/api/v1/activations", headers=AUTH)).status == 200
+
+    _serve(aax_eda_manager, monkeypatch, scenario)
+
+
+def test_ingestion_answers_429_once_the_backlog_would_overflow(
+    aax_eda_manager: types.ModuleType, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(aax_eda_manager, "INGEST_MAX_PENDING", 3)
+
+    async def scenario(client: TestClient, manager: Any) -> None:
+        accepted = await client.post("/api/v1/events", json=[{"seq": 0}, {"seq": 1}], headers=AUTH)
+        assert accepted.status == 202
+        assert (await accepted.json())["accepted"] == 2
+
+        batch = [{"seq": seq} for seq in range(4)]
+        throttled = await client.post("/api/v1/events", json=batch, headers=AUTH)
+        assert throttled.status == 429
+        assert throttled.headers["Retry-After"] == "1"
+
+        assert (await client.post("/api/v1/events", json="not an event", headers=AUTH)).status == 400
+
+    _serve(aax_eda_manager, monkeypatch, scenario)
+
+
+def test_activation_events_answer_429_when_its_queue_is_full(
+    aax_eda_manager: types.ModuleType, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(aax_eda_manager, "ACTIVATION_QUEUE_MAX", 1)
+
+    async def scenario(client: TestClient, manager: Any) -> None:
+        path = "/api/v1/activations/deploy/events"
+        assert (await client.post(path, json={"action": "deploy"}, headers=AUTH)).status == 202
+        throttled = await client.post(path, json={"action": "deploy"}, headers=AUTH)
+        assert throttled.status == 429
+        assert throttled.headers["Retry-After"] == "1"
+        assert (await client.post("/api/v1/activations/missing/events", json={}, headers=AUTH)).status == 404
+
+    started = _serve(aax_eda_manager, monkeypatch, scenario, FakeStore(_row("deploy")))
+    assert started == ["deploy"]
+
+
+def test_enabling_beyond_max_activations_is_refused(
+    aax_eda_manager: types.ModuleType, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(aax_eda_manager, "MAX_ACTIVATIONS", 1)
+
+    async def scenario(client: TestClient, manager: Any) -> None:
+        api = "/api/v1/activations"
+        assert (await client.post(api, json={"name": "deploy", "rulebook": RULEBOOK}, headers=AUTH)).status == 201
+        assert (await client.post(api, json={"name": "alerts", "rulebook": RULEBOOK}, headers=AUTH)).status == 409
+        assert "alerts" not in manager.store.rows
+
+        created = await client.post(api, json={"name": "alerts", "rulebook": RULEBOOK, "enabled": False},
+                                    headers=AUTH)
+        assert created.status == 201
+        assert (await client.post(f"{api}/alerts/start", headers=AUTH)).status == 409
+        assert (await client.post(f"{api}/deploy/stop", headers=AUTH)).status == 200
+        assert (await client.post(f"{api}/alerts/start", headers=AUTH)).status == 200
+
+        health = await (await client.get("/health")).json()
+        assert (health["activations_enabled"], health["max_activations"]) == (1, 1)
+
+    assert _serve(aax_eda_manager, monkeypatch, scenario) == ["deploy", "alerts"]
+
+
+def test_restart_stops_activations_beyond_max_activations(
+    aax_eda_manager: types.ModuleType, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(aax_eda_manager, "MAX_ACTIVATIONS", 1)
+    store = FakeStore(_row("alerts"), _row("deploy"), _row("paused", enabled=False))
+
+    async def scenario(client: TestClient, manager: Any) -> None:
+        assert manager.enabled() == ["alerts"]
+
+    assert _serve(aax_eda_manager, monkeypatch, scenario, store) == ["alerts"]
+    assert (store.rows["deploy"]["enabled"], store.rows["deploy"]["status"]) == (False, "stopped")
+    assert store.rows["paused"]["enabled"] is False
+
+
+def test_engines_start_with_the_container_sized_jvm(
+    aax_eda_manager: types.ModuleType, monkeypatch: pytest.MonkeyPatch, tmp_path: Path,
+) -> None:
+    monkeypatch.setenv("EDA_DB_PASSWORD", "secret")  # pragma: allowlist secret
+    engines: list[Any] = []
+
+    async def run() -> None:
+        manager = aax_eda_manager.ActivationManager()
+        await manager.redis.aclose()
+        manager.redis = FakeRedis()
+
+        async def start(engine: Any) -> None:
+            engines.append(engine)
+
+        monkeypatch.setattr(manager.supervisor, "start", start)
+        await manager.start(_row("deploy", extra_vars={"env": "prod"}))
+
+    asyncio.run(run())
+    (engine,) = engines
+    assert engine.env["JAVA_TOOL_OPTIONS"] == aax_eda_manager.JVM_OPTIONS
+    assert "-XX:MaxRAMPercentage=" in engine.env["JAVA_TOOL_OPTIONS"]
+    assert engine.env["DROOLS_JPY_JVM_MAXMEM"] == ""
+    assert "EDA_DB_PASSWORD" not in engine.env
+    assert (tmp_path / "deploy/rulebook.yml").read_text() == RULEBOOK
+    assert (tmp_path / "deploy/vars.yml").exists()
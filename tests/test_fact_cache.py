@@ -0,0 +1,138 @@
+"""Unit tests for the ``aax_facts`` cache plugin shipped in ee-base.
+
+``images/ee-base/plugins/cache/aax_facts.py`` is loaded from the image build
+context with small stand-ins for the ansible-core modules it imports, so the
+tests run without ansible installed. ``test_images.py`` covers the plugin
+under the real ansible-core in the image.
+"""
+
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import json
+import os
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+PLUGIN_PATH = Path(__file__).resolve().parent.parent / "images/ee-base/plugins/cache/aax_facts.py"
+DEFAULTS = {"_uri": "", "_prefix": "ansible_facts_", "_timeout": 86400, "compression_level": 6, "scope": None}
+FACTS = {"ansible_hostname": "web1", "ansible_processor_vcpus": 4, "ansible_mounts": [{"mount": "/"}]}
+
+
+class Display:
+    def __init__(self) -> None:
+        self.warnings: list[str] = []
+
+    def warning(self, message: str) -> None:
+        self.warnings.append(message)
+
+
+class BaseCacheModule:
+    """The parts of ansible.plugins.cache.BaseCacheModule the plugin relies on."""
+
+    _persistent = True
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._options = {**DEFAULTS, **kwargs}
+        self._display = Display()
+
+    def get_option(self, name: str) -> Any:
+        return self._options[name]
+
+
+@pytest.fixture
+def aax_facts(monkeypatch: pytest.MonkeyPatch) -> types.ModuleType:
+    ansible = types.ModuleType("ansible")
+    ansible.context = types.SimpleNamespace(CLIARGS={"inventory": ["/srv/inventories/prod.yml"]})
+    errors = types.ModuleType("ansible.errors")
+    errors.AnsibleError = type("AnsibleError", (Exception,), {})
+    plugins = types.ModuleType("ansible.plugins")
+    cache = types.ModuleType("ansible.plugins.cache")
+    cache.BaseCacheModule = BaseCacheModule
+    for name, module in [("ansible", ansible), ("ansible.errors", errors), ("ansible.plugins", plugins),
+                         ("ansible.plugins.cache", cache)]:
+        monkeypatch.setitem(sys.modules, name, module)
+    spec = importlib.util.spec_from_file_location("aax_facts", PLUGIN_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_without_a_store_facts_live_for_one_run(aax_facts: types.ModuleType) -> None:
+    plugin = aax_facts.CacheModule()
+    assert plugin._persistent is False
+    plugin.set("web1", FACTS)
+    assert plugin.get("web1") == FACTS
+    assert plugin.keys() == ["web1"]
+    assert aax_facts.CacheModule().keys() == []
+
+
+def test_directory_store_round_trips_facts_between_runs(aax_facts: types.ModuleType, tmp_path: Path) -> None:
+    first = aax_facts.CacheModule(_uri=str(tmp_path))
+    assert first._persistent is True
+    first.set("web1", FACTS)
+
+    (stored,) = tmp_path.iterdir()
+    assert stored.name.startswith("ansible_facts_inventory-") and stored.name.endswith("_web1.json.gz")
+    assert json.loads(gzip.decompress(stored.read_bytes())) == FACTS
+
+    second = aax_facts.CacheModule(_uri=str(tmp_path))
+    assert second.keys() == ["web1"]
+    assert second.contains("web1")
+    assert second.get("web1") == FACTS
+    assert second.copy() == {"web1": FACTS}
+
+    second.flush()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_compression_level_zero_stores_plain_json(aax_facts: types.ModuleType, tmp_path: Path) -> None:
+    aax_facts.CacheModule(_uri=str(tmp_path), compression_level=0).set("web1", FACTS)
+    (stored,) = tmp_path.iterdir()
+    assert json.loads(stored.read_bytes()) == FACTS
+    assert aax_facts.CacheModule(_uri=str(tmp_path)).get("web1") == FACTS
+
+
+def test_expired_facts_are_gathered_again(aax_facts: types.ModuleType, tmp_path: Path) -> None:
+    aax_facts.CacheModule(_uri=str(tmp_path), _timeout=60).set("web1", FACTS)
+    (stored,) = tmp_path.iterdir()
+    old = time.time() - 120
+    os.utime(stored, (old, old))
+
+    plugin = aax_facts.CacheModule(_uri=str(tmp_path), _timeout=60)
+    assert not plugin.contains("web1")
+    assert not stored.exists()
+
+
+def test_facts_are_scoped_to_the_inventory(aax_facts: types.ModuleType, tmp_path: Path) -> None:
+    uri = str(tmp_path)
+    aax_facts.CacheModule(_uri=uri, scope="7").set("web1", FACTS)
+    assert aax_facts.CacheModule(_uri=uri, scope="7").get("web1") == FACTS
+    assert aax_facts.CacheModule(_uri=uri, scope="8").keys() == []
+    assert not aax_facts.CacheModule(_uri=uri).contains("web1")
+
+    # Without an inventory id the scope follows the inventory sources of the run.
+    aax_facts.CacheModule(_uri=uri).set("web1", {"ansible_hostname": "prod"})
+    sys.modules["ansible"].context.CLIARGS["inventory"] = ["/srv/inventories/lab.yml"]
+    assert aax_facts.CacheModule(_uri=uri).keys() == []
+    assert aax_facts.CacheModule(_uri=uri, scope="7").get("web1") == FACTS
+
+
+def test_unreadable_entries_are_discarded(aax_facts: types.ModuleType, tmp_path: Path) -> None:
+    plugin = aax_facts.CacheModule(_uri=str(tmp_path))
+    plugin.set("web1", FACTS)
+    (stored,) = tmp_path.iterdir()
+    stored.write_bytes(b"\x1f\x8bnot gzip")
+
+    fresh = aax_facts.CacheModule(_uri=str(tmp_path))
+    with pytest.raises(KeyError):
+        fresh.get("web1")
+    assert not stored.exists()
+    assert "discarded unreadable cached facts for web1" in fresh._display.warnings[0]
@@ -0,0 +1,220 @@
+"""Unit tests for the galaxy-ng response cache middleware.
+
+``images/galaxy-ng/aax_response_cache.py`` has no Django dependency, so it is
+loaded directly from the image build context and exercised with a fake WSGI
+application.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parent.parent / "images/galaxy-ng/aax_response_cache.py"
+_spec = importlib.util.spec_from_file_location("aax_response_cache", MODULE_PATH)
+assert _spec is not None and _spec.loader is not None
+cache_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cache_module)
+
+INDEX_PATH = "/api/galaxy/v3/collections/"
+
+
+class FakeApp:
+    """WSGI app that counts calls and returns a configurable response."""
+
+    def __init__(self, status: str = "200 OK", headers: list[tuple[str, str]] | None = None) -> None:
+        self.calls = 0
+        self.status = status
+        self.headers = headers or [("Content-Type", "application/json")]
+
+    def __call__(self, environ: dict[str, Any], start_response: Any) -> list[bytes]:
+        self.calls += 1
+        start_response(self.status, list(self.headers))
+        return [json.dumps({"call": self.calls, "path": environ["PATH_INFO"]}).encode()]
+
+
+class Marker:
+    """Mutable publish marker standing in for the RepositoryVersion query."""
+
+    def __init__(self) -> None:
+        self.value = "1:2026-01-01T00:00:00"
+
+    def __call__(self) -> str:
+        return self.value
+
+
+def _request(app: Any, path: str = INDEX_PATH, **environ: str) -> tuple[str, dict[str, str], bytes]:
+    captured: dict[str, Any] = {}
+
+    def start_response(status: str, headers: list[tuple[str, str]], exc_info: Any = None) -> Any:
+        captured["status"] = status
+        captured["headers"] = dict(headers)
+        return lambda data: None
+
+    env = {"REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": ""}
+    env.update(environ)
+    body = b"".join(app(env, start_response))
+    return captured["status"], captured["headers"], body
+
+
+@pytest.fixture
+def upstream() -> FakeApp:
+    return FakeApp()
+
+
+@pytest.fixture
+def marker() -> Marker:
+    return Marker()
+
+
+@pytest.fixture
+def cached(upstream: FakeApp, marker: Marker) -> Any:
+    return cache_module.ResponseCache(upstream, marker, check_interval=0)
+
+
+def test_second_anonymous_read_is_served_from_cache(cached: Any, upstream: FakeApp) -> None:
+    first = _request(cached)
+    second = _request(cached)
+
+    assert first[1]["X-AAX-Cache"] == "MISS"
+    assert second[1]["X-AAX-Cache"] == "HIT"
+    assert first[2] == second[2]
+    assert upstream.calls == 1
+
+
+def test_if_none_match_returns_not_modified(cached: Any) -> None:
+    _, headers, _ = _request(cached)
+    status, revalidated, body = _request(cached, HTTP_IF_NONE_MATCH=headers["ETag"])
+
+    assert status == "304 Not Modified"
+    assert revalidated["ETag"] == headers["ETag"]
+    assert body == b""
+    assert cached.stats["revalidated"] == 1
+    assert cached.stats["hits"] == 1
+
+
+class HeadStrippingApp(FakeApp):
+    """Answers HEAD with headers only, as a server that strips the body would."""
+
+    def __call__(self, environ: dict[str, Any], start_response: Any) -> list[bytes]:
+        body = super().__call__(environ, start_response)
+        return [] if environ["REQUEST_METHOD"] == "HEAD" else body
+
+
+def test_head_responses_are_not_stored(marker: Marker) -> None:
+    upstream = HeadStrippingApp()
+    cached = cache_module.ResponseCache(upstream, marker, check_interval=0)
+    _request(cached, REQUEST_METHOD="HEAD")
+    _, headers, body = _request(cached)
+
+    assert headers["X-AAX-Cache"] == "MISS"
+    assert json.loads(body)["call"] == 2
+
+    _, head, _ = _request(cached, REQUEST_METHOD="HEAD")
+    assert head["X-AAX-Cache"] == "HIT"
+    assert head["Content-Length"] == str(len(body))
+
+
+def test_publishing_repository_version_invalidates_entries(
+    cached: Any, upstream: FakeApp, marker: Marker
+) -> None:
+    _request(cached)
+    marker.value = "2:2026-01-01T00:05:00"
+    _, headers, _ = _request(cached)
+
+    assert headers["X-AAX-Cache"] == "MISS"
+    assert upstream.calls == 2
+    assert cached.stats["invalidations"] == 1
+
+
+@pytest.mark.parametrize(
+    "environ",
+    [
+        {"REQUEST_METHOD": "POST"},
+        {"PATH_INFO": "/api/galaxy/v3/namespaces/"},
+        {"HTTP_COOKIE": "csrftoken=a; sessionid=b"},
+        {"HTTP_AUTHORIZATION": "Token abc"},
+    ],
+)
+def test_uncacheable_requests_bypass(cached: Any, upstream: FakeApp, environ: dict[str, str]) -> None:
+    _request(cached, **environ)
+    _, headers, _ = _request(cached, **environ)
+
+    assert "X-AAX-Cache" not in headers
+    assert upstream.calls == 2
+
+
+def test_authenticated_reads_are_keyed_per_credential(upstream: FakeApp, marker: Marker) -> None:
+    cached = cache_module.ResponseCache(upstream, marker, check_interval=0, authenticated=True)
+    _request(cached, HTTP_AUTHORIZATION="Token one")
+    _, same, _ = _request(cached, HTTP_AUTHORIZATION="Token one")
+    _, other, _ = _request(cached, HTTP_AUTHORIZATION="Token two")
+
+    assert same["X-AAX-Cache"] == "HIT"
+    assert other["X-AAX-Cache"] == "MISS"
+
+
+def test_responses_with_cookies_are_not_stored(marker: Marker) -> None:
+    upstream = FakeApp(headers=[("Content-Type", "application/json"), ("Set-Cookie", "a=b")])
+    cached = cache_module.ResponseCache(upstream, marker, check_interval=0)
+    _request(cached)
+    _request(cached)
+
+    assert upstream.calls == 2
+
+
+def test_marker_failure_bypasses_cache(upstream: FakeApp) -> None:
+    def broken() -> str:
+        raise RuntimeError("database unavailable")
+
+    cached = cache_module.ResponseCache(upstream, broken, check_interval=0)
+    status, headers, _ = _request(cached)
+
+    assert status == "200 OK"
+    assert "X-AAX-Cache" not in headers
+    assert cached.stats["bypass"] == 1
+
+
+def test_local_store_evicts_least_recently_used() -> None:
+    store = cache_module.LocalStore(max_entries=2)
+    store.set("a", b"1", 60)
+    store.set("b", b"2", 60)
+    store.get("a")
+    store.set("c", b"3", 60)
+
+    assert store.get("a") == b"1"
+    assert store.get("b") is None
+
+
+def test_stats_endpoint_reports_counters(upstream: FakeApp, marker: Marker) -> None:
+    cached = cache_module.ResponseCache(upstream, marker, check_interval=0, stats_token="s3cret")
+    _request(cached)
+    _request(cached)
+    status, headers, body = _request(cached, path=cache_module.STATS_PATH, HTTP_X_AAX_STATS_TOKEN="s3cret")
+
+    assert status == "200 OK"
+    assert headers["Cache-Control"] == "no-store"
+    assert json.loads(body)["process"] == {
+        "hits": 1, "misses": 1, "revalidated": 0, "bypass": 0, "invalidations": 0,
+    }
+
+
+@pytest.mark.parametrize("stats_token, supplied", [("", ""), ("s3cret", ""), ("s3cret", "guess")])
+def test_stats_endpoint_requires_the_token(
+    upstream: FakeApp, marker: Marker, stats_token: str, supplied: str
+) -> None:
+    cached = cache_module.ResponseCache(upstream, marker, check_interval=0, stats_token=stats_token)
+    _, _, body = _request(cached, path=cache_module.STATS_PATH, HTTP_X_AAX_STATS_TOKEN=supplied)
+
+    assert json.loads(body)["path"] == cache_module.STATS_PATH
+    assert upstream.calls == 1
+
+
+def test_wrap_is_disabled_by_default(upstream: FakeApp, marker: Marker) -> None:
+    assert cache_module.wrap(upstream, marker, environ={}) is upstream
+    with pytest.raises(RuntimeError):
+        cache_module.wrap(upstream, marker, environ={"GALAXY_RESPONSE_CACHE": "memcached"})
@@ -0,0 +1,169 @@
+"""Unit tests for the shared Hub settings module.
+
+``aax_hub_settings.py`` only reads the environment, so it is loaded directly
+from the image build context, as are the two thin ``settings.py`` files that
+build on it.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MODULE_PATH = REPO_ROOT / "images/hub-common/aax_hub_settings.py"
+SETTINGS_FILES = {
+    "galaxy-ng": REPO_ROOT / "images/galaxy-ng/settings.py",
+    "pulp": REPO_ROOT / "images/pulp/settings.py",
+}
+
+# Generous ceiling for one worker's settings load (import plus build) in a fresh
+# interpreter; the point is to catch filesystem or network work sneaking back in.
+STARTUP_BUDGET_SECONDS = 0.05
+
+
+def _load_module() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("aax_hub_settings", MODULE_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+hub_settings = _load_module()
+
+
+def _build(prefix: str = "GALAXY", **environ: str) -> dict[str, Any]:
+    return hub_settings.build(
+        prefix=prefix,
+        default_allowed_hosts=["localhost"],
+        db_encryption_key="/tmp/key",
+        environ=environ,
+    )
+
+
+def _load_image_settings(image: str, monkeypatch: pytest.MonkeyPatch, **environ: str) -> dict[str, Any]:
+    """Execute an image's settings.py the way pulpcore's settings loader does."""
+    for name in list(os.environ):
+        if name.startswith(("HUB_", "GALAXY_", "PULP_")) or name in ("SECRET_KEY", "ALLOWED_HOSTS"):
+            monkeypatch.delenv(name)
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setitem(sys.modules, "aax_hub_settings", hub_settings)
+    path = SETTINGS_FILES[image]
+    namespace: dict[str, Any] = {"__file__": str(path)}
+    exec(compile(path.read_text(encoding="utf-8"), str(path), "exec"), namespace)
+    return {name: value for name, value in namespace.items() if name.isupper()}
+
+
+@pytest.mark.parametrize("role", ["api", "content", "worker"])
+def test_role_defaults_drive_pools_timeouts_and_ttls(role: str) -> None:
+    settings = _build(HUB_ROLE=role, HUB_DB_CONN_MODE="persistent")
+    defaults = hub_settings.ROLE_DEFAULTS[role]
+
+    assert settings["HUB_ROLE"] == role
+    assert settings["DATABASES"]["default"]["CONN_MAX_AGE"] == defaults["DB_CONN_MAX_AGE"]
+    assert settings["DATABASES"]["default"]["OPTIONS"]["connect_timeout"] == defaults["DB_CONNECT_TIMEOUT"]
+    assert settings["REDIS_CONNECTION_POOL_KWARGS"]["max_connections"] == defaults["REDIS_MAX_CONNECTIONS"]
+    assert settings["CACHES"]["default"]["OPTIONS"]["socket_timeout"] == defaults["REDIS_SOCKET_TIMEOUT"]
+    assert settings["CACHES"]["default"]["TIMEOUT"] == defaults["CACHE_TTL"]
+
+
+def test_role_override_beats_global_override() -> None:
+    settings = _build(
+        HUB_ROLE="content",
+        HUB_REDIS_MAX_CONNECTIONS="30",
+        HUB_CONTENT_REDIS_MAX_CONNECTIONS="200",
+        HUB_CACHE_TTL="120",
+        HUB_API_CACHE_TTL="5",
+        HUB_DB_CONNECT_TIMEOUT="",
+    )
+
+    assert settings["REDIS_CONNECTION_POOL_KWARGS"]["max_connections"] == 200
+    assert settings["CACHES"]["default"]["TIMEOUT"] == 120
+    assert settings["DATABASES"]["default"]["OPTIONS"]["connect_timeout"] == 5
+
+
+def test_direct_mode_ignores_conn_max_age() -> None:
+    settings = _build(HUB_DB_CONN_MAX_AGE="900")
+
+    assert settings["DATABASES"]["default"]["CONN_MAX_AGE"] == 0
+    assert "CONN_HEALTH_CHECKS" not in settings["DATABASES"]["default"]
+
+
+@pytest.mark.parametrize("environ", [{"HUB_ROLE": "scheduler"}, {"HUB_DB_CONN_MODE": "pooled"}])
+def test_invalid_choices_are_rejected(environ: dict[str, str]) -> None:
+    with pytest.raises(RuntimeError):
+        _build(**environ)
+
+
+def test_prefixed_variables_win_over_shared_ones() -> None:
+    settings = _build(
+        prefix="PULP",
+        PULP_SECRET_KEY="pulp",
+        SECRET_KEY="shared",
+        PULP_ALLOWED_HOSTS=" ",
+        ALLOWED_HOSTS="hub.example.com, pulp-api",
+    )
+
+    assert settings["SECRET_KEY"] == "pulp"
+    assert settings["ALLOWED_HOSTS"] == ["hub.example.com", "pulp-api"]
+    assert settings["CORS_ALLOW_ALL_ORIGINS"] is False
+    assert settings["CORS_ALLOWED_ORIGINS"] == hub_settings.DEFAULT_CORS_ALLOWED_ORIGINS
+
+
+def test_images_agree_on_shared_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    galaxy = _load_image_settings("galaxy-ng", monkeypatch, GALAXY_SECRET_KEY="g")
+    pulp = _load_image_settings("pulp", monkeypatch, PULP_SECRET_KEY="p")
+
+    for name in ("CONTENT_ORIGIN", "ANSIBLE_API_HOSTNAME", "CORS_ALLOW_ALL_ORIGINS", "LOGGING", "CACHES"):
+        assert galaxy[name] == pulp[name], name
+    assert galaxy["STATIC_ROOT"] == pulp["STATIC_ROOT"] == Path("/app/static")
+    assert (galaxy["SECRET_KEY"], pulp["SECRET_KEY"]) == ("g", "p")
+    assert "galaxy-ng" in galaxy["ALLOWED_HOSTS"]
+    assert pulp["TOKEN_SIGNATURE_ALGORITHM"] == "ES256"
+
+
+def test_loading_settings_has_no_filesystem_side_effects(monkeypatch: pytest.MonkeyPatch) -> None:
+    def refuse(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("settings must not create directories")
+
+    monkeypatch.setattr(Path, "mkdir", refuse)
+    monkeypatch.setattr(os, "makedirs", refuse)
+    monkeypatch.setattr(os, "mkdir", refuse)
+
+    module = _load_module()
+    monkeypatch.setitem(sys.modules, "aax_hub_settings", module)
+    for image in SETTINGS_FILES:
+        assert _load_image_settings(image, monkeypatch)["MEDIA_ROOT"] == Path("/var/lib/pulp/media")
+
+
+def test_worker_settings_load_time_is_within_budget() -> None:
+    """Time import plus build in fresh interpreters, as a new gunicorn worker would."""
+    probe = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import aax_hub_settings\n"
+        "aax_hub_settings.build('GALAXY', ['localhost'], '/tmp/key')\n"
+        "print(json.dumps(time.perf_counter() - start))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(MODULE_PATH.parent), "HUB_ROLE": "api"}
+    timings = []
+    for _ in range(5):
+        result = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, env=env, check=True
+        )
+        timings.append(json.loads(result.stdout))
+
+    median = statistics.median(timings)
+    print(f"\nHub settings load per worker: median {median * 1000:.2f} ms, max {max(timings) * 1000:.2f} ms")
+    assert median < STARTUP_BUDGET_SECONDS
@@ -2,6 +2,7 @@
 Tests for Docker images in the AAX project.
 These tests verify that images build correctly and function as expected.
 """
+import re
 import subprocess
 import time
 from pathlib import Path
@@ -12,7 +13,7 @@
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
 
-def build_image(tag, dockerfile, context, build_args=None):
+def build_image(tag, dockerfile, context, build_args=None, build_contexts=None):
     command = [
         "docker",
         "build",
@@ -24,6 +25,9 @@ def build_image(tag, dockerfile, context, build_args=None):
     if build_args:
         for key, value in build_args.items():
             command.extend(["--build-arg", f"{key}={value}"])
+    if build_contexts:
+        for name, path in build_contexts.items():
+            command.extend(["--build-context", f"{name}={REPO_ROOT / path}"])
     command.append(str(REPO_ROOT / context))
     result = subprocess.run(
         command,
@@ -143,6 +147,42 @@ def test_ansible_imports(self):
         assert result.returncode == 0
         assert "success" in result.stdout
 
+    def test_fact_cache_skips_second_gather(self):
+        """Test that the aax_facts cache plugin persists facts between runs."""
+        script = (
+            "printf '%s\\n' '- hosts: all' '  tasks: [{ping: }]' > /tmp/site.yml && "
+            "ansible-playbook -i localhost, -c local /tmp/site.yml && "
+            "echo '--- second run' && "
+            "ansible-playbook -i localhost, -c local /tmp/site.yml && "
+            "ls /tmp/facts"
+        )
+        result = subprocess.run(
+            ["docker", "run", "--rm", "-e", "AAX_FACT_CACHE=/tmp/facts",
+             self.IMAGE_NAME, "bash", "-c", script],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+        first, second = result.stdout.split("--- second run")
+        assert "Gathering Facts" in first
+        assert "Gathering Facts" not in second
+        # ansible-core's cache interposer adds its schema prefix (s1_) after the inventory scope.
+        assert re.search(r"ansible_facts_inventory-[0-9a-f]{12}_s\d+_localhost\.json\.gz", second)
+
+    def test_ssh_wrapper_shares_control_sockets(self):
+        """Test that aax-ssh puts ControlMaster sockets in AAX_SSH_CONTROL_DIR."""
+        result = subprocess.run(
+            ["docker", "run", "--rm",
+             "-e", "AAX_SSH_CONTROL_DIR=/var/lib/ansible/cp",
+             "-e", "AAX_SSH_CONTROL_PERSIST=10m",
+             self.IMAGE_NAME, "aax-ssh", "-G", "-o", "ControlPath=/tmp/job/cp", "example.com"],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert "controlpath /var/lib/ansible/cp/" in result.stdout
+        assert "controlpersist 600" in result.stdout
+
 
 class TestEEBuilderImage:
     """Tests for the Ansible EE builder image."""
@@ -299,6 +339,29 @@ def test_nginx_config_valid(self):
         )
         assert result.returncode == 0, f"nginx config invalid: {result.stderr}"
 
+    def test_tls_listener_config_valid(self):
+        """Test that GATEWAY_TLS=on renders a valid HTTP/2 listener with a generated certificate."""
+        result = subprocess.run(
+            ["docker", "run", "--rm", "-e", "GATEWAY_TLS=on", self.IMAGE_NAME, "nginx", "-t"],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, f"nginx TLS config invalid: {result.stderr}"
+        assert "TLS listener enabled on 8443" in result.stdout + result.stderr
+
+    def test_rate_limit_config_valid(self):
+        """Test that custom and disabled rate limits render a valid nginx config."""
+        for overrides in (
+            ["-e", "GATEWAY_RATE_LIMIT_RATE=5r/s", "-e", "GATEWAY_LAUNCH_RATE_LIMIT_BURST=2"],
+            ["-e", "GATEWAY_RATE_LIMIT=off"],
+        ):
+            result = subprocess.run(
+                ["docker", "run", "--rm", *overrides, self.IMAGE_NAME, "nginx", "-t"],
+                capture_output=True,
+                text=True,
+            )
+            assert result.returncode == 0, f"nginx rate-limit config invalid: {result.stderr}"
+
     def test_routes_bundled_into_image(self):
         """Test that the gateway image includes the expected upstream routes."""
         result = subprocess.run(
@@ -428,6 +491,7 @@ def test_image_builds(self):
             self.IMAGE_NAME,
             "images/galaxy-ng/Dockerfile",
             "images/galaxy-ng",
+            build_contexts={"hub-common": "images/hub-common"},
         )
         assert result.returncode == 0, f"Build failed: {result.stderr}"
 
@@ -489,6 +553,7 @@ def test_image_builds(self):
             self.IMAGE_NAME,
             "images/pulp/Dockerfile.pulp",
             "images/pulp",
+            build_contexts={"hub-common": "images/hub-common"},
         )
         assert result.returncode == 0, f"Build failed: {result.stderr}"
 
@@ -589,6 +654,20 @@ def test_postgres_driver_installed(self):
         )
         assert result.returncode == 0
 
+    def test_activation_manager_importable(self):
+        """Test that the activation manager and aax_events source import in the image."""
+        result = subprocess.run(
+            [
+                "docker", "run", "--rm", "-w", "/opt/aax/eda", self.IMAGE_NAME, "python3", "-c",
+                "import aax_eda_manager, importlib.util; "
+                "spec = importlib.util.spec_from_file_location('aax_events', 'sources/aax_events.py'); "
+                "spec.loader.exec_module(importlib.util.module_from_spec(spec))",
+            ],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, result.stderr
+
     def test_user_is_eda(self):
         """Test that the container runs as the eda user."""
         result = subprocess.run(
@@ -610,3 +689,86 @@ def test_java_installed(self):
         output = result.stdout + result.stderr
         assert result.returncode == 0, f"Java not installed. Output: {output}"
         assert "openjdk" in output.lower() or "java" in output.lower(), "Java version not found in output"
+
+
+class TestReceptorExecutionImage:
+    """Tests for the receptor execution node image."""
+
+    IMAGE_NAME = "aax/receptor-execution:1.0.0"
+    # Cold start budget with networking disabled: render config, start receptor,
+    # answer receptorctl. A pip install or a missing bytecode cache blows this.
+    HEALTHY_BUDGET_SECONDS = 15
+
+    def test_image_builds(self):
+        """Test that the receptor execution image builds successfully."""
+        result = build_image(
+            self.IMAGE_NAME,
+            "images/receptor-execution/Dockerfile",
+            "images/receptor-execution",
+            build_contexts={"ee-base-src": "images/ee-base"},
+        )
+        assert result.returncode == 0, f"Build failed: {result.stderr}"
+
+    def test_pinned_runner_is_patched_and_compiled(self):
+        """Test that the pinned ansible-runner is patched and byte-compiled at build time."""
+        probe = (
+            "import importlib.metadata, importlib.util, pathlib\n"
+            "spec = importlib.util.find_spec('ansible_runner.interface')\n"
+            "print(importlib.metadata.version('ansible-runner'))\n"
+            "print('kwargs[\"process_isolation\"] = False  # AAX' in pathlib.Path(spec.origin).read_text())\n"
+            "print(pathlib.Path(importlib.util.cache_from_source(spec.origin)).exists())\n"
+        )
+        result = subprocess.run(
+            ["docker", "run", "--rm", "--network", "none", self.IMAGE_NAME, "python3", "-c", probe],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        version, patched, compiled = result.stdout.split()
+        assert version.startswith("2.4.1.dev6"), version
+        assert (patched, compiled) == ("True", "True")
+
+    def test_node_healthy_offline_within_budget(self):
+        """Test that the node reports healthy with networking disabled, within the budget."""
+        container_name = f"aax-receptor-execution-test-{int(time.time() * 1000)}"
+        start_time = time.monotonic()
+        start = subprocess.run(
+            [
+                "docker",
+                "run",
+                "-d",
+                "--rm",
+                "--user",
+                "0",
+                "--network",
+                "none",
+                "--health-interval",
+                "1s",
+                "--health-start-period",
+                "1s",
+                "--name",
+                container_name,
+                self.IMAGE_NAME,
+            ],
+            capture_output=True,
+            text=True,
+        )
+        assert start.returncode == 0, f"Execution node failed to start: {start.stderr}"
+
+        try:
+            status = ""
+            while time.monotonic() - start_time < self.HEALTHY_BUDGET_SECONDS * 2:
+                status = subprocess.run(
+                    ["docker", "inspect", "-f", "{{.State.Health.Status}}", container_name],
+                    capture_output=True,
+                    text=True,
+                ).stdout.strip()
+                if status == "healthy":
+                    break
+                time.sleep(0.5)
+            elapsed = time.monotonic() - start_time
+            print(f"\nreceptor-execution healthy after {elapsed:.1f}s (offline)")
+            assert status == "healthy", f"Execution node not healthy: {status!r}"
+            assert elapsed < self.HEALTHY_BUDGET_SECONDS
+        finally:
+            subprocess.run(["docker", "rm", "-f", container_name], capture_output=True, text=True)
@@ -113,6 +113,7 @@ def test_full_stack_deployments_rendered(self, rendered_manifests: str) -> None:
             "name: awx-redis",
             "name: awx-web",
             "name: awx-task",
+            "name: awx-callback-receiver",
             "name: awx-receptor",
             "name: receptor-hop",
             "name: receptor-execution",
@@ -243,6 +244,7 @@ def test_expected_deployments_exist(self, k8s_deployed: Any) -> None:
         expected = [
             "deployment.apps/awx-web",
             "deployment.apps/awx-task",
+            "deployment.apps/awx-callback-receiver",
             "deployment.apps/awx-receptor",
             "deployment.apps/receptor-hop",
             "deployment.apps/receptor-execution",
@@ -39,6 +39,11 @@
 STACK_READY_TIMEOUT = 600  # 10 min for images to pull + migrations
 JOB_TIMEOUT = 120  # 2 min per job
 
+# Execution-node scaling
+EXECUTION_NODE_PREFIX = "receptor-execution-"
+SCALED_REPLICAS = int(os.getenv("AAX_SCALED_EXECUTION_REPLICAS", "3"))
+CONCURRENT_JOBS = int(os.getenv("AAX_CONCURRENT_JOBS", "6"))
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -207,6 +212,16 @@ def hello_world_project(awx_stack: None, tmp_path_factory: pytest.TempPathFactor
               ansible.builtin.debug:
                 msg: "Hello from AAX integration test!"
     """))
+    (project_dir / "sleep.yml").write_text(textwrap.dedent("""\
+        ---
+        - name: Hold an execution slot
+          hosts: all
+          gather_facts: false
+          tasks:
+            - name: Sleep
+              ansible.builtin.pause:
+                seconds: 20
+    """))
     # Use docker cp to copy into the awx_projects volume via the awx-task container
     # (awx-task, awx-web, and awx-receptor all share that volume)
     subprocess.run(
@@ -344,9 +359,9 @@ def test_receptor_mesh_connected(self, awx_stack: None) -> None:
         instances = r.json()["results"]
         hostnames = {i["hostname"] for i in instances}
         assert "awx" in hostnames, f"Expected 'awx' in instances, got {hostnames}"
-        # receptor-execution should be provisioned
-        assert "receptor-execution" in hostnames, (
-            f"Expected 'receptor-execution' in instances, got {hostnames}"
+        # receptor-execution replicas register as receptor-execution-<hostname>
+        assert any(h.startswith(EXECUTION_NODE_PREFIX) for h in hostnames), (
+            f"Expected a '{EXECUTION_NODE_PREFIX}*' instance, got {hostnames}"
         )
 
     def test_instances_healthy(self, awx_stack: None) -> None:
@@ -424,3 +439,87 @@ def test_job_stdout_contains_hello(self, awx_job_template: int) -> None:
                             params={"format": "txt"})
         stdout_r.raise_for_status()
         assert "Hello from AAX integration test!" in stdout_r.text
+
+
+# ---------------------------------------------------------------------------
+# Execution-node scaling
+# ---------------------------------------------------------------------------
+
+def _execution_nodes() -> list[dict[str, Any]]:
+    r = _awx_api("GET", "/api/v2/instances/", params={"node_type": "execution", "page_size": 200})
+    r.raise_for_status()
+    return [
+        i for i in r.json()["results"]
+        if i["hostname"].startswith(EXECUTION_NODE_PREFIX) and i["enabled"] and i["capacity"] > 0
+    ]
+
+
+def _scale_execution_nodes(replicas: int, timeout: int = STACK_READY_TIMEOUT) -> None:
+    """Scale receptor-execution and wait until awx-task has registered every replica."""
+    _compose("up", "-d", "--no-recreate", "--scale", f"receptor-execution={replicas}")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if len(_execution_nodes()) == replicas:
+            return
+        time.sleep(5)
+    raise TimeoutError(
+        f"Expected {replicas} execution nodes, got {[i['hostname'] for i in _execution_nodes()]}"
+    )
+
+
+@pytest.fixture(scope="session")
+def sleep_job_template(awx_job_template: int) -> int:
+    """Get or create a job template that holds an execution slot for a while."""
+    r = _awx_api("GET", "/api/v2/job_templates/", params={"name": "integration-test-sleep"})
+    r.raise_for_status()
+    existing = r.json()["results"]
+    if existing:
+        return existing[0]["id"]
+
+    r = _awx_api("POST", f"/api/v2/job_templates/{awx_job_template}/copy/",
+                 json={"name": "integration-test-sleep"})
+    r.raise_for_status()
+    jt_id = r.json()["id"]
+    _awx_api("PATCH", f"/api/v2/job_templates/{jt_id}/", json={
+        "playbook": "sleep.yml",
+        "verbosity": 0,
+    }).raise_for_status()
+    return jt_id
+
+
+def _run_concurrent_jobs(job_template: int, count: int) -> tuple[float, list[dict[str, Any]]]:
+    """Launch ``count`` jobs at once; return the wall time and the finished jobs."""
+    start = time.monotonic()
+    job_ids = []
+    for _ in range(count):
+        r = _awx_api("POST", f"/api/v2/job_templates/{job_template}/launch/")
+        assert r.status_code in (200, 201), f"Launch failed: {r.status_code} {r.text}"
+        job_ids.append(r.json()["id"])
+    jobs = [_wait_for_job(job_id, timeout=JOB_TIMEOUT * 3) for job_id in job_ids]
+    return time.monotonic() - start, jobs
+
+
+@pytest.mark.integration
+class TestExecutionNodeScaling:
+    """Run the same batch of concurrent jobs on one execution node and on several."""
+
+    def test_jobs_spread_across_scaled_execution_nodes(self, sleep_job_template: int) -> None:
+        results = {}
+        try:
+            for replicas in (1, SCALED_REPLICAS):
+                _scale_execution_nodes(replicas)
+                elapsed, jobs = _run_concurrent_jobs(sleep_job_template, CONCURRENT_JOBS)
+                failed = [j["id"] for j in jobs if j["status"] != "successful"]
+                assert not failed, f"Jobs {failed} did not succeed with {replicas} node(s)"
+                nodes = {j["execution_node"] for j in jobs}
+                results[replicas] = (elapsed, nodes)
+                print(
+                    f"\n[scaling] {replicas} node(s): {CONCURRENT_JOBS} jobs in {elapsed:.1f}s "
+                    f"({CONCURRENT_JOBS * 60 / elapsed:.1f} jobs/min) on {sorted(nodes)}"
+                )
+        finally:
+            _scale_execution_nodes(1)
+
+        assert len(results[SCALED_REPLICAS][1]) >= 2, (
+            f"Jobs did not spread across execution nodes: {results[SCALED_REPLICAS][1]}"
+        )
@@ -0,0 +1,1642 @@
+"""Performance benchmarks that run against a local AAX stack.
+
+These tests require Docker and are marked with ``@pytest.mark.integration``
+and ``@pytest.mark.slow``.  They are excluded from the default ``pytest`` run.
+Execute them with::
+
+    pytest -m integration tests/test_performance.py -v --no-cov -s
+
+Each benchmark prints its measurements so that before/after numbers can be
+copied into a PR description.  Assertions only guard against regressions; the
+absolute numbers depend on the host.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import statistics
+import subprocess
+import tarfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+import requests
+from requests.auth import HTTPBasicAuth
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+COMPOSE_FILE = REPO_ROOT / "docker-compose.yml"
+
+GATEWAY_PORT = os.getenv("GATEWAY_PORT", "18088")
+GATEWAY_URL = f"http://localhost:{GATEWAY_PORT}"
+AWX_PORT = os.getenv("AWX_WEB_PORT", "18080")
+AWX_URL = f"http://localhost:{AWX_PORT}"
+AWX_USER = os.getenv("AWX_ADMIN_USER", "admin")
+AWX_PASS = os.getenv("AWX_ADMIN_PASSWORD", "benchmark-admin-pw")  # pragma: allowlist secret
+
+STACK_READY_TIMEOUT = 600  # 10 min for images to pull + migrations
+BENCH_SECONDS = float(os.getenv("AAX_BENCH_SECONDS", "20"))
+BENCH_CONCURRENCY = int(os.getenv("AAX_BENCH_CONCURRENCY", "8"))
+EDA_TOKEN = os.getenv("EDA_API_TOKEN", "benchmark-eda-api-token")  # pragma: allowlist secret
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _compose_env(**overrides: str) -> dict[str, str]:
+    """Return an env dict for docker compose with test-safe secrets."""
+    env = os.environ.copy()
+    env.setdefault("DATABASE_PASSWORD", "benchmark-database-pw")  # pragma: allowlist secret
+    env.setdefault("SECRET_KEY", "benchmark-secret-key-not-for-production")  # pragma: allowlist secret
+    env.setdefault("AWX_ADMIN_PASSWORD", AWX_PASS)
+    env.setdefault("HUB_DB_PASSWORD", "benchmark-hub-db-pw")  # pragma: allowlist secret
+    env.setdefault("HUB_ADMIN_PASSWORD", "benchmark-hub-admin-pw")  # pragma: allowlist secret
+    env.setdefault("GALAXY_SECRET_KEY", "benchmark-galaxy-secret-key")  # pragma: allowlist secret
+    env.setdefault("PULP_SECRET_KEY", "benchmark-pulp-secret-key")  # pragma: allowlist secret
+    env.setdefault("EDA_DB_PASSWORD", "benchmark-eda-db-pw")  # pragma: allowlist secret
+    env.setdefault("EDA_API_TOKEN", EDA_TOKEN)
+    env.setdefault("AAX_ALLOW_PLACEHOLDER_SECRETS", "true")
+    # Load generators come from one address; only the rate-limit benchmark turns it on.
+    env.setdefault("GATEWAY_RATE_LIMIT", "off")
+    # The EDA benchmarks create activations through the gateway.
+    env.setdefault("GATEWAY_EDA_ADMIN", "on")
+    env.update(overrides)
+    return env
+
+
+def _compose(
+    profiles: tuple[str, ...],
+    *args: str,
+    env: dict[str, str] | None = None,
+    check: bool = True,
+) -> subprocess.CompletedProcess[str]:
+    cmd = ["docker", "compose", "-f", str(COMPOSE_FILE)]
+    for profile in profiles:
+        cmd.extend(["--profile", profile])
+    cmd.extend(args)
+    return subprocess.run(
+        cmd, capture_output=True, text=True,
+        cwd=str(REPO_ROOT), env=env or _compose_env(), check=check,
+    )
+
+
+def _wait_for_url(url: str, timeout: int = STACK_READY_TIMEOUT) -> None:
+    """Block until ``url`` answers with a non-5xx status."""
+    deadline = time.monotonic() + timeout
+    last_exc: Exception | None = None
+    while time.monotonic() < deadline:
+        try:
+            r = requests.get(url, timeout=5)
+            if r.status_code < 500:
+                return
+        except Exception as exc:
+            last_exc = exc
+        time.sleep(5)
+    raise TimeoutError(f"{url} did not become ready within {timeout}s.  Last error: {last_exc}")
+
+
+def _measure_throughput(
+    request: Callable[[requests.Session], requests.Response],
+    seconds: float = BENCH_SECONDS,
+    concurrency: int = BENCH_CONCURRENCY,
+) -> dict[str, float]:
+    """Drive ``request`` from ``concurrency`` threads and report rps and latency."""
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker() -> None:
+        nonlocal errors
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = request(session).status_code < 500
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "requests": float(len(latencies)),
+        "errors": float(errors),
+        "rps": len(latencies) / seconds,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+    }
+
+
+def _awx_api(method: str, path: str, **kwargs: Any) -> requests.Response:
+    return requests.request(
+        method, f"{AWX_URL}{path}", auth=HTTPBasicAuth(AWX_USER, AWX_PASS), timeout=30, **kwargs
+    )
+
+
+def _ensure_event_flood_template() -> int:
+    """Create (or reuse) a job template whose playbook emits ``event_count`` events."""
+    playbook = (
+        "---\n"
+        "- name: Event flood\n"
+        "  hosts: all\n"
+        "  gather_facts: false\n"
+        "  tasks:\n"
+        "    - name: Emit one event per item\n"
+        "      ansible.builtin.debug:\n"
+        "        msg: \"event {{ item }}\"\n"
+        "      loop: \"{{ range(0, event_count | int) | list }}\"\n"
+    )
+    subprocess.run(
+        [
+            "docker", "exec", "-i", "awx-task", "sh", "-c",
+            "mkdir -p /var/lib/awx/projects/aax_benchmarks && "
+            "cat > /var/lib/awx/projects/aax_benchmarks/event_flood.yml",
+        ],
+        input=playbook, text=True, check=True, capture_output=True,
+    )
+
+    r = _awx_api("GET", "/api/v2/job_templates/", params={"name": "aax-benchmark-event-flood"})
+    r.raise_for_status()
+    if r.json()["results"]:
+        return r.json()["results"][0]["id"]
+
+    org = _awx_api("GET", "/api/v2/organizations/", params={"name": "Default"}).json()["results"][0]
+    inventory = _awx_api("POST", "/api/v2/inventories/", json={
+        "name": "aax-benchmark-inventory", "organization": org["id"],
+    })
+    inventory.raise_for_status()
+    _awx_api("POST", f"/api/v2/inventories/{inventory.json()['id']}/hosts/", json={
+        "name": "localhost",
+        "variables": "ansible_connection: local\nansible_python_interpreter: /usr/bin/python3",
+    }).raise_for_status()
+    project = _awx_api("POST", "/api/v2/projects/", json={
+        "name": "aax-benchmark-project", "organization": org["id"],
+        "scm_type": "", "local_path": "aax_benchmarks",
+    })
+    project.raise_for_status()
+    template = _awx_api("POST", "/api/v2/job_templates/", json={
+        "name": "aax-benchmark-event-flood",
+        "project": project.json()["id"],
+        "inventory": inventory.json()["id"],
+        "playbook": "event_flood.yml",
+        "ask_variables_on_launch": True,
+    })
+    template.raise_for_status()
+    return template.json()["id"]
+
+
+def _run_event_flood(template_id: int, event_count: int, timeout: int = 900) -> dict[str, float]:
+    """Launch the event-flood template and measure events/sec until ingestion completes."""
+    start = time.monotonic()
+    r = _awx_api(
+        "POST", f"/api/v2/job_templates/{template_id}/launch/",
+        json={"extra_vars": {"event_count": event_count}},
+    )
+    assert r.status_code in (200, 201), f"Launch failed: {r.status_code} {r.text}"
+    job_id = r.json()["id"]
+
+    deadline = start + timeout
+    while time.monotonic() < deadline:
+        job = _awx_api("GET", f"/api/v2/jobs/{job_id}/").json()
+        if job["status"] in {"failed", "error", "canceled"}:
+            pytest.fail(f"Event flood job {job_id} finished with status {job['status']}")
+        if job["status"] == "successful" and job.get("event_processing_finished"):
+            break
+        time.sleep(1)
+    else:
+        raise TimeoutError(f"Job {job_id} did not finish ingesting events within {timeout}s")
+    elapsed = time.monotonic() - start
+
+    events = _awx_api("GET", f"/api/v2/jobs/{job_id}/job_events/", params={"page_size": 1})
+    events.raise_for_status()
+    count = events.json()["count"]
+    return {"events": float(count), "seconds": elapsed, "events_per_s": count / elapsed}
+
+
+def _collection_tarball(namespace: str, name: str, version: str) -> bytes:
+    """Build a minimal, importable collection artifact in memory."""
+    readme = f"# {namespace}.{name}\n\nBenchmark collection.\n".encode()
+    files_json = json.dumps({
+        "files": [
+            {"name": ".", "ftype": "dir", "chksum_type": None, "chksum_sha256": None, "format": 1},
+            {
+                "name": "README.md", "ftype": "file", "chksum_type": "sha256",
+                "chksum_sha256": hashlib.sha256(readme).hexdigest(), "format": 1,
+            },
+        ],
+        "format": 1,
+    }).encode()
+    manifest = json.dumps({
+        "collection_info": {
+            "namespace": namespace, "name": name, "version": version,
+            "authors": ["AAX benchmarks"], "readme": "README.md", "tags": [],
+            "description": "Benchmark collection", "license": ["GPL-3.0-or-later"],
+            "license_file": None, "dependencies": {}, "repository": "https://example.com/repo",
+            "documentation": None, "homepage": None, "issues": None,
+        },
+        "file_manifest_file": {
+            "name": "FILES.json", "ftype": "file", "chksum_type": "sha256",
+            "chksum_sha256": hashlib.sha256(files_json).hexdigest(), "format": 1,
+        },
+        "format": 1,
+    }).encode()
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for member, data in (("MANIFEST.json", manifest), ("FILES.json", files_json), ("README.md", readme)):
+            info = tarfile.TarInfo(member)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def _report(name: str, results: dict[str, dict[str, float]]) -> None:
+    """Print a small before/after table for a benchmark."""
+    print(f"\n[benchmark] {name}")
+    for label, numbers in results.items():
+        summary = ", ".join(f"{key}={value:.1f}" for key, value in numbers.items())
+        print(f"  {label:<12} {summary}")
+
+
+# ---------------------------------------------------------------------------
+# Hub
+# ---------------------------------------------------------------------------
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestHubConnectionPoolingBenchmark:
+    """Compare Hub API throughput with per-request and persistent DB connections."""
+
+    STATUS_URL = f"{GATEWAY_URL}/pulp/api/v3/status/"
+
+    def _run_mode(self, mode: str) -> dict[str, float]:
+        env = _compose_env(HUB_DB_CONN_MODE=mode)
+        # Changed environment makes compose recreate pulp-api with the new mode.
+        _compose(("hub",), "up", "-d", "--wait", "pulp-api", "gateway", env=env, check=False)
+        _wait_for_url(self.STATUS_URL)
+        return _measure_throughput(lambda s: s.get(self.STATUS_URL, timeout=30))
+
+    def test_persistent_connections_do_not_reduce_throughput(self) -> None:
+        """Persistent connections should serve at least as many requests/sec as direct."""
+        try:
+            results = {mode: self._run_mode(mode) for mode in ("direct", "persistent")}
+        finally:
+            _compose(("hub",), "down", check=False)
+        _report("hub-postgres connection reuse (/pulp/api/v3/status/)", results)
+
+        assert results["direct"]["requests"] > 0
+        assert results["persistent"]["errors"] == 0
+        assert results["persistent"]["rps"] >= results["direct"]["rps"] * 0.95
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestHubResponseCacheBenchmark:
+    """Compare collection index throughput with the galaxy-ng response cache off and on."""
+
+    INDEX_URL = f"{GATEWAY_URL}/api/galaxy/v3/collections/"
+    STATS_URL = f"{GATEWAY_URL}/api/galaxy/_aax/response-cache/"
+    AUTH = HTTPBasicAuth("admin", "benchmark-hub-admin-pw")  # pragma: allowlist secret
+    STATS_TOKEN = "benchmark-cache-stats-token"  # pragma: allowlist secret
+
+    def _run_mode(self, mode: str) -> dict[str, float]:
+        env = _compose_env(GALAXY_RESPONSE_CACHE=mode, GALAXY_RESPONSE_CACHE_AUTHENTICATED="true",
+                           GALAXY_RESPONSE_CACHE_STATS_TOKEN=self.STATS_TOKEN)
+        _compose(("hub",), "up", "-d", "--wait", "galaxy-ng", "gateway", env=env, check=False)
+        _wait_for_url(self.INDEX_URL)
+        return _measure_throughput(lambda s: s.get(self.INDEX_URL, auth=self.AUTH, timeout=30))
+
+    def test_cached_index_reads_are_faster(self) -> None:
+        """A warm response cache should serve index pages faster than Django."""
+        try:
+            results = {mode: self._run_mode(mode) for mode in ("off", "redis")}
+            stats = requests.get(self.STATS_URL, headers={"X-AAX-Stats-Token": self.STATS_TOKEN}, timeout=10).json()
+        finally:
+            _compose(("hub",), "down", check=False)
+        _report("galaxy-ng response cache (/api/galaxy/v3/collections/)", results)
+        print(f"  cache stats  {stats}")
+
+        assert results["redis"]["errors"] == 0
+        assert stats["shared"]["hits"] > stats["shared"]["misses"]
+        assert results["redis"]["rps"] >= results["off"]["rps"]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestGatewayContentCacheBenchmark:
+    """Measure Pulp content throughput through the gateway proxy cache.
+
+    Only collection artifacts are cached. ``AAX_BENCH_CONTENT_PATH`` names the
+    tarball to read; the test is skipped if it has not been published.
+    """
+
+    CONTENT_URL = GATEWAY_URL + os.getenv(
+        "AAX_BENCH_CONTENT_PATH", "/pulp/content/published/collections/artifacts/aax-bench-1.0.0.tar.gz",
+    )
+
+    def test_repeated_content_reads_hit_cache(self) -> None:
+        """The first read fills the cache and later reads are served by the gateway."""
+        try:
+            _compose(("hub",), "up", "-d", "--wait", "pulp-content", "gateway", check=False)
+            _wait_for_url(self.CONTENT_URL)
+            subprocess.run(
+                ["docker", "exec", "aax-gateway", "sh", "-c", "rm -rf /var/cache/nginx/pulp-content/*"],
+                capture_output=True, check=False,
+            )
+            first = requests.get(self.CONTENT_URL, timeout=60)
+            if first.status_code != 200:
+                pytest.skip(
+                    f"{self.CONTENT_URL} answered {first.status_code}; "
+                    "publish it or set AAX_BENCH_CONTENT_PATH"
+                )
+            second = requests.get(self.CONTENT_URL, timeout=60)
+            results = {
+                "direct": _measure_throughput(
+                    lambda s: s.get(self.CONTENT_URL, headers={"X-AAX-Cache-Bypass": "1"}, timeout=60)
+                ),
+                "cached": _measure_throughput(lambda s: s.get(self.CONTENT_URL, timeout=60)),
+            }
+        finally:
+            _compose(("hub",), "down", check=False)
+        _report(f"gateway content cache ({self.CONTENT_URL})", results)
+
+        assert first.headers.get("X-Cache-Status") == "MISS"
+        assert second.headers.get("X-Cache-Status") == "HIT"
+        assert first.content == second.content
+        assert results["cached"]["errors"] == 0
+        assert results["cached"]["rps"] >= results["direct"]["rps"]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestHubAccessPolicyCacheBenchmark:
+    """Count access-policy queries per API request with and without the Redis cache."""
+
+    REQUESTS = 20
+    SCRIPT = """
+import base64, importlib.util, json, os
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+spec = importlib.util.spec_from_file_location(
+    "aax_access_policy_cache", "/etc/pulp/aax_access_policy_cache.py")
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+module.install(ttl=int(os.environ["BENCH_TTL"]))
+
+credentials = base64.b64encode(
+    (os.environ["GALAXY_ADMIN_USERNAME"] + ":" + os.environ["GALAXY_ADMIN_PASSWORD"]).encode()
+).decode()
+client = Client(HTTP_HOST="localhost", HTTP_AUTHORIZATION="Basic " + credentials)
+client.get("/pulp/api/v3/repositories/")  # warm-up fills the cache
+with CaptureQueriesContext(connection) as queries:
+    for _ in range(int(os.environ["BENCH_REQUESTS"])):
+        assert client.get("/pulp/api/v3/repositories/").status_code == 200
+policy = sum("core_accesspolicy" in q["sql"] for q in queries.captured_queries)
+print(json.dumps({"queries": len(queries.captured_queries), "policy_queries": policy}))
+"""
+
+    def _count_queries(self, ttl: int) -> dict[str, float]:
+        result = subprocess.run(
+            [
+                "docker", "exec", "-e", f"BENCH_TTL={ttl}", "-e", f"BENCH_REQUESTS={self.REQUESTS}",
+                "aax-pulp-api", "pulpcore-manager", "shell", "-c", self.SCRIPT,
+            ],
+            capture_output=True, text=True, check=True,
+        )
+        counts = json.loads(result.stdout.strip().splitlines()[-1])
+        return {key: value / self.REQUESTS for key, value in counts.items()}
+
+    def test_access_policy_queries_drop_with_cache(self) -> None:
+        """Cached access policies should remove the per-request policy query."""
+        try:
+            _compose(("hub",), "up", "-d", "--wait", "pulp-api", check=False)
+            results = {"uncached": self._count_queries(0), "cached": self._count_queries(60)}
+        finally:
+            _compose(("hub",), "down", check=False)
+        _report("access-policy queries per request (/pulp/api/v3/repositories/)", results)
+
+        assert results["uncached"]["policy_queries"] >= 1
+        assert results["cached"]["policy_queries"] == 0
+        assert results["cached"]["queries"] < results["uncached"]["queries"]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestPulpWorkerScalingBenchmark:
+    """Queue many collection imports and compare wall-clock time as pulp-worker scales."""
+
+    IMPORT_COUNT = int(os.getenv("AAX_BENCH_IMPORTS", "24"))
+    WORKER_COUNTS = (1, int(os.getenv("AAX_BENCH_PULP_WORKERS", "4")))
+    GALAXY_API = f"{GATEWAY_URL}/api/galaxy"
+    NAMESPACE = "aaxbench"
+    AUTH = HTTPBasicAuth("admin", "benchmark-hub-admin-pw")  # pragma: allowlist secret
+
+    def _ensure_namespace(self) -> None:
+        r = requests.post(
+            f"{self.GALAXY_API}/v3/namespaces/", auth=self.AUTH, timeout=30,
+            json={"name": self.NAMESPACE, "groups": []},
+        )
+        assert r.status_code in (201, 400, 409), f"Namespace create failed: {r.status_code} {r.text}"
+
+    def _import_batch(self, workers: int) -> dict[str, float]:
+        _compose(("hub",), "up", "-d", "--wait", "--scale", f"pulp-worker={workers}", check=False)
+        _wait_for_url(f"{self.GALAXY_API}/")
+        self._ensure_namespace()
+
+        run = int(time.time())
+        start = time.monotonic()
+        tasks = []
+        for index in range(self.IMPORT_COUNT):
+            artifact = _collection_tarball(self.NAMESPACE, f"c{index}", f"1.{run}.{workers}")
+            r = requests.post(
+                f"{self.GALAXY_API}/v3/artifacts/collections/", auth=self.AUTH, timeout=60,
+                files={"file": (f"{self.NAMESPACE}-c{index}-1.{run}.{workers}.tar.gz", artifact)},
+            )
+            assert r.status_code == 202, f"Upload failed: {r.status_code} {r.text}"
+            tasks.append(r.json()["task"])
+
+        pending = set(tasks)
+        deadline = start + 1800
+        failed = 0
+        while pending and time.monotonic() < deadline:
+            for task in list(pending):
+                state = requests.get(f"{GATEWAY_URL}{task}", auth=self.AUTH, timeout=30).json()["state"]
+                if state in {"completed", "failed", "canceled"}:
+                    pending.discard(task)
+                    failed += state != "completed"
+            time.sleep(1)
+        assert not pending, f"{len(pending)} imports still running after 30 minutes"
+
+        elapsed = time.monotonic() - start
+        return {"imports": float(len(tasks)), "failed": float(failed), "seconds": elapsed}
+
+    def test_more_workers_reduce_import_wall_clock(self) -> None:
+        """Scaling pulp-worker out should drain the same import backlog faster."""
+        try:
+            results = {f"{n} worker(s)": self._import_batch(n) for n in self.WORKER_COUNTS}
+        finally:
+            _compose(("hub",), "down", check=False)
+        _report(f"pulp-worker scaling ({self.IMPORT_COUNT} collection imports)", results)
+
+        single, scaled = results.values()
+        assert single["failed"] == 0
+        assert scaled["failed"] == 0
+        assert scaled["seconds"] < single["seconds"]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestHubGunicornSweepBenchmark:
+    """Sweep gunicorn worker/thread settings for a Hub service and report throughput.
+
+    ``AAX_BENCH_GUNICORN_MATRIX`` is a comma-separated list of
+    ``workers/threads`` pairs (``auto`` for the CPU-based default).
+    ``AAX_BENCH_GUNICORN_SERVICE`` selects ``pulp-api`` (default) or
+    ``galaxy-ng``.
+    """
+
+    MATRIX = os.getenv("AAX_BENCH_GUNICORN_MATRIX", "auto/1,4/1,2/4")
+    SERVICE = os.getenv("AAX_BENCH_GUNICORN_SERVICE", "pulp-api")
+    TARGETS = {
+        "pulp-api": ("PULP_API", f"{GATEWAY_URL}/pulp/api/v3/status/"),
+        "galaxy-ng": ("GALAXY", f"{GATEWAY_URL}/api/galaxy/"),
+    }
+
+    def _run_setting(self, workers: str, threads: str) -> dict[str, float]:
+        prefix, url = self.TARGETS[self.SERVICE]
+        env = _compose_env(**{
+            f"{prefix}_GUNICORN_WORKERS": "" if workers == "auto" else workers,
+            f"{prefix}_GUNICORN_THREADS": threads,
+            f"{prefix}_GUNICORN_WORKER_CLASS": "gthread" if int(threads) > 1 else "sync",
+        })
+        _compose(("hub",), "up", "-d", "--wait", self.SERVICE, "gateway", env=env, check=False)
+        _wait_for_url(url)
+        return _measure_throughput(lambda s: s.get(url, timeout=30))
+
+    def test_sweep_gunicorn_settings(self) -> None:
+        """Every setting in the matrix should serve requests without errors."""
+        settings = [entry.strip().split("/") for entry in self.MATRIX.split(",") if entry.strip()]
+        try:
+            results = {f"{w}w/{t}t": self._run_setting(w, t) for w, t in settings}
+        finally:
+            _compose(("hub",), "down", check=False)
+        _report(f"{self.SERVICE} gunicorn sweep", results)
+
+        for label, numbers in results.items():
+            assert numbers["requests"] > 0, label
+            assert numbers["errors"] == 0, label
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestHubWorkerStartupBenchmark:
+    """Per-worker boot time of the Hub gunicorn services.
+
+    Every worker logs ``Worker <pid> booted in <seconds>s`` from gunicorn.conf.py
+    once the Django app is loaded; the services are restarted and those lines
+    are collected from the container logs.
+    """
+
+    SERVICES = ("pulp-api", "galaxy-ng")
+    BOOT_LINE = re.compile(r"Worker \d+ booted in ([0-9.]+)s")
+
+    def _boot_times(self, service: str) -> list[float]:
+        logs = _compose(("hub",), "logs", "--no-log-prefix", service, check=False).stdout
+        return [float(value) for value in self.BOOT_LINE.findall(logs)]
+
+    def test_workers_boot_and_report_startup_time(self) -> None:
+        """Every Hub gunicorn worker should finish booting well inside its timeout."""
+        try:
+            _compose(("hub",), "up", "-d", "--wait", *self.SERVICES, "gateway", check=False)
+            _wait_for_url(f"{GATEWAY_URL}/api/galaxy/")
+            _compose(("hub",), "restart", *self.SERVICES, check=False)
+            _wait_for_url(f"{GATEWAY_URL}/api/galaxy/")
+            results = {}
+            for service in self.SERVICES:
+                times = self._boot_times(service)
+                assert times, f"{service}: no worker boot times logged"
+                results[service] = {
+                    "workers": len(times),
+                    "median_ms": statistics.median(times) * 1000,
+                    "max_ms": max(times) * 1000,
+                }
+        finally:
+            _compose(("hub",), "down", check=False)
+        _report("Hub gunicorn worker start-up", results)
+
+        for service, numbers in results.items():
+            assert numbers["max_ms"] < 60_000, service
+
+
+# ---------------------------------------------------------------------------
+# Gateway
+# ---------------------------------------------------------------------------
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestGatewayUpstreamKeepaliveBenchmark:
+    """Compare gateway latency with per-request upstream connections and keepalive pools."""
+
+    PING_URL = f"{GATEWAY_URL}/api/v2/ping/"
+
+    def _run_mode(self, mode: str) -> dict[str, float]:
+        env = _compose_env(GATEWAY_UPSTREAM_MODE=mode)
+        _compose(("controller",), "up", "-d", "--wait", "gateway", env=env, check=False)
+        _wait_for_url(self.PING_URL)
+        return _measure_throughput(lambda s: s.get(self.PING_URL, timeout=30))
+
+    def test_keepalive_upstreams_reduce_latency(self) -> None:
+        """Pooled upstream connections should not be slower than per-request connections."""
+        try:
+            _compose(("controller",), "up", "-d", "--wait", check=False)
+            results = {mode: self._run_mode(mode) for mode in ("dynamic", "keepalive")}
+        finally:
+            _compose(("controller",), "down", check=False)
+        _report("gateway upstream connections (/api/v2/ping/)", results)
+
+        assert results["keepalive"]["errors"] == 0
+        assert results["keepalive"]["p50_ms"] <= results["dynamic"]["p50_ms"] * 1.05
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestGatewayCompressionBenchmark:
+    """Measure gateway gzip savings and HTTP/1.1 vs HTTP/2 page-load latency over TLS.
+
+    Transferred bytes are the raw (still-encoded) body sizes of typical large
+    responses. Page load replays the AWX UI's initial burst of API calls with
+    ``curl --parallel``: one connection per request on HTTP/1.1, multiplexed on HTTP/2.
+    """
+
+    TLS_PORT = os.getenv("GATEWAY_TLS_PORT", "18443")
+    TLS_URL = f"https://localhost:{TLS_PORT}"
+    PAGE_LOAD_PATHS = [
+        "/api/v2/me/", "/api/v2/config/", "/api/v2/dashboard/", "/api/v2/jobs/?page_size=20",
+        "/api/v2/unified_job_templates/", "/api/v2/inventories/", "/api/v2/projects/",
+        "/api/v2/organizations/", "/api/v2/instance_groups/", "/api/v2/execution_environments/",
+        "/api/v2/settings/ui/", "/api/v2/unified_jobs/?page_size=20",
+    ] * 2
+    PAGE_LOADS = 5
+
+    def _wire_bytes(self, url: str, encoding: str) -> int:
+        r = requests.get(
+            url, auth=HTTPBasicAuth(AWX_USER, AWX_PASS), headers={"Accept-Encoding": encoding},
+            stream=True, timeout=60,
+        )
+        r.raise_for_status()
+        return len(r.raw.read(decode_content=False))
+
+    def _page_load_ms(self, http_flag: str) -> float:
+        args = ["curl", "-skf", http_flag, "--parallel", "--parallel-max", "32", "--compressed",
+                "-u", f"{AWX_USER}:{AWX_PASS}"]
+        for path in self.PAGE_LOAD_PATHS:
+            args += [f"{self.TLS_URL}{path}", "-o", "/dev/null"]
+        timings = []
+        for _ in range(self.PAGE_LOADS):
+            start = time.perf_counter()
+            subprocess.run(args, capture_output=True, check=True)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def test_gzip_and_http2_reduce_bytes_and_page_load(self) -> None:
+        """gzip should shrink large JSON/stdout responses; HTTP/2 should not slow page loads."""
+        env = _compose_env(GATEWAY_TLS="on")
+        try:
+            _compose(("controller",), "up", "-d", "--wait", env=env, check=False)
+            _wait_for_url(f"{GATEWAY_URL}/api/v2/ping/")
+            template_id = _ensure_event_flood_template()
+            _run_event_flood(template_id, 2000)
+            job_id = _awx_api("GET", "/api/v2/jobs/", params={"order_by": "-id"}).json()["results"][0]["id"]
+
+            urls = {
+                "jobs list": f"{GATEWAY_URL}/api/v2/jobs/?page_size=200",
+                "job events": f"{GATEWAY_URL}/api/v2/jobs/{job_id}/job_events/?page_size=200",
+                "job stdout": f"{GATEWAY_URL}/api/v2/jobs/{job_id}/stdout/?format=txt",
+            }
+            transferred = {
+                label: {
+                    "identity_kb": self._wire_bytes(url, "identity") / 1024,
+                    "gzip_kb": self._wire_bytes(url, "gzip") / 1024,
+                }
+                for label, url in urls.items()
+            }
+            page_load = {
+                "http/1.1": {"page_load_ms": self._page_load_ms("--http1.1")},
+                "http/2": {"page_load_ms": self._page_load_ms("--http2")},
+            }
+        finally:
+            _compose(("controller",), "down", check=False)
+        _report("gateway gzip (transferred KiB)", transferred)
+        _report(f"gateway TLS page load ({len(self.PAGE_LOAD_PATHS)} API calls)", page_load)
+
+        for label, sizes in transferred.items():
+            assert sizes["gzip_kb"] <= sizes["identity_kb"] * 0.5, label
+        assert page_load["http/2"]["page_load_ms"] <= page_load["http/1.1"]["page_load_ms"] * 1.1
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestGatewayStreamingUploadBenchmark:
+    """Upload a 1 GiB artifact through the gateway and sample its memory and disk.
+
+    The Pulp upload routes use ``proxy_request_buffering off``, so the body should
+    never be spooled to ``client_temp`` and gateway memory should stay flat.
+    """
+
+    UPLOAD_MB = int(os.getenv("AAX_BENCH_UPLOAD_MB", "1024"))
+    AUTH = ("admin", "benchmark-hub-admin-pw")  # pragma: allowlist secret
+    UNITS = {"B": 1, "KiB": 1024, "MiB": 1024**2, "GiB": 1024**3}
+
+    def _gateway_memory_mb(self) -> float:
+        usage = subprocess.run(
+            ["docker", "stats", "--no-stream", "--format", "{{.MemUsage}}", "aax-gateway"],
+            capture_output=True, text=True, check=True,
+        ).stdout.split("/")[0].strip()
+        value, unit = re.match(r"([0-9.]+)\s*([A-Za-z]+)", usage).groups()
+        return float(value) * self.UNITS.get(unit, 1) / 1024**2
+
+    def _client_temp_mb(self) -> float:
+        result = subprocess.run(
+            ["docker", "exec", "aax-gateway", "du", "-sk", "/var/cache/nginx/client_temp"],
+            capture_output=True, text=True, check=False,
+        )
+        return int(result.stdout.split()[0]) / 1024 if result.returncode == 0 else 0.0
+
+    def test_large_upload_keeps_gateway_memory_and_disk_flat(self, tmp_path) -> None:
+        """Peak client_temp usage and memory growth should be a tiny fraction of the upload."""
+        payload = tmp_path / "upload.bin"
+        with open(payload, "wb") as fh:
+            fh.truncate(self.UPLOAD_MB * 1024**2)
+
+        try:
+            _compose(("hub",), "up", "-d", "--wait", check=False)
+            _wait_for_url(f"{GATEWAY_URL}/api/galaxy/")
+            baseline_mb = self._gateway_memory_mb()
+            samples: list[tuple[float, float]] = []
+            done = threading.Event()
+
+            def sample() -> None:
+                while not done.is_set():
+                    samples.append((self._gateway_memory_mb(), self._client_temp_mb()))
+                    time.sleep(0.5)
+
+            sampler = threading.Thread(target=sample, daemon=True)
+            sampler.start()
+            start = time.monotonic()
+            upload = subprocess.run(
+                ["curl", "-sS", "-o", "/dev/null", "-w", "%{http_code}",
+                 "-u", ":".join(self.AUTH), "-F", f"file=@{payload}",
+                 f"{GATEWAY_URL}/pulp/api/v3/artifacts/"],
+                capture_output=True, text=True, check=False,
+            )
+            elapsed = time.monotonic() - start
+            done.set()
+            sampler.join()
+        finally:
+            _compose(("hub",), "down", check=False)
+
+        # 400 means Pulp already holds an artifact with this digest from an earlier run;
+        # the whole body still streamed through the gateway.
+        assert upload.stdout in {"201", "400"}, f"Upload failed: {upload.stdout} {upload.stderr}"
+        peak_memory = max(mem for mem, _ in samples)
+        peak_disk = max(disk for _, disk in samples)
+        _report(f"gateway streaming upload ({self.UPLOAD_MB} MiB)", {
+            "gateway": {
+                "baseline_mem_mb": baseline_mb,
+                "peak_mem_mb": peak_memory,
+                "peak_client_temp_mb": peak_disk,
+                "seconds": elapsed,
+                "mb_per_sec": self.UPLOAD_MB / elapsed,
+            },
+        })
+
+        assert peak_disk < 64
+        assert peak_memory - baseline_mb < 128
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestGatewayRateLimitBenchmark:
+    """Flood the gateway from one client and probe awx-web directly for latency.
+
+    With ``GATEWAY_RATE_LIMIT=on`` the flood is cut down to the per-client rate and
+    burst, so the backend's latency for everyone else should stay close to idle.
+    """
+
+    FLOOD_URL = f"{GATEWAY_URL}/api/v2/job_templates/?page_size=200"
+    FLOOD_CONCURRENCY = BENCH_CONCURRENCY * 4
+    PROBE_URL = f"{AWX_URL}/api/v2/ping/"
+
+    def _flood(self, mode: str) -> dict[str, float]:
+        env = _compose_env(GATEWAY_RATE_LIMIT=mode)
+        _compose(("controller",), "up", "-d", "--wait", "gateway", env=env, check=False)
+        _wait_for_url(f"{GATEWAY_URL}/api/v2/ping/")
+
+        statuses: dict[int, int] = {}
+        retry_after_missing = 0
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def abuser() -> None:
+            nonlocal retry_after_missing
+            session = requests.Session()
+            session.auth = HTTPBasicAuth(AWX_USER, AWX_PASS)
+            while not stop.is_set():
+                try:
+                    r = session.get(self.FLOOD_URL, timeout=60)
+                except requests.RequestException:
+                    continue
+                with lock:
+                    statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+                    if r.status_code == 429 and "Retry-After" not in r.headers:
+                        retry_after_missing += 1
+
+        threads = [threading.Thread(target=abuser) for _ in range(self.FLOOD_CONCURRENCY)]
+        for thread in threads:
+            thread.start()
+        try:
+            probe = _measure_throughput(lambda s: s.get(self.PROBE_URL, timeout=30), concurrency=1)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        return {
+            "flood_ok": float(statuses.get(200, 0)),
+            "flood_429": float(statuses.get(429, 0)),
+            "retry_after_missing": float(retry_after_missing),
+            "probe_p50_ms": probe["p50_ms"],
+            "probe_p99_ms": probe["p99_ms"],
+        }
+
+    def test_rate_limit_bounds_backend_latency_under_abuse(self) -> None:
+        """Throttled floods should get 429 + Retry-After and leave backend p99 bounded."""
+        try:
+            _compose(("controller",), "up", "-d", "--wait", check=False)
+            _wait_for_url(self.PROBE_URL)
+            idle = _measure_throughput(lambda s: s.get(self.PROBE_URL, timeout=30), concurrency=1)
+            results = {"idle": {"probe_p50_ms": idle["p50_ms"], "probe_p99_ms": idle["p99_ms"]}}
+            results.update({mode: self._flood(mode) for mode in ("off", "on")})
+        finally:
+            _compose(("controller",), "down", check=False)
+        _report(f"gateway rate limiting ({self.FLOOD_CONCURRENCY} flooding threads)", results)
+
+        limited = results["on"]
+        assert results["off"]["flood_429"] == 0
+        assert limited["flood_429"] > limited["flood_ok"]
+        assert limited["retry_after_missing"] == 0
+        assert limited["probe_p99_ms"] <= max(idle["p99_ms"] * 3, idle["p99_ms"] + 50)
+        assert limited["probe_p99_ms"] < results["off"]["probe_p99_ms"]
+
+
+# ---------------------------------------------------------------------------
+# Controller
+# ---------------------------------------------------------------------------
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestControllerConnectionPoolingBenchmark:
+    """Compare job-event ingestion with per-request and persistent DB connections."""
+
+    EVENT_COUNT = int(os.getenv("AAX_BENCH_EVENTS", "5000"))
+
+    def _run_mode(self, mode: str) -> dict[str, float]:
+        env = _compose_env(AWX_DB_CONN_MODE=mode)
+        _compose(("controller",), "up", "-d", "--wait", env=env, check=False)
+        _wait_for_url(f"{AWX_URL}/api/v2/ping/")
+        return _run_event_flood(_ensure_event_flood_template(), self.EVENT_COUNT)
+
+    def test_persistent_connections_do_not_reduce_event_ingestion(self) -> None:
+        """Persistent connections should ingest job events at least as fast as direct."""
+        try:
+            results = {mode: self._run_mode(mode) for mode in ("direct", "persistent")}
+        finally:
+            _compose(("controller",), "down", check=False)
+        _report("awx-postgres connection reuse (job event ingestion)", results)
+
+        assert results["direct"]["events"] >= self.EVENT_COUNT
+        assert results["persistent"]["events"] >= self.EVENT_COUNT
+        assert results["persistent"]["events_per_s"] >= results["direct"]["events_per_s"] * 0.95
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestControllerTaskBootstrapBenchmark:
+    """Time the single-process awx-task bootstrap on a first start and a restart.
+
+    The bootstrap logs ``aax-bootstrap: done in <s>s (<n> applied, <m> already
+    applied)``; a restart should find every step already applied.
+    """
+
+    DONE_LINE = re.compile(r"aax-bootstrap: done in ([0-9.]+)s \((\d+) applied, (\d+) already applied\)")
+
+    def _wait_for_bootstrap(self, runs: int, timeout: int = STACK_READY_TIMEOUT) -> dict[str, float]:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            logs = _compose(("controller",), "logs", "--no-log-prefix", "awx-task", check=False).stdout
+            matches = self.DONE_LINE.findall(logs)
+            if len(matches) >= runs:
+                seconds, applied, skipped = matches[runs - 1]
+                return {"seconds": float(seconds), "applied": int(applied), "skipped": int(skipped)}
+            time.sleep(5)
+        raise TimeoutError(f"awx-task bootstrap run {runs} did not finish within {timeout}s")
+
+    def test_restart_skips_applied_bootstrap_steps(self) -> None:
+        """A restart should re-check every step without re-applying any of them."""
+        try:
+            _compose(("controller",), "up", "-d", "awx-task", check=False)
+            results = {"first start": self._wait_for_bootstrap(1)}
+            _compose(("controller",), "restart", "awx-task", check=False)
+            results["restart"] = self._wait_for_bootstrap(2)
+        finally:
+            _compose(("controller",), "down", check=False)
+        _report("awx-task bootstrap", results)
+
+        assert results["restart"]["applied"] == 0
+        assert results["restart"]["skipped"] == results["first start"]["applied"] + results["first start"]["skipped"]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestControllerPatchedImageColdStartBenchmark:
+    """Compare awx-task source preparation: runtime rewrite vs build-time patches.
+
+    Each run starts a fresh container. It prepares the sources the way the
+    entrypoint does, either by rewriting them and unlinking their ``.pyc`` files
+    or by checking the build manifest. It then loads the code of every patched
+    module, as the first import in each web or task process does.
+    """
+
+    UPSTREAM_IMAGE = os.getenv("AAX_BENCH_AWX_UPSTREAM_IMAGE", "quay.io/ansible/awx:24.6.1")
+    PATCHED_IMAGE = "aax/awx-controller:bench"
+    PYTHON = "/var/lib/awx/venv/awx/bin/python3"
+    RUNS = int(os.getenv("AAX_BENCH_COLD_START_RUNS", "5"))
+
+    LOAD = (
+        "import importlib.machinery, importlib.util, json, subprocess, sys, time\n"
+        "from pathlib import Path\n"
+        "start = time.perf_counter()\n"
+        "{prepare}\n"
+        "for name in ('awx.main.tasks.jobs', 'awx.main.tasks.receptor', 'ansible_runner.interface'):\n"
+        "    top, *rest = name.split('.')\n"
+        "    base = Path(list(importlib.util.find_spec(top).submodule_search_locations)[0])\n"
+        "    path = base.joinpath(*rest).with_suffix('.py')\n"
+        "    importlib.machinery.SourceFileLoader(name, str(path)).get_code(name)\n"
+        "print(json.dumps(time.perf_counter() - start))\n"
+    )
+    RUNTIME_REWRITE = (
+        "spec = importlib.util.spec_from_file_location('apply_patches', '/aax/apply-patches.py')\n"
+        "patches = importlib.util.module_from_spec(spec)\n"
+        "spec.loader.exec_module(patches)\n"
+        "for package, relative, anchor, replacement in patches.PATCHES:\n"
+        "    path = patches.package_dir(package) / relative\n"
+        "    patches.apply(path, anchor, replacement)\n"
+        "    for pyc in (path.parent / '__pycache__').glob(path.stem + '*.pyc'):\n"
+        "        pyc.unlink()"
+    )
+    MANIFEST_CHECK = (
+        "subprocess.run(['sha256sum', '--check', '--quiet', '/etc/aax/awx-patches.sha256'], check=True)"
+    )
+
+    def _run(self, image: str, prepare: str) -> float:
+        result = subprocess.run(
+            [
+                "docker", "run", "--rm", "--user", "0", "--network", "none",
+                "-v", f"{REPO_ROOT / 'images/awx'}:/aax:ro",
+                "--entrypoint", self.PYTHON, image,
+                "-c", self.LOAD.format(prepare=prepare),
+            ],
+            capture_output=True, text=True, check=True,
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_build_time_patches_start_faster(self) -> None:
+        """Checking the manifest should beat rewriting sources and recompiling them cold."""
+        subprocess.run(["docker", "pull", "-q", self.UPSTREAM_IMAGE], capture_output=True, check=True)
+        subprocess.run(
+            [
+                "docker", "build", "-q",
+                "--build-arg", f"AWX_BASE_IMAGE={self.UPSTREAM_IMAGE}",
+                "-f", str(REPO_ROOT / "images/awx/Dockerfile.controller"),
+                "-t", self.PATCHED_IMAGE,
+                str(REPO_ROOT / "images/awx"),
+            ],
+            capture_output=True, text=True, check=True,
+        )
+        modes = {
+            "runtime": (self.UPSTREAM_IMAGE, self.RUNTIME_REWRITE),
+            "build-time": (self.PATCHED_IMAGE, self.MANIFEST_CHECK),
+        }
+        results = {}
+        for label, (image, prepare) in modes.items():
+            timings = [self._run(image, prepare) for _ in range(self.RUNS)]
+            results[label] = {
+                "median_ms": statistics.median(timings) * 1000,
+                "max_ms": max(timings) * 1000,
+            }
+        _report("awx-task source preparation + first load of patched modules", results)
+
+        assert results["build-time"]["median_ms"] <= results["runtime"]["median_ms"]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestControllerCallbackReceiverBenchmark:
+    """Compare job-event ingestion with the default and a throughput callback-receiver setup.
+
+    Events/sec counts the events stored in awx-postgres once AWX reports
+    ``event_processing_finished`` for the flood job.
+    """
+
+    EVENT_COUNT = int(os.getenv("AAX_BENCH_EVENTS", "5000"))
+    MODES = {
+        "default": {},
+        "throughput": {
+            "AWX_CALLBACK_RECEIVER_REPLICAS": os.getenv("AAX_BENCH_CALLBACK_REPLICAS", "2"),
+            "AWX_JOB_EVENT_WORKERS": os.getenv("AAX_BENCH_JOB_EVENT_WORKERS", "8"),
+            "AWX_JOB_EVENT_BUFFER_SECONDS": os.getenv("AAX_BENCH_JOB_EVENT_BUFFER_SECONDS", "2"),
+        },
+    }
+
+    def _run_mode(self, overrides: dict[str, str]) -> dict[str, float]:
+        env = _compose_env(**overrides)
+        _compose(("controller",), "up", "-d", "--wait", env=env, check=False)
+        _wait_for_url(f"{AWX_URL}/api/v2/ping/")
+        return _run_event_flood(_ensure_event_flood_template(), self.EVENT_COUNT)
+
+    def test_throughput_mode_ingests_events_faster(self) -> None:
+        """More receivers and workers should not ingest job events more slowly."""
+        try:
+            results = {label: self._run_mode(overrides) for label, overrides in self.MODES.items()}
+        finally:
+            _compose(("controller",), "down", check=False)
+        _report("awx-callback-receiver (job event ingestion)", results)
+
+        assert results["default"]["events"] >= self.EVENT_COUNT
+        assert results["throughput"]["events"] >= self.EVENT_COUNT
+        assert results["throughput"]["events_per_s"] >= results["default"]["events_per_s"] * 0.95
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestControllerEventMaintenanceBenchmark:
+    """Watch stdout latency for a fixed job while the job-event tables grow.
+
+    One probe job is flooded first. Each round adds more flood jobs, then times
+    the probe's ``/stdout/`` endpoint. A final one-shot ``awx-db-maintenance`` run
+    with zero retention drops the closed event partitions and reports what it reclaimed.
+    """
+
+    EVENT_COUNT = int(os.getenv("AAX_BENCH_EVENTS", "5000"))
+    ROUNDS = int(os.getenv("AAX_BENCH_EVENT_ROUNDS", "4"))
+    JOBS_PER_ROUND = int(os.getenv("AAX_BENCH_EVENT_JOBS_PER_ROUND", "3"))
+    SAMPLES = 10
+
+    def _stdout_latency_ms(self, job_id: int) -> float:
+        timings = []
+        for _ in range(self.SAMPLES):
+            start = time.perf_counter()
+            r = _awx_api("GET", f"/api/v2/jobs/{job_id}/stdout/", params={"format": "txt"})
+            timings.append((time.perf_counter() - start) * 1000)
+            r.raise_for_status()
+        return statistics.median(timings)
+
+    def test_stdout_latency_stays_flat_as_events_grow(self) -> None:
+        """Stdout for one job must not slow down as other jobs' events accumulate."""
+        env = _compose_env()
+        results: dict[str, dict[str, float]] = {}
+        try:
+            _compose(("controller",), "up", "-d", "--wait", env=env, check=False)
+            _wait_for_url(f"{AWX_URL}/api/v2/ping/")
+            template_id = _ensure_event_flood_template()
+            _run_event_flood(template_id, self.EVENT_COUNT)
+            jobs = _awx_api("GET", "/api/v2/jobs/", params={"order_by": "-id", "page_size": 1})
+            probe_job = jobs.json()["results"][0]["id"]
+
+            total = self.EVENT_COUNT
+            for round_no in range(self.ROUNDS):
+                if round_no:
+                    for _ in range(self.JOBS_PER_ROUND):
+                        total += int(_run_event_flood(template_id, self.EVENT_COUNT)["events"])
+                results[f"round {round_no}"] = {
+                    "events": float(total),
+                    "stdout_ms": self._stdout_latency_ms(probe_job),
+                }
+
+            prune = _compose(
+                ("controller",), "run", "--rm",
+                "-e", "AWX_DB_MAINTENANCE_INTERVAL=0", "-e", "JOB_EVENT_RETENTION_DAYS=0",
+                "awx-db-maintenance", env=env, check=False,
+            )
+        finally:
+            _compose(("controller",), "down", check=False)
+        _report("awx job stdout latency vs. event volume", results)
+        print(prune.stdout)
+
+        first, last = results["round 0"], results[f"round {self.ROUNDS - 1}"]
+        assert last["events"] > first["events"]
+        assert last["stdout_ms"] <= first["stdout_ms"] * 1.5 + 20
+        assert prune.returncode == 0, prune.stderr
+        assert "aax-db-maintenance: dropped" in prune.stdout
+
+
+# ---------------------------------------------------------------------------
+# Databases
+# ---------------------------------------------------------------------------
+
+# pgbench workload per database role: AWX appends job events, Hub reads artifact
+# metadata, EDA runs a small mixed OLTP load.
+AWX_EVENT_INSERT_SQL = (
+    "\\set job random(1, 1000)\n"
+    "INSERT INTO bench_jobevent (job_id, created, event_data, stdout) "
+    "VALUES (:job, now(), '{\"event\": \"runner_on_ok\", \"task\": \"bench\"}', repeat('x', 512));\n"
+)
+POSTGRES_ROLES: dict[str, dict[str, Any]] = {
+    "awx": {
+        "profile": "controller", "service": "awx-postgres", "container": "awx-postgres",
+        "image": "postgres:15", "user": "awx", "shm_size": "1g",
+        "setup": "CREATE TABLE bench_jobevent (id bigserial PRIMARY KEY, job_id int, "
+                 "created timestamptz, event_data jsonb, stdout text); "
+                 "CREATE INDEX ON bench_jobevent (job_id, created);",
+        "pgbench": ["-f", "/tmp/bench.sql"], "script": AWX_EVENT_INSERT_SQL,
+    },
+    "hub": {
+        "profile": "hub", "service": "hub-postgres", "container": "aax-hub-postgres",
+        "image": "postgres:16-alpine", "user": "galaxy", "shm_size": "1g",
+        "init_scale": "50", "pgbench": ["-b", "select-only"],
+    },
+    "eda": {
+        "profile": "eda", "service": "eda-postgres", "container": "eda-postgres",
+        "image": "postgres:15", "user": "eda", "shm_size": "256m",
+        "init_scale": "5", "pgbench": ["-b", "tpcb-like"], "clients": "4",
+    },
+}
+
+
+def _psql(container: str, user: str, sql: str, database: str = "postgres") -> str:
+    return subprocess.run(
+        ["docker", "exec", container, "psql", "-U", user, "-d", database, "-qAtc", sql],
+        capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+
+def _pgbench(container: str, role: dict[str, Any]) -> dict[str, float]:
+    """Run the role's pgbench workload in a scratch database and return its TPS."""
+    user = role["user"]
+    _psql(container, user, "DROP DATABASE IF EXISTS aax_bench")
+    _psql(container, user, "CREATE DATABASE aax_bench")
+    if "setup" in role:
+        _psql(container, user, role["setup"], database="aax_bench")
+    else:
+        subprocess.run(
+            ["docker", "exec", container, "pgbench", "-U", user, "-i", "-q", "-s", role["init_scale"], "aax_bench"],
+            capture_output=True, text=True, check=True,
+        )
+    if "script" in role:
+        subprocess.run(
+            ["docker", "exec", "-i", container, "sh", "-c", "cat > /tmp/bench.sql"],
+            input=role["script"], text=True, capture_output=True, check=True,
+        )
+    clients = role.get("clients", str(BENCH_CONCURRENCY))
+    result = subprocess.run(
+        ["docker", "exec", container, "pgbench", "-U", user, "-n", "-c", clients, "-j", clients,
+         "-T", str(int(BENCH_SECONDS)), *role["pgbench"], "aax_bench"],
+        capture_output=True, text=True, check=True,
+    )
+    match = re.search(r"tps = ([0-9.]+)", result.stdout)
+    assert match, result.stdout
+    _psql(container, user, "DROP DATABASE aax_bench")
+    return {"tps": float(match.group(1))}
+
+
+def _wait_for_postgres(container: str, user: str, timeout: int = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        ready = subprocess.run(
+            ["docker", "exec", container, "pg_isready", "-U", user], capture_output=True,
+        )
+        if ready.returncode == 0:
+            return
+        time.sleep(2)
+    raise TimeoutError(f"{container} did not accept connections within {timeout}s")
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestPostgresProfileBenchmark:
+    """Compare each database role's pgbench workload on stock defaults and its tuned profile.
+
+    The stock run uses a throwaway container of the same image with no ``-c`` settings.
+    The tuned run starts the Compose service with ``AAX_BENCH_POSTGRES_PROFILE``.
+    """
+
+    PROFILE = os.getenv("AAX_BENCH_POSTGRES_PROFILE", "small")
+
+    def _run_stock(self, name: str, role: dict[str, Any]) -> dict[str, float]:
+        container = f"aax-bench-stock-{name}-postgres"
+        subprocess.run(
+            ["docker", "run", "-d", "--rm", "--name", container, "--shm-size", role["shm_size"],
+             "-e", f"POSTGRES_USER={role['user']}",
+             "-e", "POSTGRES_PASSWORD=benchmark-stock-pw",  # pragma: allowlist secret
+             role["image"]],
+            capture_output=True, text=True, check=True,
+        )
+        try:
+            _wait_for_postgres(container, role["user"])
+            return _pgbench(container, role)
+        finally:
+            subprocess.run(["docker", "rm", "-f", container], capture_output=True)
+
+    def _run_tuned(self, name: str, role: dict[str, Any]) -> dict[str, float]:
+        env = _compose_env(**{f"{name.upper()}_POSTGRES_PROFILE": self.PROFILE})
+        _compose((role["profile"],), "up", "-d", "--wait", role["service"], env=env, check=False)
+        _wait_for_postgres(role["container"], role["user"])
+        # pg_stat_statements must be preloaded for the extension to be usable.
+        _psql(role["container"], role["user"], "CREATE EXTENSION IF NOT EXISTS pg_stat_statements")
+        assert _psql(role["container"], role["user"], "SELECT count(*) >= 0 FROM pg_stat_statements") == "t"
+        return _pgbench(role["container"], role)
+
+    @pytest.mark.parametrize("name", sorted(POSTGRES_ROLES))
+    def test_profile_is_not_slower_than_stock(self, name: str) -> None:
+        """The tuned profile should handle the role's workload at least as fast as stock."""
+        role = POSTGRES_ROLES[name]
+        try:
+            results = {"stock": self._run_stock(name, role), self.PROFILE: self._run_tuned(name, role)}
+        finally:
+            _compose((role["profile"],), "down", check=False)
+        _report(f"{role['service']} pgbench ({' '.join(role['pgbench'])})", results)
+
+        assert results["stock"]["tps"] > 0
+        assert results[self.PROFILE]["tps"] >= results["stock"]["tps"] * 0.95
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestRedisProfileBenchmark:
+    """Compare awx-redis job-event queue latency under different persistence settings.
+
+    ``redis-benchmark`` pushes and pops 1 KiB payloads, which is roughly one
+    serialized job event. That mirrors the runner -> callback-receiver queue.
+    """
+
+    REQUESTS = int(os.getenv("AAX_BENCH_REDIS_REQUESTS", "200000"))
+    PROFILES = {
+        "aof-always": {"AWX_REDIS_APPENDONLY": "yes", "AWX_REDIS_APPENDFSYNC": "always"},
+        "aof-everysec": {"AWX_REDIS_APPENDONLY": "yes", "AWX_REDIS_APPENDFSYNC": "everysec"},
+        "rdb": {},
+    }
+
+    def _run_profile(self, overrides: dict[str, str]) -> dict[str, float]:
+        env = _compose_env(**overrides)
+        _compose(("controller",), "up", "-d", "--wait", "awx-redis", env=env, check=False)
+        policy = subprocess.run(
+            ["docker", "exec", "awx-redis", "redis-cli", "CONFIG", "GET", "maxmemory-policy"],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        assert policy == ["maxmemory-policy", "volatile-lru"]
+        result = subprocess.run(
+            ["docker", "exec", "awx-redis", "redis-benchmark", "-t", "rpush,lpop", "-d", "1024",
+             "-c", str(BENCH_CONCURRENCY), "-n", str(self.REQUESTS), "--csv"],
+            capture_output=True, text=True, check=True,
+        )
+        rows = {row["test"]: row for row in csv.DictReader(io.StringIO(result.stdout))}
+        push, pop = rows["RPUSH"], rows["LPOP"]
+        return {
+            "push_rps": float(push["rps"]),
+            "push_p50_ms": float(push["p50_latency_ms"]),
+            "push_p99_ms": float(push["p99_latency_ms"]),
+            "pop_p99_ms": float(pop["p99_latency_ms"]),
+        }
+
+    def test_rdb_profile_keeps_event_queue_latency_low(self) -> None:
+        """Dropping per-write AOF fsync should not make queue pushes slower."""
+        try:
+            results = {label: self._run_profile(overrides) for label, overrides in self.PROFILES.items()}
+        finally:
+            _compose(("controller",), "down", check=False)
+        _report("awx-redis job-event queue (RPUSH/LPOP 1 KiB)", results)
+
+        assert results["rdb"]["push_p99_ms"] <= results["aof-always"]["push_p99_ms"]
+        assert results["rdb"]["push_rps"] >= results["aof-everysec"]["push_rps"] * 0.95
+
+
+# ---------------------------------------------------------------------------
+# EDA
+# ---------------------------------------------------------------------------
+
+EDA_API = f"{GATEWAY_URL}/eda/api/v1"
+EDA_HEADERS = {"Authorization": f"Bearer {EDA_TOKEN}"}
+EDA_BENCH_RULEBOOK = """
+- name: AAX benchmark
+  hosts: all
+  sources:
+    - aax_events: {}
+  rules:
+    - name: Echo sequence
+      condition: event.seq is defined
+      action:
+        debug:
+          msg: "aax-bench {{ event.seq }}"
+"""
+
+
+def _eda_activation(name: str) -> None:
+    requests.delete(f"{EDA_API}/activations/{name}", headers=EDA_HEADERS, timeout=60)
+    r = requests.post(
+        f"{EDA_API}/activations", headers=EDA_HEADERS, timeout=60,
+        json={"name": name, "rulebook": EDA_BENCH_RULEBOOK},
+    )
+    assert r.status_code == 201, f"Activation create failed: {r.status_code} {r.text}"
+
+
+def _eda_event_latency_ms(name: str, seq: int, timeout: float = 300) -> float:
+    """Post one event and return the manager-clocked time until its action ran."""
+    r = requests.post(f"{EDA_API}/activations/{name}/events", headers=EDA_HEADERS, json={"seq": seq}, timeout=30)
+    assert r.status_code == 202, f"Event post failed: {r.status_code} {r.text}"
+    accepted_at = r.json()["accepted_at"]
+    marker = f"aax-bench {seq}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        lines = requests.get(f"{EDA_API}/activations/{name}/output", headers=EDA_HEADERS, timeout=30).json()["results"]
+        for line in lines:
+            if marker in line["line"]:
+                return (line["time"] - accepted_at) * 1000
+        time.sleep(0.01)
+    raise AssertionError(f"{name}: no action for event {seq} within {timeout}s")
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestEDAActivationLatencyBenchmark:
+    """Event-to-action latency with a cold engine vs a resident (warm) one.
+
+    Cold: the activation is created and the event posted straight away, so the
+    latency includes the ansible-rulebook JVM start and rulebook load, as with
+    ``docker exec ... ansible-rulebook``. Warm: events go to an engine that is
+    already running under the activation manager.
+    """
+
+    COLD_RUNS = int(os.getenv("AAX_BENCH_EDA_COLD_RUNS", "3"))
+    WARM_EVENTS = int(os.getenv("AAX_BENCH_EDA_WARM_EVENTS", "50"))
+
+    @staticmethod
+    def _summary(latencies: list[float]) -> dict[str, float]:
+        ordered = sorted(latencies)
+        return {
+            "events": float(len(ordered)),
+            "p50_ms": statistics.median(ordered),
+            "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        }
+
+    def test_resident_engines_cut_event_to_action_latency(self) -> None:
+        """Warm engines should act on events far sooner than a cold engine start."""
+        try:
+            _compose(("eda",), "up", "-d", "--wait", check=False)
+            _wait_for_url(f"{GATEWAY_URL}/eda/health")
+
+            cold = []
+            for run in range(self.COLD_RUNS):
+                name = f"bench-cold-{run}"
+                _eda_activation(name)
+                cold.append(_eda_event_latency_ms(name, 0))
+                requests.delete(f"{EDA_API}/activations/{name}", headers=EDA_HEADERS, timeout=60)
+
+            _eda_activation("bench-warm")
+            _eda_event_latency_ms("bench-warm", 0)  # engine start, not measured
+            warm = [_eda_event_latency_ms("bench-warm", seq) for seq in range(1, self.WARM_EVENTS + 1)]
+            requests.delete(f"{EDA_API}/activations/bench-warm", headers=EDA_HEADERS, timeout=60)
+        finally:
+            _compose(("eda",), "down", check=False)
+        results = {"cold": self._summary(cold), "warm": self._summary(warm)}
+        _report("EDA event-to-action latency", results)
+
+        assert results["warm"]["p50_ms"] * 5 < results["cold"]["p50_ms"]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestEDAJvmStartupBenchmark:
+    """Time to first rule match and memory per activation for JVM settings.
+
+    ``ACTIVATIONS`` engines are started side by side under each profile. The
+    first-match time runs from the engine process start to the action output
+    of an event posted right after the activation was created. ``rss_mb`` and
+    ``pss_mb`` come from ``/proc/<pid>/smaps_rollup`` of each engine; PSS splits
+    pages shared between engines, such as the AppCDS archive.
+    """
+
+    ACTIVATIONS = int(os.getenv("AAX_BENCH_EDA_ACTIVATIONS", "3"))
+    PROFILES = {
+        "stock": {"EDA_JVM_CDS": "off", "EDA_JVM_GC_PROFILE": "auto", "EDA_JVM_OPTIONS": "-Xmx512m"},
+        "tuned": {},
+        "tuned-g1": {"EDA_JVM_GC_PROFILE": "g1"},
+    }
+
+    @staticmethod
+    def _first_match_ms(name: str, timeout: float = 300) -> float:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            activation = requests.get(f"{EDA_API}/activations/{name}", headers=EDA_HEADERS, timeout=30).json()
+            lines = requests.get(f"{EDA_API}/activations/{name}/output", headers=EDA_HEADERS, timeout=30).json()["results"]
+            for line in lines:
+                if "aax-bench 0" in line["line"]:
+                    return (line["time"] - activation["engine"]["started_at"]) * 1000
+            time.sleep(0.01)
+        raise AssertionError(f"{name}: no rule match within {timeout}s")
+
+    @staticmethod
+    def _memory_mb(name: str) -> tuple[float, float]:
+        pid = requests.get(f"{EDA_API}/activations/{name}", headers=EDA_HEADERS, timeout=30).json()["engine"]["pid"]
+        rollup = subprocess.run(
+            ["docker", "exec", "eda-controller", "cat", f"/proc/{pid}/smaps_rollup"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        fields = {line.split(":")[0]: int(line.split()[1]) for line in rollup.splitlines()[1:]}
+        return fields["Rss"] / 1024, fields["Pss"] / 1024
+
+    def _run_profile(self, overrides: dict[str, str]) -> dict[str, float]:
+        env = _compose_env(EDA_MAX_ACTIVATIONS=str(self.ACTIVATIONS), **overrides)
+        _compose(("eda",), "up", "-d", "--wait", env=env, check=False)
+        _wait_for_url(f"{GATEWAY_URL}/eda/health")
+        names = [f"bench-jvm-{n}" for n in range(self.ACTIVATIONS)]
+        try:
+            for name in names:
+                _eda_activation(name)
+                r = requests.post(f"{EDA_API}/activations/{name}/events", headers=EDA_HEADERS, json={"seq": 0}, timeout=30)
+                assert r.status_code == 202, f"Event post failed: {r.status_code} {r.text}"
+            first_match = sorted(self._first_match_ms(name) for name in names)
+            memory = [self._memory_mb(name) for name in names]
+        finally:
+            for name in names:
+                requests.delete(f"{EDA_API}/activations/{name}", headers=EDA_HEADERS, timeout=60)
+        return {
+            "first_match_p50_ms": statistics.median(first_match),
+            "first_match_max_ms": first_match[-1],
+            "rss_mb": statistics.mean(rss for rss, _ in memory),
+            "pss_mb": statistics.mean(pss for _, pss in memory),
+        }
+
+    def test_tuned_jvm_matches_sooner_with_less_memory(self) -> None:
+        """AppCDS and container-relative heap sizing should not slow engines or grow them."""
+        try:
+            results = {label: self._run_profile(overrides) for label, overrides in self.PROFILES.items()}
+        finally:
+            _compose(("eda",), "down", check=False)
+        _report(f"EDA engine JVM startup ({self.ACTIVATIONS} activations)", results)
+
+        assert results["tuned"]["first_match_p50_ms"] < results["stock"]["first_match_p50_ms"]
+        assert results["tuned"]["pss_mb"] <= results["stock"]["pss_mb"]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestEDAIngestionBenchmark:
+    """Load-generate the shared EDA ingestion endpoint with single and batched events.
+
+    Each run posts to ``/eda/api/v1/events`` from ``BENCH_CONCURRENCY`` threads for
+    ``BENCH_SECONDS``, then waits for the backlog to drain into a running
+    activation. ``accepted_eps`` is the front-door rate; ``sustained_eps`` includes
+    the drain, so it is the end-to-end rate the rulebook keeps up with.
+    """
+
+    BATCH_SIZES = tuple(int(n) for n in os.getenv("AAX_BENCH_EDA_BATCHES", "1,100").split(","))
+    RULEBOOK = EDA_BENCH_RULEBOOK.replace(
+        'debug:\n          msg: "aax-bench {{ event.seq }}"', "none: {}",
+    )
+
+    def _run_batch(self, batch: int) -> dict[str, float]:
+        payload = [{"seq": seq} for seq in range(batch)] if batch > 1 else {"seq": 0}
+        statuses: dict[int, int] = {}
+        lock = threading.Lock()
+
+        def post(session: requests.Session) -> requests.Response:
+            r = session.post(f"{EDA_API}/events", headers=EDA_HEADERS, json=payload, timeout=30)
+            with lock:
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+            return r
+
+        start = time.monotonic()
+        load = _measure_throughput(post)
+        deadline = time.monotonic() + 600
+        while requests.get(f"{GATEWAY_URL}/eda/health", timeout=30).json()["ingest_backlog"]:
+            assert time.monotonic() < deadline, "ingestion backlog did not drain within 10 minutes"
+            time.sleep(0.5)
+        elapsed = time.monotonic() - start
+
+        accepted = statuses.get(202, 0) * batch
+        return {
+            "accepted_eps": accepted / BENCH_SECONDS,
+            "sustained_eps": accepted / elapsed,
+            "p50_ms": load["p50_ms"],
+            "p99_ms": load["p99_ms"],
+            "throttled_429": float(statuses.get(429, 0)),
+            "errors": load["errors"],
+        }
+
+    def test_batched_ingestion_sustains_higher_event_rate(self) -> None:
+        """Batching should raise events/sec; overload must surface as 429, never 5xx."""
+        try:
+            _compose(("eda",), "up", "-d", "--wait", check=False)
+            _wait_for_url(f"{GATEWAY_URL}/eda/health")
+            requests.delete(f"{EDA_API}/activations/bench-ingest", headers=EDA_HEADERS, timeout=60)
+            r = requests.post(f"{EDA_API}/activations", headers=EDA_HEADERS, timeout=60,
+                              json={"name": "bench-ingest", "rulebook": self.RULEBOOK})
+            assert r.status_code == 201, f"Activation create failed: {r.status_code} {r.text}"
+            results = {f"batch {batch}": self._run_batch(batch) for batch in self.BATCH_SIZES}
+            requests.delete(f"{EDA_API}/activations/bench-ingest", headers=EDA_HEADERS, timeout=60)
+        finally:
+            _compose(("eda",), "down", check=False)
+        _report(f"EDA ingestion ({BENCH_CONCURRENCY} senders, {BENCH_SECONDS:.0f}s)", results)
+
+        for label, numbers in results.items():
+            assert numbers["errors"] == 0, label
+        single, batched = results[f"batch {self.BATCH_SIZES[0]}"], results[f"batch {self.BATCH_SIZES[-1]}"]
+        assert batched["accepted_eps"] > single["accepted_eps"]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestEEFactCacheBenchmark:
+    """Playbook time on ``HOSTS`` inventory hosts with and without a fact cache.
+
+    Every run is a fresh ``docker compose run`` of ``ee-base``, the way each job
+    gets its own execution environment. The hosts use the local connection so
+    the numbers show fact gathering, not SSH. ``cold_s`` is the first run against
+    an empty cache and ``warm_s`` the second; with ``gathering = smart`` the warm
+    run only re-gathers facts for hosts that are missing from the cache.
+    """
+
+    HOSTS = int(os.getenv("AAX_BENCH_FACT_HOSTS", "50"))
+    REDIS = "aax-bench-facts-redis"
+    MODES = {
+        "memory": "",
+        "file": "/var/cache/ansible/facts",
+        "redis": f"redis://{REDIS}:6379/0",
+    }
+
+    def _playbook_seconds(self, cache: str) -> float:
+        script = (
+            f"for n in $(seq {self.HOSTS}); do echo \"host$n ansible_connection=local\"; done > /tmp/hosts && "
+            "printf '%s\\n' '- hosts: all' '  tasks: [{ping: }]' > /tmp/site.yml && "
+            "ansible-playbook -i /tmp/hosts -f 10 /tmp/site.yml"
+        )
+        start = time.monotonic()
+        _compose((), "run", "--rm", "-e", f"AAX_FACT_CACHE={cache}", "ee-base", "bash", "-c", script)
+        return time.monotonic() - start
+
+    def _run_mode(self, cache: str) -> dict[str, float]:
+        _compose((), "run", "--rm", "ee-base", "bash", "-c", "rm -f /var/cache/ansible/facts/*")
+        cold = self._playbook_seconds(cache)
+        warm = self._playbook_seconds(cache)
+        return {"cold_s": cold, "warm_s": warm}
+
+    def test_cached_facts_skip_gathering_in_new_containers(self) -> None:
+        """A warm cache should make the second job faster than memory-only facts."""
+        try:
+            _compose((), "pull", "ee-base", check=False)
+            _compose((), "up", "--no-start", "ee-base")
+            subprocess.run(
+                ["docker", "run", "-d", "--rm", "--name", self.REDIS, "--network", "aax_ansible", "redis:7"],
+                capture_output=True, text=True, check=True,
+            )
+            results = {label: self._run_mode(cache) for label, cache in self.MODES.items()}
+        finally:
+            subprocess.run(["docker", "rm", "-f", self.REDIS], capture_output=True, check=False)
+            _compose((), "down", check=False)
+        _report(f"EE fact cache ({self.HOSTS} hosts, new container per run)", results)
+
+        for label in ("file", "redis"):
+            assert results[label]["warm_s"] < results["memory"]["warm_s"], label
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestEESSHReuseBenchmark:
+    """Job time on ``HOSTS`` SSH hosts with per-job vs node-shared control sockets.
+
+    ``JOBS`` playbooks run one after another in the resident ``ee-base`` container,
+    each with its own ``ANSIBLE_SSH_CONTROL_PATH_DIR`` that is removed afterwards,
+    as AWX does. The hosts are network aliases of one throwaway sshd, so every host
+    gets its own connection. ``first_job_s`` pays for the SSH handshakes;
+    ``later_job_p50_s`` shows whether later jobs could reuse them.
+    """
+
+    HOSTS = int(os.getenv("AAX_BENCH_SSH_HOSTS", "50"))
+    JOBS = int(os.getenv("AAX_BENCH_SSH_JOBS", "5"))
+    SSHD = "aax-bench-sshd"
+    MODES = {"per-job": "", "shared": "/var/lib/ansible/cp"}
+
+    def _exec(self, *args: str, env: dict[str, str] | None = None) -> str:
+        flags = [item for name, value in (env or {}).items() for item in ("-e", f"{name}={value}")]
+        return _compose((), "exec", "-T", *flags, "ee-base", *args).stdout
+
+    def _start_sshd(self) -> None:
+        self._exec("sh", "-c", "mkdir -p ~/.ssh && rm -f ~/.ssh/aax_bench* && "
+                               "ssh-keygen -q -t ed25519 -N '' -f ~/.ssh/aax_bench")
+        public_key = self._exec("cat", "/home/ansible/.ssh/aax_bench.pub").strip()
+        aliases = [item for n in range(self.HOSTS) for item in ("--network-alias", f"host{n}")]
+        subprocess.run(
+            ["docker", "run", "-d", "--rm", "--name", self.SSHD, "--network", "aax_ansible", *aliases,
+             "-e", f"PUBLIC_KEY={public_key}", "-e", "USER_NAME=ansible",
+             "lscr.io/linuxserver/openssh-server:latest"],
+            capture_output=True, text=True, check=True,
+        )
+        deadline = time.monotonic() + 120
+        while "done." not in subprocess.run(["docker", "logs", self.SSHD], capture_output=True, text=True).stdout:
+            assert time.monotonic() < deadline, "sshd did not start within 2 minutes"
+            time.sleep(1)
+
+    def _job_seconds(self, control_dir: str) -> float:
+        script = (
+            f"for n in $(seq 0 {self.HOSTS - 1}); do echo \"host$n ansible_port=2222 ansible_user=ansible "
+            "ansible_ssh_private_key_file=~/.ssh/aax_bench\"; done > /tmp/hosts && "
+            "printf '%s\\n' '- hosts: all' '  gather_facts: false' "
+            "'  tasks: [{raw: \"true\"}, {raw: \"true\"}, {raw: \"true\"}]' > /tmp/site.yml && "
+            "cp=$(mktemp -d) && ANSIBLE_SSH_CONTROL_PATH_DIR=$cp "
+            "ansible-playbook -i /tmp/hosts -f 25 /tmp/site.yml; rc=$?; rm -rf \"$cp\"; exit $rc"
+        )
+        start = time.monotonic()
+        self._exec("bash", "-c", script,
+                   env={"AAX_SSH_CONTROL_DIR": control_dir, "ANSIBLE_HOST_KEY_CHECKING": "False"})
+        return time.monotonic() - start
+
+    def _run_mode(self, control_dir: str) -> dict[str, float]:
+        # A restart drops ssh masters left by the previous mode.
+        _compose((), "restart", "ee-base")
+        jobs = [self._job_seconds(control_dir) for _ in range(self.JOBS)]
+        return {"first_job_s": jobs[0], "later_job_p50_s": statistics.median(jobs[1:])}
+
+    def test_shared_control_sockets_speed_up_later_jobs(self) -> None:
+        """Jobs after the first should reuse SSH connections when sockets are shared."""
+        try:
+            _compose((), "pull", "ee-base", check=False)
+            _compose((), "up", "-d", "ee-base")
+            self._start_sshd()
+            results = {label: self._run_mode(control_dir) for label, control_dir in self.MODES.items()}
+        finally:
+            subprocess.run(["docker", "rm", "-f", self.SSHD], capture_output=True, check=False)
+            _compose((), "down", check=False)
+        _report(f"EE SSH connection reuse ({self.HOSTS} hosts, {self.JOBS} jobs)", results)
+
+        assert results["shared"]["later_job_p50_s"] < results["per-job"]["later_job_p50_s"]
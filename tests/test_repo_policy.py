@@ -1,7 +1,9 @@
 """Repository policy checks for deployment defaults and security baselines."""
 
 from pathlib import Path
+import os
 import re
+import subprocess
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -137,6 +139,7 @@ def test_compose_published_ports_use_localhost_host_bind_default() -> None:
         '"${HOST_BIND:-127.0.0.1}:${AWX_WEB_PORT:-18080}:8052"',
         '"${HOST_BIND:-127.0.0.1}:${AWX_RECEPTOR_PORT:-18888}:8888"',
         '"${HOST_BIND:-127.0.0.1}:${GATEWAY_PORT:-18088}:8080"',
+        '"${HOST_BIND:-127.0.0.1}:${GATEWAY_TLS_PORT:-18443}:8443"',
         '"${HOST_BIND:-127.0.0.1}:${GALAXY_PORT:-15001}:8000"',
         '"${HOST_BIND:-127.0.0.1}:${EDA_PORT:-15000}:5000"',
     ]
@@ -239,6 +242,8 @@ def test_compose_root_user_is_limited_to_known_services() -> None:
     assert root_services == {
         "awx-web",
         "awx-task",
+        "awx-callback-receiver",
+        "awx-mesh-sync",
         "awx-receptor",
         "receptor-hop",
         "receptor-execution",
@@ -350,12 +355,10 @@ def test_eda_healthchecks_validate_dependencies() -> None:
 def test_hub_static_assets_are_shared_between_pulp_api_and_galaxy_ng() -> None:
     """Hub static assets should be collected into the shared volume served by galaxy-ng."""
     compose = _read("docker-compose.yml")
-    galaxy_settings = _read("images/galaxy-ng/settings.py")
-    pulp_settings = _read("images/pulp/settings.py")
+    hub_settings = _read("images/hub-common/aax_hub_settings.py")
 
     assert compose.count("hub_assets:/app/static") >= 2
-    assert 'STATIC_ROOT = Path("/app/static")' in galaxy_settings
-    assert "STATIC_ROOT = Path('/app/static')" in pulp_settings
+    assert 'STATIC_ROOT = Path("/app/static")' in hub_settings
 
 
 def test_hub_admin_password_is_not_reset_on_every_restart() -> None:
@@ -430,3 +433,515 @@ def test_compose_hardening_controls_applied_to_hardened_services() -> None:
     assert no_new_priv_services == expected_hardened_services
     assert cap_drop_services == expected_hardened_services
     assert cap_all_drop_services == expected_hardened_services
+
+
+def test_hub_settings_support_pooled_db_connections() -> None:
+    """Hub/Pulp settings should offer persistent and PgBouncer connection modes."""
+    compose = _read("docker-compose.yml")
+    for settings_path in ("images/hub-common/aax_hub_settings.py",):
+        settings = _read(settings_path)
+        for token in [
+            "HUB_DB_CONN_MODE",
+            "HUB_DB_CONN_MAX_AGE",
+            "CONN_HEALTH_CHECKS",
+            "DISABLE_SERVER_SIDE_CURSORS",
+        ]:
+            assert token in settings, f"{settings_path}: missing {token}"
+
+    assert compose.count("POSTGRES_HOST: ${HUB_DB_HOST:-hub-postgres}") == 4
+    assert compose.count("HUB_DB_CONN_MODE: ${HUB_DB_CONN_MODE:-direct}") == 4
+    assert "hub-pgbouncer:" in compose
+    assert "POOL_MODE: ${HUB_PGBOUNCER_POOL_MODE:-session}" in compose
+
+
+def test_galaxy_response_cache_is_wired_and_opt_in() -> None:
+    """The galaxy-ng image should ship the response cache, disabled by default."""
+    dockerfile = _read("images/galaxy-ng/Dockerfile")
+    wsgi = _read("images/galaxy-ng/aax_wsgi.py")
+    compose = _read("docker-compose.yml")
+
+    assert "aax_response_cache.py /app/aax_response_cache.py" in dockerfile
+    assert "aax_response_cache.wrap(" in wsgi
+    assert "GALAXY_RESPONSE_CACHE: ${GALAXY_RESPONSE_CACHE:-off}" in compose
+
+
+def test_gateway_caches_pulp_content_on_a_volume() -> None:
+    """Pulp content should be cached at the gateway with stampede protection."""
+    nginx = _read("images/gateway/nginx.conf")
+    artifacts = nginx.split("location ~ ^/pulp/content/", 1)[1].split("location ", 1)[0]
+    assert artifacts.split("{", 1)[0].rstrip().endswith("\\.tar\\.gz$")
+    for token in [
+        "proxy_cache pulp_content;",
+        "proxy_cache_lock on;",
+        "X-Cache-Status $upstream_cache_status",
+    ]:
+        assert token in artifacts, f"artifact location missing {token}"
+    for directive in ("proxy_cache_bypass", "proxy_no_cache"):
+        sources = artifacts.split(directive, 1)[1].split(";", 1)[0]
+        for credential in ("$http_authorization", "$http_cookie", "$args"):
+            assert credential in sources, f"{directive} missing {credential}"
+    other_content = nginx.split("location /pulp/content/ {", 1)[1].split("}", 1)[0]
+    assert "proxy_cache" not in other_content
+    assert "max_size=" in nginx
+
+    assert "gateway_content_cache:/var/cache/nginx/pulp-content" in _read("docker-compose.yml")
+    assert "mountPath: /var/cache/nginx/pulp-content" in _read("k8s/gateway-deployment.yaml")
+
+
+def test_gateway_upstreams_use_keepalive_pools() -> None:
+    """Every gateway backend should have a re-resolving upstream block with keepalive."""
+    nginx = _read("images/gateway/nginx.conf")
+    for name, server in [
+        ("awx_web", "awx-web:8052"),
+        ("galaxy_ng", "galaxy-ng:8000"),
+        ("pulp_api", "pulp-api:24817"),
+        ("pulp_content", "pulp-content:24816"),
+        ("eda_controller", "eda-controller:5000"),
+    ]:
+        block = nginx.split(f"upstream {name} {{", 1)[1].split("}", 1)[0]
+        assert f"server {server} resolve;" in block, name
+        assert "keepalive " in block, name
+    assert "set $upstream_" not in nginx
+    assert "GATEWAY_UPSTREAM_MODE: ${GATEWAY_UPSTREAM_MODE:-keepalive}" in _read("docker-compose.yml")
+
+
+def test_hub_gunicorn_settings_come_from_environment() -> None:
+    """Hub gunicorn services should load the env-driven config instead of fixed flags."""
+    for relative_path in ("images/galaxy-ng/entrypoint.sh", "images/pulp/entrypoint.sh"):
+        entrypoint = _read(relative_path)
+        assert "--config /etc/pulp/gunicorn.conf.py" in entrypoint, relative_path
+        assert "--workers" not in entrypoint, relative_path
+    assert "PULP_WORKERS" not in _read("docker-compose.yml")
+
+
+def test_pulp_worker_scales_horizontally() -> None:
+    """pulp-worker must be scalable in compose and autoscaled on queue depth in k8s."""
+    compose = _read("docker-compose.yml")
+    worker = compose.split("\n  pulp-worker:\n", 1)[1].split("\n\n", 1)[0]
+    assert "container_name:" not in worker
+    assert "scale: ${PULP_WORKER_REPLICAS:-1}" in worker
+
+    hub_stack = _read("k8s/hub-stack.yaml")
+    hpa = hub_stack.split("kind: HorizontalPodAutoscaler", 1)[1].split("\n---", 1)[0]
+    assert "name: pulp-worker" in hpa
+    assert "name: pulp_tasks_waiting" in hpa
+    assert "args: [\"pulpcore-queue-metrics\"]" in hub_stack
+
+
+def test_hub_settings_use_shared_redis_cache_and_sessions() -> None:
+    """Hub settings should point Django caches and sessions at separate hub-redis DBs."""
+    for settings_path in ("images/hub-common/aax_hub_settings.py",):
+        settings = _read(settings_path)
+        for token in [
+            "django.core.cache.backends.redis.RedisCache",
+            "HUB_REDIS_CACHE_DB",
+            "HUB_REDIS_SESSION_DB",
+            "HUB_REDIS_CELERY_DB",
+            "SESSION_CACHE_ALIAS",
+        ]:
+            assert token in settings, f"{settings_path}: missing {token}"
+    assert "def post_worker_init" in _read("images/hub-common/gunicorn.conf.py")
+
+
+def test_hub_images_share_side_effect_free_settings() -> None:
+    """Both Hub images should build on one settings module that never creates directories."""
+    shared = _read("images/hub-common/aax_hub_settings.py")
+    assert "mkdir" not in shared
+    workflow = _read(".github/workflows/publish-images.yml")
+    for image, dockerfile in (("galaxy-ng", "Dockerfile"), ("pulp", "Dockerfile.pulp")):
+        settings = _read(f"images/{image}/settings.py")
+        assert "aax_hub_settings.build(" in settings, image
+        assert "mkdir" not in settings, image
+        assert "site-packages/aax_hub_settings.py" in _read(f"images/{image}/{dockerfile}"), image
+        # One source: the shared files come from the hub-common build context only.
+        copies = [line for line in _read(f"images/{image}/{dockerfile}").splitlines()
+                  if line.startswith("COPY --from=hub-common ")]
+        for shared_file in ("aax_hub_settings.py", "gunicorn.conf.py", "aax_access_policy_cache.py"):
+            assert not (REPO_ROOT / f"images/{image}/{shared_file}").exists(), (image, shared_file)
+            assert any(f" {shared_file} " in line for line in copies), (image, shared_file)
+        matrix_entry = workflow.split(f"- name: {image}\n", 1)[1].split("- name:", 1)[0]
+        assert "contexts: hub-common=./images/hub-common" in matrix_entry, image
+        entrypoint = _read(f"images/{image}/entrypoint.sh")
+        assert "mkdir -p /var/lib/pulp/media /var/lib/pulp/tmp /app/static" in entrypoint, image
+        assert 'export HUB_ROLE="${HUB_ROLE:-' in entrypoint, image
+
+
+def test_awx_settings_support_pooled_db_connections() -> None:
+    """Every generated AWX settings file should honour the controller connection mode."""
+    compose = _read("docker-compose.yml")
+    sources = {
+        "docker-compose.yml": compose,
+        "images/awx/setup-and-run.sh": _read("images/awx/setup-and-run.sh"),
+        "k8s/awx-settings-configmap.yaml": _read("k8s/awx-settings-configmap.yaml"),
+    }
+    for relative_path, content in sources.items():
+        for token in [
+            "AWX_DB_CONN_MODE",
+            "CONN_HEALTH_CHECKS",
+            "DISABLE_SERVER_SIDE_CURSORS",
+            "LISTENER_DATABASES",
+        ]:
+            assert token in content, f"{relative_path}: missing {token}"
+
+    assert compose.count("AWX_DB_CONN_MODE: ${AWX_DB_CONN_MODE:-direct}") == 2
+    assert "awx-pgbouncer:" in compose
+    assert "DEFAULT_POOL_SIZE: ${AWX_PGBOUNCER_POOL_SIZE:-40}" in compose
+
+
+def test_awx_task_bootstraps_in_one_django_process() -> None:
+    """awx-task should run its instance/queue bootstrap in one checkpointed shell."""
+    compose = _read("docker-compose.yml")
+    task = compose.split("\n  awx-task:", 1)[1].split("\n    environment:", 1)[0]
+
+    assert "awx-manage shell < /tmp/aax-bootstrap.py &" in task
+    assert "already applied" in task
+    assert 'kill -0 \\"$$bootstrap_pid\\"' in task
+    # The bootstrap ends once the ready file exists; the node sync is awx-mesh-sync's job.
+    bootstrap = task.split("<<'BOOTSTRAP'", 1)[1].split("BOOTSTRAP\\n", 1)[0]
+    assert bootstrap.rstrip("\\n").endswith("Path('/tmp/aax-bootstrap.ready').touch()")
+
+
+def test_receptor_execution_scales_and_self_registers() -> None:
+    """receptor-execution replicas should get unique node IDs and be registered by awx-task."""
+    compose = _read("docker-compose.yml")
+    execution = compose.split("\n  receptor-execution:", 1)[1].split("\n  gateway:", 1)[0]
+    task = compose.split("\n  awx-task:", 1)[1].split("\n    environment:", 1)[0]
+
+    assert "scale: ${RECEPTOR_EXECUTION_REPLICAS:-1}" in execution
+    assert "container_name:" not in execution
+    assert "id: receptor-execution-NODE_SUFFIX" in execution
+    assert "EXECUTION_PREFIX = 'receptor-execution-'" in task
+    assert "simple_command('status')" in task
+
+
+def test_execution_node_sync_runs_as_its_own_supervised_service() -> None:
+    """The mesh sync loop should be a restartable service, not a background job of awx-task."""
+    compose = _read("docker-compose.yml")
+    sync = compose.split("\n  awx-mesh-sync:", 1)[1].split("\n  awx-receptor:", 1)[0]
+    task = compose.split("\n  awx-task:", 1)[1].split("\n    environment:", 1)[0]
+
+    assert "entrypoint: *awx-task-entrypoint" in sync
+    assert "AWX_TASK_ROLE: mesh-sync" in sync
+    assert "restart: unless-stopped" in sync
+    assert "receptor_data:/var/lib/receptor" in sync
+    assert "healthcheck:" in sync
+    role = task.split("= 'mesh-sync' ]; then", 1)[1].split("\\nfi\\n", 1)[0]
+    assert "exec awx-manage shell < /tmp/aax-mesh-sync.py" in role
+    assert "call_command('deprovision_instance', hostname=hostname)" in role
+
+
+def test_receptor_execution_starts_without_installing_anything() -> None:
+    """The execution node image should bake in ansible-runner rather than pip install it on start."""
+    compose = _read("docker-compose.yml")
+    execution = compose.split("\n  receptor-execution:", 1)[1].split("\n  gateway:", 1)[0]
+    dockerfile = _read("images/receptor-execution/Dockerfile")
+
+    assert "/aax-receptor-execution:${VERSION:-latest}" in execution
+    assert "pip install" not in execution
+    assert "\n    command:" not in execution
+    assert "ANSIBLE_RUNNER_REF=c3e8cdb24f784a70328f1bfb54eb9c886148acef" in dockerfile
+    assert "python3 -m compileall" in dockerfile
+    assert "name: receptor-execution" in _read(".github/workflows/publish-images.yml")
+
+
+def test_awx_sources_are_patched_at_build_time_only() -> None:
+    """Compose services should not rewrite AWX or runner sources on start."""
+    compose = _read("docker-compose.yml")
+    task = compose.split("\n  awx-task:", 1)[1].split("\n    environment:", 1)[0]
+    dockerfile = _read("images/awx/Dockerfile.controller")
+
+    for token in ("<<'PATCH'", "AAX_PATCH_SCRIPT", ".pyc", "write_text"):
+        assert token not in compose, token
+    assert "sha256sum --check --quiet /etc/aax/awx-patches.sha256" in task
+    # awx-web, awx-task, awx-callback-receiver, awx-mesh-sync
+    assert compose.count("image: ${AWX_IMAGE:-ghcr.io/kpeacocke/aax-awx-controller:latest}") == 4
+    assert "apply-patches.py --manifest /etc/aax/awx-patches.sha256" in dockerfile
+    assert "name: awx-controller" in _read(".github/workflows/publish-images.yml")
+
+
+def test_callback_receiver_runs_as_its_own_scalable_service() -> None:
+    """Job-event ingestion should run outside awx-task with tunable workers and batching."""
+    compose = _read("docker-compose.yml")
+    task = compose.split("\n  awx-task:", 1)[1].split("\n    environment:", 1)[0]
+    receiver = compose.split("\n  awx-callback-receiver:", 1)[1].split("\n  awx-receptor:", 1)[0]
+
+    assert "run_callback_receiver &" not in task
+    assert "exec awx-manage run_callback_receiver" in task
+    assert "scale: ${AWX_CALLBACK_RECEIVER_REPLICAS:-1}" in receiver
+    assert "entrypoint: *awx-task-entrypoint" in receiver
+    assert "AWX_TASK_ROLE: callback-receiver" in receiver
+    assert "restart: unless-stopped" in receiver
+
+    sources = {
+        "docker-compose.yml": compose,
+        "images/awx/setup-and-run.sh": _read("images/awx/setup-and-run.sh"),
+        "k8s/awx-settings-configmap.yaml": _read("k8s/awx-settings-configmap.yaml"),
+    }
+    for relative_path, content in sources.items():
+        for setting in ("JOB_EVENT_WORKERS", "JOB_EVENT_BUFFER_SECONDS", "JOB_EVENT_MAX_QUEUE_SIZE"):
+            assert f"{setting} = " in content, f"{relative_path}: missing {setting}"
+    assert compose.count("JOB_EVENT_WORKERS = int(os.getenv('AWX_JOB_EVENT_WORKERS', 4))") == 2
+    assert "name: awx-callback-receiver" in _read("k8s/controller-stack.yaml")
+
+
+def test_job_event_maintenance_drops_partitions_instead_of_deleting_rows() -> None:
+    """Event retention should drop whole partitions and refresh stats on the hot tables."""
+    compose = _read("docker-compose.yml")
+    maintenance = compose.split("\n  awx-db-maintenance:", 1)[1].split("\n  awx-web:", 1)[0]
+
+    assert "      - controller\n" in maintenance
+    assert "JOB_EVENT_RETENTION_DAYS: ${JOB_EVENT_RETENTION_DAYS:-30}" in maintenance
+    assert "AWX_DB_MAINTENANCE_INTERVAL: ${AWX_DB_MAINTENANCE_INTERVAL:-3600}" in maintenance
+    assert "FROM pg_inherits" in maintenance
+    assert "DROP TABLE %s" in maintenance
+    # One transaction per partition, not one DO block holding every lock.
+    assert "\\gexec" in maintenance
+    assert "DO $$" not in maintenance
+    assert "restart: on-failure" in maintenance
+    assert "DELETE FROM" not in maintenance
+    assert "ANALYZE main_jobevent;" in maintenance
+    assert "VACUUM (ANALYZE) main_unifiedjob" in maintenance
+    assert "reclaimed" in maintenance
+
+
+def test_postgres_services_use_role_tuning_profiles() -> None:
+    """All three databases should start from a selectable per-role profile with pg_stat_statements."""
+    compose = _read("docker-compose.yml")
+    configmap = _read("k8s/postgres-profiles-configmap.yaml")
+
+    for role, service, stack in (
+        ("awx", "awx-postgres", "k8s/controller-stack.yaml"),
+        ("hub", "hub-postgres", "k8s/hub-stack.yaml"),
+        ("eda", "eda-postgres", "k8s/eda-stack.yaml"),
+    ):
+        block = compose.split(f"\n  {service}:\n", 1)[1].split("\n\n  ", 1)[0]
+        assert f"AAX_POSTGRES_PROFILE: ${{{role.upper()}_POSTGRES_PROFILE:-small}}" in block
+        assert "postgres-tuned-command" in block
+        for size in ("small", "medium", "large"):
+            assert f"AAX_POSTGRES_{size.upper()}: |" in block
+            assert f"  {role}-{size}: |" in configmap
+            assert f"key: {role}-{size}" in _read(stack)
+        assert f"key: {role.upper()}_POSTGRES_PROFILE" in _read(stack)
+        assert f'{role.upper()}_POSTGRES_PROFILE: "small"' in _read("k8s/configmap.yaml")
+
+    compose_script = compose.split("command: &postgres-tuned-command\n", 1)[1]
+    compose_script = compose_script.split("      - |\n", 1)[1].split("\n    volumes:", 1)[0]
+    k8s_script = configmap.split("  start-postgres.sh: |\n", 1)[1].split("\n  awx-small: |", 1)[0]
+    compose_lines = [line[8:] for line in compose_script.replace("$$", "$").splitlines()]
+    assert compose_lines == [line[4:] for line in k8s_script.splitlines()]
+    assert "-c shared_preload_libraries=pg_stat_statements" in k8s_script
+    assert "CREATE EXTENSION IF NOT EXISTS pg_stat_statements" in k8s_script
+
+
+def test_redis_services_use_role_persistence_and_memory_policy() -> None:
+    """Each Redis gets a bounded memory policy and tunable persistence, matching Kubernetes."""
+    compose = _read("docker-compose.yml")
+    configmap = _read("k8s/redis-configmap.yaml")
+
+    assert "--appendonly yes" not in compose
+    for role, service, stack in (
+        ("awx", "awx-redis", "k8s/controller-stack.yaml"),
+        ("hub", "hub-redis", "k8s/hub-stack.yaml"),
+        ("eda", "eda-redis", "k8s/eda-stack.yaml"),
+    ):
+        block = compose.split(f"\n  {service}:\n", 1)[1].split("\n\n  ", 1)[0]
+        assert "redis-tuned-command" in block
+        conf = configmap.split(f"  {role}.conf: |\n", 1)[1].split("\n  #", 1)[0]
+        for name in ("appendonly", "appendfsync", "save", "maxmemory", "maxmemory-policy"):
+            var = f"{role.upper()}_REDIS_{name.upper().replace('-', '_')}"
+            default = re.search(rf"\${{{var}:-([^}}]*)\}}", block)
+            assert default, f"{service}: missing {var}"
+            assert f"    {name} {default.group(1)}\n" in conf + "\n", f"{role}.conf: {name} differs from compose"
+        assert f"key: {role}.conf" in _read(stack)
+        assert '"--appendonly", "yes"' not in _read(stack)
+
+    assert "REDIS_MAXMEMORY_POLICY: ${EDA_REDIS_MAXMEMORY_POLICY:-noeviction}" in compose
+
+
+def test_gateway_compresses_responses_and_offers_http2_tls() -> None:
+    """The gateway should gzip API/stdout responses and optionally serve HTTPS with HTTP/2."""
+    nginx = _read("images/gateway/nginx.conf")
+    dockerfile = _read("images/gateway/Dockerfile")
+    tls_script = _read("images/gateway/40-aax-tls.sh")
+    compression = _read("images/gateway/templates/compression.conf.template")
+
+    for token in ("application/json", "text/plain", "gzip_proxied any;", "gzip_vary on;"):
+        assert token in nginx, token
+    assert "gzip_min_length ${GATEWAY_GZIP_MIN_LENGTH};" in compression
+    content_location = nginx.split("location /pulp/content/", 1)[1].split("location ", 1)[0]
+    assert "gzip off;" in content_location
+
+    server = nginx.split("server {", 1)[1]
+    assert "include /etc/nginx/aax/tls/*.conf;" in server
+    assert "listen 8443 ssl;" in tls_script
+    assert "http2 on;" in tls_script
+    assert "/docker-entrypoint.d/40-aax-tls.sh" in dockerfile
+    assert "GATEWAY_TLS=off" in dockerfile
+
+    compose = _read("docker-compose.yml")
+    gateway = compose.split("\n  gateway:\n", 1)[1].split("\n\n  ", 1)[0]
+    assert "GATEWAY_TLS: ${GATEWAY_TLS:-off}" in gateway
+    assert "gateway_tls:/etc/nginx/tls" in gateway
+    assert "secretName: gateway-tls" in _read("k8s/gateway-deployment.yaml")
+
+
+def test_gateway_streams_large_uploads_and_job_stdout() -> None:
+    """Upload and stdout routes should bypass gateway body buffering."""
+    nginx = _read("images/gateway/nginx.conf")
+    server = nginx.split("server {", 1)[1]
+    assert "sendfile on;" in server
+    assert "tcp_nopush on;" in server
+
+    def location(pattern: str) -> str:
+        return server.split(f"location {pattern} {{", 1)[1].split("}", 1)[0]
+
+    galaxy = location("~ ^/api/galaxy/(.+/)?v3/artifacts/collections/")
+    pulp = location("~ ^/pulp/api/v3/(uploads|artifacts|content/ansible/collection_versions)/")
+    stdout = location("~ ^/api/v2/[a-z_]+/[0-9]+/stdout/")
+    for upload in (galaxy, pulp):
+        assert "proxy_request_buffering off;" in upload
+    assert "proxy_buffering off;" in stdout
+    assert "$upstream_galaxy" in galaxy
+    assert "$upstream_pulp_api" in pulp
+    assert "$upstream_awx" in stdout
+
+
+def test_gateway_rate_limits_clients_with_retry_after() -> None:
+    """The gateway image should ship per-client rate/connection limits that answer 429."""
+    nginx = _read("images/gateway/nginx.conf")
+    zones = _read("images/gateway/templates/rate-limit.conf.template")
+    dockerfile = _read("images/gateway/Dockerfile")
+
+    for zone in ("aax_client", "aax_launch", "aax_galaxy", "aax_eda_events"):
+        assert f"limit_req_zone $aax_limit_key zone={zone}:" in zones, zone
+    assert "limit_conn_zone $aax_limit_key zone=aax_client_conn:" in zones
+    # Clients never choose their own key: X-Forwarded-For only counts through realip.
+    assert "http_x_forwarded_for" not in zones
+    assert "include /etc/nginx/aax/realip/*.conf;" in nginx
+
+    server = nginx.split("server {", 1)[1]
+    assert "limit_req_status 429;" in server
+    assert "limit_conn_status 429;" in server
+    throttled = server.split("location @aax_throttled {", 1)[1].split("}", 1)[0]
+    assert "add_header Retry-After" in throttled
+    assert "return 429" in throttled
+
+    launch = server.split("/launch/ {", 1)[1].split("}", 1)[0]
+    assert "limit-launch.conf;" in launch
+    assert "limit-client.conf;" in launch
+    events = server.split("location = /eda/api/v1/events {", 1)[1].split("}", 1)[0]
+    assert "limit-eda-events.conf;" in events
+    assert "limit-client.conf;" not in events
+    for snippet in ("limit-client", "limit-launch", "limit-galaxy", "limit-eda-events"):
+        assert "/etc/nginx/templates/aax/$snippet.conf.template" in dockerfile
+        assert (REPO_ROOT / f"images/gateway/templates/aax/{snippet}.conf.template").is_file()
+
+    compose = _read("docker-compose.yml")
+    gateway = compose.split("\n  gateway:\n", 1)[1].split("\n\n  ", 1)[0]
+    assert "GATEWAY_RATE_LIMIT: ${GATEWAY_RATE_LIMIT:-on}" in gateway
+    assert "GATEWAY_CONN_LIMIT: ${GATEWAY_CONN_LIMIT:-64}" in gateway
+    assert "GATEWAY_TRUSTED_PROXIES: ${GATEWAY_TRUSTED_PROXIES:-}" in gateway
+
+
+def _render_real_ip(tmp_path: Path, **env: str) -> subprocess.CompletedProcess[str]:
+    script = _read("images/gateway/41-aax-real-ip.sh").replace("/etc/nginx/aax/realip", str(tmp_path))
+    return subprocess.run(["sh", "-c", script, "41-aax-real-ip.sh"], env={"PATH": os.environ["PATH"], **env},
+                          capture_output=True, text=True, check=False)
+
+
+def test_gateway_trusts_forwarded_for_only_from_configured_proxies(tmp_path: Path) -> None:
+    """forwarded mode should take the client address from trusted proxies only."""
+    result = _render_real_ip(tmp_path, GATEWAY_RATE_LIMIT="forwarded")
+    assert result.returncode != 0
+    assert "GATEWAY_TRUSTED_PROXIES" in result.stderr
+
+    assert _render_real_ip(tmp_path, GATEWAY_RATE_LIMIT="on").returncode == 0
+    assert list(tmp_path.iterdir()) == []
+
+    result = _render_real_ip(tmp_path, GATEWAY_RATE_LIMIT="forwarded", GATEWAY_TRUSTED_PROXIES="10.0.0.0/8, 192.0.2.1")
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / "real-ip.conf").read_text().splitlines() == [
+        "set_real_ip_from 10.0.0.0/8;",
+        "set_real_ip_from 192.0.2.1;",
+        "real_ip_header X-Forwarded-For;",
+        "real_ip_recursive on;",
+    ]
+
+    assert _render_real_ip(tmp_path, GATEWAY_RATE_LIMIT="on").returncode == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_eda_controller_runs_resident_activation_manager() -> None:
+    """The EDA image should serve activations from resident engines, not idle in a sleep loop.
+
+    The manager API and the ``aax_events`` source are covered by
+    ``test_eda_manager.py`` and ``test_eda_engines.py``.
+    """
+    entrypoint = _read("images/eda-controller/entrypoint.sh")
+    dockerfile = _read("images/eda-controller/Dockerfile")
+
+    assert "exec python /opt/aax/eda/aax_eda_manager.py" in entrypoint
+    assert "sleep 60" not in entrypoint
+    assert "COPY aax_eda_manager.py aax_eda_engines.py /opt/aax/eda/" in dockerfile
+    assert "COPY sources/ /opt/aax/eda/sources/" in dockerfile
+    assert re.search(r"^\s+redis==", dockerfile, re.MULTILINE)
+    assert "/health" in dockerfile
+
+
+def test_eda_ingestion_limits_are_configurable() -> None:
+    """The EDA ingestion and per-activation queue limits should be set from the environment."""
+    compose = _read("docker-compose.yml")
+    for name in ("EDA_ACTIVATION_QUEUE_MAX", "EDA_INGEST_MAX_PENDING", "EDA_INGEST_MAX_BATCH"):
+        assert f"{name}: ${{{name}:-" in compose, name
+
+
+def test_eda_image_ships_appcds_archive_and_tunes_engine_jvm() -> None:
+    """EDA engines should map a baked AppCDS archive; the JVM options are covered by ``test_eda_engines.py``."""
+    dockerfile = _read("images/eda-controller/Dockerfile")
+    assert "-XX:DumpLoadedClassList=" in dockerfile
+    assert "-Xshare:dump" in dockerfile
+    assert "-XX:SharedArchiveFile=/opt/aax/eda/jvm/drools.jsa" in dockerfile
+    assert "--rulebook /tmp/cds/training.yml" in dockerfile
+    assert "DROOLS_JPY_CLASSPATH=/opt/aax/eda/jvm/drools-runtime.jar" in dockerfile
+
+    compose = _read("docker-compose.yml")
+    for name in ("EDA_JVM_MAX_RAM_PERCENTAGE", "EDA_JVM_GC_PROFILE", "EDA_JVM_CDS", "EDA_JVM_OPTIONS",
+                 "EDA_MAX_ACTIVATIONS"):
+        assert f"{name}: ${{{name}:-" in compose, name
+
+
+def test_ee_fact_cache_persists_across_jobs() -> None:
+    """EEs should gather facts through the bundled cache plugin so new containers can reuse them."""
+    config = _read("images/ee-base/ansible.cfg")
+    assert "gathering = smart" in config
+    assert "fact_caching = aax_facts" in config
+
+    dockerfile = _read("images/ee-base/Dockerfile")
+    assert "plugins/cache/aax_facts.py /usr/share/ansible/plugins/cache/aax_facts.py" in dockerfile
+    assert "/var/cache/ansible/facts" in dockerfile
+
+    compose = _read("docker-compose.yml")
+    assert "ee_fact_cache:/var/cache/ansible/facts:rw" in compose
+    for name in ("AAX_FACT_CACHE", "AAX_FACT_CACHE_TTL", "AAX_FACT_CACHE_COMPRESSION"):
+        assert f"{name}: ${{{name}:-" in compose, name
+
+
+def test_ssh_control_sockets_can_be_shared_across_jobs() -> None:
+    """Ansible should run ssh through aax-ssh so control sockets can outlive a job's directory."""
+    # receptor-execution copies the wrapper from the ee-base build context.
+    assert not (REPO_ROOT / "images/receptor-execution/aax-ssh").exists()
+    assert "COPY --from=ee-base-src aax-ssh /usr/local/bin/aax-ssh" in _read(
+        "images/receptor-execution/Dockerfile"
+    )
+    assert "contexts: ee-base-src=./images/ee-base" in _read(".github/workflows/publish-images.yml")
+
+    config = _read("images/ee-base/ansible.cfg")
+    for tool in ("ssh", "sftp", "scp"):
+        assert f"{tool}_executable = /usr/local/bin/aax-{tool}" in config, tool
+        assert f"ANSIBLE_{tool.upper()}_EXECUTABLE=/usr/local/bin/aax-{tool}" in _read(
+            "images/receptor-execution/Dockerfile"
+        ), tool
+
+    compose = _read("docker-compose.yml")
+    for name in ("AAX_SSH_CONTROL_DIR", "AAX_SSH_CONTROL_PERSIST"):
+        assert compose.count(f"{name}: ${{{name}:-") == 2, name
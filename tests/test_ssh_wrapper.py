@@ -0,0 +1,93 @@
+"""Unit tests for the ``aax-ssh`` front end Ansible runs instead of ssh.
+
+``images/ee-base/aax-ssh`` is a POSIX shell script; it is run here against a
+stand-in ``ssh`` that prints its arguments and a stand-in ``sshpass`` that
+stays the wrapper's parent, the way the real one does.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+WRAPPER = REPO_ROOT / "images/ee-base/aax-ssh"
+
+pytestmark = pytest.mark.skipif(not Path("/proc/self/comm").exists(), reason="aax-ssh reads /proc")
+
+
+@pytest.fixture
+def bin_dir(tmp_path: Path) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    shutil.copy(WRAPPER, bin_dir / "aax-ssh")
+    (bin_dir / "aax-scp").symlink_to("aax-ssh")
+    for tool in ("ssh", "scp"):
+        (bin_dir / tool).write_text(f'#!/bin/sh\necho {tool} "$@"\n')
+    # Not exec: like sshpass, it stays the parent of the ssh it runs.
+    (bin_dir / "sshpass").write_text('#!/bin/sh\n"$@"\n')
+    for path in bin_dir.iterdir():
+        path.chmod(0o755)
+    return bin_dir
+
+
+def _run(bin_dir: Path, *args: str, sshpass: bool = False, tool: str = "aax-ssh", **env: str) -> list[str]:
+    command = [str(bin_dir / tool), *args]
+    if sshpass:
+        command.insert(0, str(bin_dir / "sshpass"))
+    clean = {key: value for key, value in os.environ.items()
+             if key not in {"SSH_AUTH_SOCK", "JOB_ID", "AWX_PRIVATE_DATA_DIR"}}
+    result = subprocess.run(
+        command, env={**clean, "PATH": f"{bin_dir}:{os.environ['PATH']}", **env},
+        capture_output=True, text=True, check=True,
+    )
+    return result.stdout.split()
+
+
+def _control_path(argv: list[str]) -> str:
+    return argv[argv.index("-o") + 1]
+
+
+def test_without_control_dir_only_the_tool_runs(bin_dir: Path) -> None:
+    assert _run(bin_dir, "-o", "ControlPath=/job/cp", "host") == ["ssh", "-o", "ControlPath=/job/cp", "host"]
+
+
+def test_control_dir_is_shared_by_calls_with_the_same_key(bin_dir: Path, tmp_path: Path) -> None:
+    control = tmp_path / "cp"
+    key = tmp_path / "id_ed25519"
+    key.write_text("key one")
+    first = _run(bin_dir, "-i", str(key), "host", AAX_SSH_CONTROL_DIR=str(control))
+    again = _run(bin_dir, "-o", f"IdentityFile={key}", "host", AAX_SSH_CONTROL_DIR=str(control))
+    assert _control_path(first) == _control_path(again)
+    assert _control_path(first).startswith(f"ControlPath={control}/")
+    assert control.stat().st_mode & 0o777 == 0o700
+
+    key.write_text("key two")
+    other = _run(bin_dir, "-i", str(key), "host", AAX_SSH_CONTROL_DIR=str(control))
+    assert _control_path(other) != _control_path(first)
+
+
+def test_password_logins_are_scoped_to_the_job(bin_dir: Path, tmp_path: Path) -> None:
+    control = str(tmp_path / "cp")
+    job = _run(bin_dir, "host", sshpass=True, AAX_SSH_CONTROL_DIR=control, JOB_ID="42")
+    assert _run(bin_dir, "host", sshpass=True, AAX_SSH_CONTROL_DIR=control, JOB_ID="42") == job
+    assert _control_path(job).startswith(f"ControlPath={control}/")
+    assert _run(bin_dir, "host", sshpass=True, AAX_SSH_CONTROL_DIR=control, JOB_ID="43") != job
+    assert _run(bin_dir, "host", AAX_SSH_CONTROL_DIR=control, JOB_ID="42") != job
+
+    runner = _run(bin_dir, "host", sshpass=True, AAX_SSH_CONTROL_DIR=control, AWX_PRIVATE_DATA_DIR="/tmp/awx_7")
+    assert _control_path(runner).startswith(f"ControlPath={control}/")
+
+
+def test_password_logins_outside_a_job_keep_ansibles_control_path(bin_dir: Path, tmp_path: Path) -> None:
+    argv = _run(bin_dir, "-o", "ControlPath=/job/cp", "host", sshpass=True,
+                AAX_SSH_CONTROL_DIR=str(tmp_path / "cp"), AAX_SSH_CONTROL_PERSIST="10m")
+    assert argv == ["ssh", "-o", "ControlPersist=10m", "-o", "ControlPath=/job/cp", "host"]
+
+
+def test_tool_name_comes_from_the_link(bin_dir: Path) -> None:
+    assert _run(bin_dir, "a", "b", tool="aax-scp") == ["scp", "a", "b"]